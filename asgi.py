@@ -0,0 +1,7 @@
+"""
+ASGI girişi (isteğe bağlı): uvicorn asgi:app
+"""
+from sunum_app.asgi import asgi_uygulamasi_olustur
+
+
+app = asgi_uygulamasi_olustur()
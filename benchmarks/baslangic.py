@@ -0,0 +1,75 @@
+"""
+Başlangıç süresi ölçümü: import + create_app
+
+    python benchmarks/baslangic.py --tekrar 10
+
+Her ölçüm ayrı bir Python sürecinde yapılır, böylece modül önbelleği ve
+açık bağlantılar ölçümü etkilemez. Göçleri uygulanmış geçici bir veritabanı
+üzerinde otomatik şema kontrolü açık ve kapalı iki mod karşılaştırılır.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+PROJE_KOKU = Path(__file__).resolve().parent.parent
+
+_OLCUM_KODU = """
+import json, sys, time
+t0 = time.perf_counter()
+from sunum_app import create_app
+t1 = time.perf_counter()
+create_app({"SQLALCHEMY_DATABASE_URI": sys.argv[1]})
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1}))
+"""
+
+
+def _olc(uri: str, otomatik: bool) -> dict:
+    env = dict(os.environ, SUNUM_SCHEMA_OTOMATIK_GUNCELLE="1" if otomatik else "0")
+    cikti = subprocess.run(
+        [sys.executable, "-c", _OLCUM_KODU, uri],
+        cwd=PROJE_KOKU,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+
+def _ozet(olcumler: list[dict], anahtar: str) -> str:
+    degerler = [o[anahtar] * 1000 for o in olcumler]
+    return (
+        f"{anahtar:<11} medyan {statistics.median(degerler):8.1f} ms"
+        f"  min {min(degerler):8.1f} ms  maks {max(degerler):8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tekrar", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as klasor:
+        uri = "sqlite:///" + str(Path(klasor) / "baslangic.db")
+        # İlk çalıştırma göçleri uygular; ölçümler hazır şema üzerinde yapılır.
+        _olc(uri, otomatik=True)
+
+        for otomatik in (True, False):
+            olcumler = [_olc(uri, otomatik) for _ in range(args.tekrar)]
+            baslik = "otomatik şema kontrolü" if otomatik else "I/O'suz başlangıç"
+            print(f"{baslik} ({args.tekrar} tekrar)")
+            print("  " + _ozet(olcumler, "import"))
+            print("  " + _ozet(olcumler, "create_app"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+İstek performansı ölçümü: sayfalar, değerlendirme kaydı ve not hesaplama
+
+    pip install -r requirements-dev.txt
+    python -m pytest benchmarks --benchmark-save=simdi
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+
+Her veri boyutu için geçici bir veritabanı olcek_verisi_uret ile doldurulur
+ve istekler Flask test istemcisiyle gönderilir. Ölçülen boyutlar
+OLCUM_BOYUTLARI (varsayılan "kucuk"), tur sayısı OLCUM_TEKRAR ortam
+değişkeniyle seçilir. İstek başına SQL sorgu sayısı ve p50/p95/p99 süreleri
+her ölçümün extra_info alanına yazılır. Sayfa önbelleği kapalıdır, böylece render ve not
+hesaplamanın kendisi ölçülür (OLCUM_ONBELLEK=1 ile açılır).
+"""
+from __future__ import annotations
+
+import os
+import random
+import statistics
+from typing import Callable
+
+import pytest
+from sqlalchemy import event, select
+
+from sunum_app import create_app
+from sunum_app.extensions import db
+from sunum_app.models import Degerlendirme, Ogrenci, Sunum
+from sunum_app.services.not_hesaplama import KRITERLER, NotHesaplamaServisi
+from sunum_app.services.olcek_verisi import olcek_verisi_uret
+
+pytest.importorskip("pytest_benchmark")
+
+
+# olcek_verisi_uret parametreleri: ekip, öğrenci, sunum, sunum başına değerlendirme.
+BOYUTLAR = {
+    "kucuk": (10, 100, 20, 15),
+    "orta": (40, 1000, 100, 40),
+    "buyuk": (100, 5000, 400, 60),
+}
+
+OLCULEN_BOYUTLAR = os.environ.get("OLCUM_BOYUTLARI", "kucuk").split(",")
+TEKRAR = int(os.environ.get("OLCUM_TEKRAR", "30"))
+ONBELLEK = os.environ.get("OLCUM_ONBELLEK", "0") == "1"
+
+
+class SorguSayaci:
+    def __init__(self, engine) -> None:
+        self.sayilar: list[int] = []
+        event.listen(engine, "after_cursor_execute", self._say)
+
+    def _say(self, *args) -> None:
+        if self.sayilar:
+            self.sayilar[-1] += 1
+
+    def tur_basla(self) -> None:
+        self.sayilar.append(0)
+
+    def bilgi(self) -> dict:
+        sayilar, self.sayilar = self.sayilar, []
+        return {
+            "ortalama_sorgu": round(statistics.fmean(sayilar), 2),
+            "maks_sorgu": max(sayilar),
+        }
+
+
+def _degerlendirme_adaylari(adet: int, rnd: random.Random) -> list[tuple[int, int]]:
+    # Her POST için henüz değerlendirme yapmamış, sunumun ekibinden olmayan
+    # farklı bir öğrenci seçilir.
+    sunumlar = db.session.execute(select(Sunum.id, Sunum.ekip_id)).all()
+    ogrenciler = db.session.execute(select(Ogrenci.id, Ogrenci.ekip_id)).all()
+    mevcut = set(
+        db.session.execute(
+            select(Degerlendirme.sunum_id, Degerlendirme.degerlendiren_ogrenci_id).where(
+                Degerlendirme.degerlendiren_ogrenci_id.is_not(None)
+            )
+        ).all()
+    )
+
+    adaylar: list[tuple[int, int]] = []
+    for _ in range(adet * 50):
+        if len(adaylar) == adet:
+            break
+        sunum_id, ekip_id = rnd.choice(sunumlar)
+        ogrenci_id, ogrenci_ekibi = rnd.choice(ogrenciler)
+        if ogrenci_ekibi != ekip_id and (sunum_id, ogrenci_id) not in mevcut:
+            mevcut.add((sunum_id, ogrenci_id))
+            adaylar.append((sunum_id, ogrenci_id))
+    if len(adaylar) < adet:
+        raise RuntimeError("Değerlendirme POST senaryosu için yeterli aday bulunamadı.")
+    return adaylar
+
+
+class OlcumOrtami:
+    def __init__(self, app, sayac: SorguSayaci, hedefler: list[int], adaylar: list[tuple[int, int]]):
+        self.app = app
+        self.sayac = sayac
+        self.hedefler = hedefler
+        self.adaylar = adaylar
+        self.anonim = app.test_client()
+        self.admin = app.test_client()
+        self.admin.post("/login", data={"username": "admin", "password": "admin123"})
+        self.admin.get("/admin")  # giriş flash mesajı tüketilir
+        self.yazici = app.test_client()
+
+
+@pytest.fixture(scope="module", params=OLCULEN_BOYUTLAR)
+def ortam(request, tmp_path_factory):
+    boyut = request.param
+    rnd = random.Random(7)
+    klasor = tmp_path_factory.mktemp(f"olcum-{boyut}")
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(klasor / "olcum.db"),
+            "SAYFA_ONBELLEGI": ONBELLEK,
+            "GIRIS_SINIRI": False,
+            "TESTING": True,
+        }
+    )
+    # Ölçüm sırasında kayıt senaryosu tur başına bir aday harcar; ısınma
+    # turları için de yedek bırakılır.
+    adet = TEKRAR * 2
+    with app.app_context():
+        olcek_verisi_uret(*BOYUTLAR[boyut])
+        sayac = SorguSayaci(db.engine)
+        sunum_idleri = list(db.session.scalars(select(Sunum.id)))
+        adaylar = _degerlendirme_adaylari(adet, rnd)
+    hedefler = [rnd.choice(sunum_idleri) for _ in range(adet)]
+
+    yield OlcumOrtami(app, sayac, hedefler, adaylar)
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _olc(benchmark, ortam: OlcumOrtami, calistir: Callable[[int], None]) -> None:
+    sira = iter(range(TEKRAR * 2))
+
+    def hazirla():
+        ortam.sayac.tur_basla()
+        return (next(sira),), {}
+
+    benchmark.pedantic(calistir, setup=hazirla, rounds=TEKRAR, iterations=1)
+    benchmark.extra_info.update(ortam.sayac.bilgi())
+    benchmark.extra_info.update(_yuzdelikler(benchmark.stats.stats.data))
+
+
+def _yuzdelikler(sureler: list[float]) -> dict:
+    # pytest-benchmark yalnızca medyanı raporlar; kuyruk gecikmeleri
+    # milisaniye olarak eklenir.
+    kesimler = statistics.quantiles(sureler, n=100, method="inclusive")
+    return {
+        f"p{yuzde}_ms": round(kesimler[yuzde - 1] * 1000, 3) for yuzde in (50, 95, 99)
+    }
+
+
+def _get(istemci, url: Callable[[int], str]) -> Callable[[int], None]:
+    def calistir(i: int) -> None:
+        yanit = istemci.get(url(i))
+        assert yanit.status_code == 200, f"{url(i)}: beklenmeyen yanıt {yanit.status_code}"
+
+    return calistir
+
+
+def test_ana_sayfa(benchmark, ortam):
+    _olc(benchmark, ortam, _get(ortam.anonim, lambda i: "/"))
+
+
+def test_sunum_detayi(benchmark, ortam):
+    _olc(benchmark, ortam, _get(ortam.anonim, lambda i: f"/sunum/{ortam.hedefler[i]}"))
+
+
+def test_degerlendirme_formu(benchmark, ortam):
+    _olc(
+        benchmark,
+        ortam,
+        _get(ortam.anonim, lambda i: f"/sunum/{ortam.hedefler[i]}/degerlendirme"),
+    )
+
+
+def test_admin_paneli(benchmark, ortam):
+    _olc(benchmark, ortam, _get(ortam.admin, lambda i: "/admin"))
+
+
+def test_degerlendirme_kaydi(benchmark, ortam):
+    puanlar = {kriter: "80" for kriter in KRITERLER}
+
+    def calistir(i: int) -> None:
+        sunum_id, ogrenci_id = ortam.adaylar[i]
+        yanit = ortam.yazici.post(
+            f"/sunum/{sunum_id}/degerlendirme",
+            data={
+                "degerlendiren_tipi": "ogrenci",
+                "degerlendiren_ogrenci_id": str(ogrenci_id),
+                **puanlar,
+            },
+        )
+        assert yanit.status_code == 302, f"Değerlendirme kaydedilemedi: {yanit.status_code}"
+
+    _olc(benchmark, ortam, calistir)
+
+
+@pytest.mark.parametrize("metod", ["ozetten_final_notlari", "hesapla_final_notlari"])
+def test_not_hesaplama_servisi(benchmark, ortam, metod):
+    def calistir(i: int) -> None:
+        with ortam.app.app_context():
+            sunumlar = Sunum.query.all()
+            getattr(NotHesaplamaServisi(), metod)(sunumlar)
+
+    _olc(benchmark, ortam, calistir)
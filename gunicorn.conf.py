@@ -0,0 +1,29 @@
+"""
+Gunicorn ayarları: gunicorn -c gunicorn.conf.py app:app
+"""
+import os
+
+
+# Worker'lar create_app sırasında veritabanına dokunmaz; şema ve varsayılan
+# kayıtlar master süreçte, worker'lar fork edilmeden önce bir kez kurulur.
+os.environ.setdefault("SUNUM_SCHEMA_OTOMATIK_GUNCELLE", "0")
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+# Canlı skor akışları (SSE) bağlantı başına bir thread tutar; threads > 1
+# olduğunda gunicorn gthread worker'ını kullanır. Akışlara ayrılan thread
+# sayısı CANLI_SKOR_AZAMI_AKIS ile sınırlıdır ve bundan büyük tutulmalıdır.
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+
+def on_starting(server):
+    from sunum_app import create_app
+    from sunum_app.extensions import db
+    from sunum_app.sema_gocleri import semayi_guncelle
+
+    app = create_app()
+    with app.app_context():
+        for goc in semayi_guncelle():
+            server.log.info("Şema göçü uygulandı: %s %s", goc.surum, goc.aciklama)
+        # Master'da açılan bağlantılar fork ile worker'lara taşınmasın.
+        db.engine.dispose()
@@ -1,47 +1,32 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from typing import Any, Mapping, Optional
 
 import click
 from sqlalchemy.exc import IntegrityError
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .extensions import db, login_manager
 from .models import Ekip, Ogrenci, User
 from .routes import register_routes
-
-
-def _ensure_sqlite_columns(app: Flask) -> None:
-    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
-    if not uri or not str(uri).startswith("sqlite"):
-        return
-
-    engine = db.engine
-    with engine.connect() as conn:
-        table_rows = conn.exec_driver_sql(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='ayarlar'"
-        ).fetchall()
-        if not table_rows:
-            return
-
-        columns = conn.exec_driver_sql("PRAGMA table_info(ayarlar)").fetchall()
-        existing = {row[1] for row in columns}
-
-        to_add = {
-            "konu_hakimiyeti_etiket": "TEXT",
-            "anlatim_etiket": "TEXT",
-            "giyim_etiket": "TEXT",
-            "ekip_uyumu_etiket": "TEXT",
-            "gorsellik_etiket": "TEXT",
-            "genel_gorus_etiket": "TEXT",
-        }
-
-        for col, col_type in to_add.items():
-            if col not in existing:
-                conn.exec_driver_sql(f"ALTER TABLE ayarlar ADD COLUMN {col} {col_type}")
-
-
-def create_app() -> Flask:
+from .sema_gocleri import HEDEF_SURUM, bekleyen_goc_var, sema_surumu, semayi_guncelle
+from .sqlite_pragmalari import sqlite_pragmalarini_kur
+from .services.ayarlar_onbellegi import AyarlarOnbellegi
+from .services.canli_skor import skor_yayini_olustur
+from .services.degerlendirici_adaylari import degerlendirici_adaylari_olustur
+from .services.disa_aktarim import BICIMLER, TURLER, disa_aktarim_akisi
+from .services.giris_siniri import giris_siniri_olustur
+from .services.istek_olcumu import istek_olcumu_olustur
+from .services.kullanici_onbellegi import kullanici_onbellegi_olustur
+from .services.ogrenci_ice_aktarim import OgrenciIceAktarimServisi
+from .services.olcek_verisi import olcek_verisi_uret
+from .services.sayfa_onbellegi import sayfa_onbellegi_olustur
+
+
+def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
     project_root = Path(__file__).resolve().parent.parent
     app = Flask(
         __name__,
@@ -51,21 +36,81 @@ def create_app() -> Flask:
     )
 
     app.config["SECRET_KEY"] = "dev-secret-key-change-in-production"
+    if config:
+        app.config.update(config)
     app.config.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite:///sunum_degerlendirme.db")
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
+    # Açılışta bekleyen şema göçleri uygulanır. Kapatıldığında create_app
+    # veritabanına hiç dokunmaz; şema "flask db-upgrade" ile ya da
+    # gunicorn.conf.py'deki fork öncesi hook ile bir kez kurulur.
+    app.config.setdefault(
+        "SCHEMA_OTOMATIK_GUNCELLE",
+        os.environ.get("SUNUM_SCHEMA_OTOMATIK_GUNCELLE", "1") != "0",
+    )
+    # Uygulamanın önündeki güvenilir ters proxy sayısı. 0'dan büyükse
+    # X-Forwarded-* başlıkları bu kadar atlama için okunur; böylece giriş
+    # sınırı gibi IP'ye bağlı kontroller proxy'nin değil istemcinin
+    # adresini görür. Proxy yokken açılırsa istemci IP'sini taklit edebilir.
+    app.config.setdefault("PROXY_SAYISI", int(os.environ.get("SUNUM_PROXY_SAYISI", "0")))
+    if app.config["PROXY_SAYISI"] > 0:
+        atlama = app.config["PROXY_SAYISI"]
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app, x_for=atlama, x_proto=atlama, x_host=atlama, x_port=atlama
+        )
 
     db.init_app(app)
+    sqlite_pragmalarini_kur(app)
 
     login_manager.init_app(app)
     login_manager.login_view = "login"
     login_manager.login_message = "Lütfen giriş yapın."
 
+    app.extensions["kullanici_onbellegi"] = kullanici_onbellegi_olustur(app)
+
     @login_manager.user_loader
     def load_user(user_id: str):
+        onbellek = app.extensions["kullanici_onbellegi"]
+        if onbellek is not None:
+            return onbellek.getir(int(user_id))
         return User.query.get(int(user_id))
 
+    app.extensions["ayarlar_onbellegi"] = AyarlarOnbellegi(
+        Path(app.instance_path) / "ayarlar_surumu"
+    )
+    app.extensions["sayfa_onbellegi"] = sayfa_onbellegi_olustur(app)
+    app.extensions["skor_yayini"] = skor_yayini_olustur(app)
+    app.extensions["degerlendirici_adaylari"] = degerlendirici_adaylari_olustur(app)
+    app.extensions["istek_olcumu"] = istek_olcumu_olustur(app)
+    app.extensions["giris_siniri"] = giris_siniri_olustur(app)
+
     register_routes(app)
 
+    @app.cli.command("db-upgrade")
+    def db_upgrade() -> None:
+        uygulananlar = semayi_guncelle()
+        for goc in uygulananlar:
+            click.echo(f"{goc.surum:>3}: {goc.aciklama}")
+        click.echo(f"Şema sürümü: {sema_surumu()} (hedef {HEDEF_SURUM}).")
+
+    @app.cli.command("export-grades")
+    @click.option("--tur", type=click.Choice(TURLER), default="notlar", show_default=True)
+    @click.option("--bicim", type=click.Choice(BICIMLER), default="csv", show_default=True)
+    @click.option("--cikti", type=click.File("wb"), default="-", help="Varsayılan: stdout")
+    def export_grades(tur: str, bicim: str, cikti) -> None:
+        for parca in disa_aktarim_akisi(tur, bicim):
+            cikti.write(parca)
+
+    @app.cli.command("import-students")
+    @click.argument("dosya", type=click.File("r", encoding="utf-8-sig"))
+    def import_students(dosya) -> None:
+        sonuc = OgrenciIceAktarimServisi().ice_aktar(dosya)
+        for hata in sonuc.hatalar:
+            click.echo(f"Satır {hata.satir}: {hata.mesaj}", err=True)
+        click.echo(
+            f"Eklenen öğrenci: {sonuc.eklenen}, güncellenen: {sonuc.guncellenen}, "
+            f"yeni ekip: {sonuc.olusturulan_ekip}, hatalı satır: {len(sonuc.hatalar)}."
+        )
+
     @app.cli.command("seed-sample-data")
     def seed_sample_data() -> None:
         ekip_isimleri = [
@@ -151,9 +196,27 @@ def create_app() -> Flask:
             f"Örnek veri tamamlandı. Eklenen ekip: {created_teams}, eklenen öğrenci: {created_students}."
         )
 
-    with app.app_context():
-        db.create_all()
-        _ensure_sqlite_columns(app)
-        User.ensure_default_admin()
+    @app.cli.command("seed-scale")
+    @click.option("--teams", "ekip", type=click.IntRange(1), default=20, show_default=True)
+    @click.option("--students", "ogrenci", type=click.IntRange(0), default=500, show_default=True)
+    @click.option("--sunum", type=click.IntRange(0), default=100, show_default=True)
+    @click.option(
+        "--evals-per-sunum", "degerlendirme", type=click.IntRange(0), default=30, show_default=True
+    )
+    @click.option("--teachers", "ogretmen", type=click.IntRange(0), default=3, show_default=True)
+    @click.option("--seed", "tohum", type=int, default=1, show_default=True)
+    def seed_scale(
+        ekip: int, ogrenci: int, sunum: int, degerlendirme: int, ogretmen: int, tohum: int
+    ) -> None:
+        sonuc = olcek_verisi_uret(ekip, ogrenci, sunum, degerlendirme, ogretmen, tohum)
+        click.echo(
+            f"Eklenen ekip: {sonuc.ekip}, öğrenci: {sonuc.ogrenci}, öğretmen: {sonuc.ogretmen}, "
+            f"sunum: {sonuc.sunum}, değerlendirme: {sonuc.degerlendirme}."
+        )
+
+    if app.config["SCHEMA_OTOMATIK_GUNCELLE"]:
+        with app.app_context():
+            if bekleyen_goc_var():
+                semayi_guncelle()
 
     return app
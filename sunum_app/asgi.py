@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Mapping, Optional
+from urllib.parse import parse_qsl
+
+from flask import Flask, Response
+from itsdangerous import BadSignature
+from werkzeug.http import is_resource_modified, parse_cookie
+
+from . import create_app
+from .services.asenkron_okuma import (
+    AsenkronDesteklenmiyor,
+    AsenkronOkuyucu,
+    asenkron_okuyucu_olustur,
+)
+from .services.canli_skor import (
+    NABIZ_OLAYI,
+    SILINDI_OLAYI,
+    retry_olayi,
+    skor_olayi,
+    skor_verisi,
+)
+from .services.icerik_surumleri import (
+    GENEL,
+    LISTE,
+    icerik_degisti,
+    sunum_anahtari,
+    surum_imzasi,
+)
+from .services.okuma_api import (
+    SUNUM_ALANLARI,
+    VARSAYILAN_SUNUM_ALANLARI,
+    AlanSecimiHatasi,
+    alanlari_coz,
+)
+from .services.sayfa_onbellegi import dogrulayicilari_ekle, sayfa_dogrulayicilari
+from .services.sayfalama import per_page_coz
+
+
+# app.config üzerinden değiştirilebilir. Flask'a iletilen istekler bu
+# boyuttaki thread havuzunda çalışır.
+VARSAYILAN_AYARLAR = {
+    "ASGI_WSGI_THREADS": 8,
+}
+
+
+class AsenkronSkorYayini:
+    # canli_skor.SkorYayini'nin olay döngüsü karşılığı: izleyici başına
+    # thread yerine bir coroutine. Aynı süreçteki yazımlar (Flask thread
+    # havuzunda commit edilenler) izleyicileri hemen uyandırır, diğer
+    # worker'lardaki yazımlar kontrol aralığında sürüm sayacından yakalanır.
+
+    def __init__(
+        self,
+        okuyucu: AsenkronOkuyucu,
+        kontrol_araligi: float,
+        nabiz_araligi: float,
+        akis_suresi: float,
+    ):
+        self.okuyucu = okuyucu
+        self.kontrol_araligi = kontrol_araligi
+        self.nabiz_araligi = nabiz_araligi
+        self.akis_suresi = akis_suresi
+        self._dongu: Optional[asyncio.AbstractEventLoop] = None
+        self._olay = asyncio.Event()
+        self._yerel_surum = 0
+        self._kilit = asyncio.Lock()
+        self._skorlar: dict[int, tuple[str, Optional[dict]]] = {}
+
+    def baglan(self, dongu: asyncio.AbstractEventLoop) -> None:
+        self._dongu = dongu
+
+    def haber_ver(self) -> None:
+        # Commit sinyali Flask'ın thread'inde gelir.
+        dongu = self._dongu
+        if dongu is None:
+            return
+        try:
+            dongu.call_soon_threadsafe(self._uyandir)
+        except RuntimeError:
+            # Olay döngüsü kapanmış.
+            pass
+
+    def _uyandir(self) -> None:
+        self._yerel_surum += 1
+        olay, self._olay = self._olay, asyncio.Event()
+        olay.set()
+
+    async def _bekle(self, gorulen: int, sure: float) -> int:
+        if self._yerel_surum == gorulen:
+            try:
+                await asyncio.wait_for(self._olay.wait(), sure)
+            except asyncio.TimeoutError:
+                pass
+        return self._yerel_surum
+
+    async def skor(self, sunum_id: int, imza: str) -> Optional[dict]:
+        async with self._kilit:
+            onceki = self._skorlar.get(sunum_id)
+            if onceki is not None and onceki[0] == imza:
+                return onceki[1]
+
+            bilgi = await self.okuyucu.sunum_notu(sunum_id)
+            veri = skor_verisi(sunum_id, imza, bilgi) if bilgi is not None else None
+            self._skorlar[sunum_id] = (imza, veri)
+            return veri
+
+    async def olay_akisi(self, sunum_id: int) -> AsyncIterator[str]:
+        bitis = time.monotonic() + self.akis_suresi
+        son_nabiz = time.monotonic()
+        gonderilen: Optional[str] = None
+        yerel = self._yerel_surum
+        anahtarlar = (GENEL, sunum_anahtari(sunum_id))
+
+        yield retry_olayi(self.kontrol_araligi)
+        while time.monotonic() < bitis:
+            imza = surum_imzasi(await self.okuyucu.surumler(*anahtarlar), anahtarlar)
+            if imza != gonderilen:
+                veri = await self.skor(sunum_id, imza)
+                if veri is None:
+                    yield SILINDI_OLAYI
+                    return
+                yield skor_olayi(veri)
+                gonderilen = imza
+                son_nabiz = time.monotonic()
+            elif time.monotonic() - son_nabiz >= self.nabiz_araligi:
+                yield NABIZ_OLAYI
+                son_nabiz = time.monotonic()
+
+            yerel = await self._bekle(yerel, self.kontrol_araligi)
+
+
+def _basliklar(scope: Mapping[str, Any]) -> dict[str, str]:
+    return {
+        ad.decode("latin-1").lower(): deger.decode("latin-1") for ad, deger in scope["headers"]
+    }
+
+
+async def _yanit_gonder(send, yanit: Response, environ: dict, govde: bool = True) -> None:
+    # get_wsgi_headers 304 yanıtından içerik başlıklarını çıkarır ve
+    # Content-Length'i düzeltir; Flask'ın WSGI yolundaki başlıklarla aynıdır.
+    basliklar = yanit.get_wsgi_headers(environ)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": yanit.status_code,
+            "headers": [
+                (ad.lower().encode("latin-1"), deger.encode("latin-1"))
+                for ad, deger in basliklar.items()
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": yanit.get_data() if govde else b""})
+
+
+async def _baglanti_kopmasi(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+class AsgiUygulamasi:
+    # ASGI girişi. Aşağıdaki GET/HEAD istekleri olay döngüsünde asenkron
+    # sorgularla yanıtlanır; diğer tüm istekler thread havuzu üzerinden
+    # Flask uygulamasına iletilir:
+    #   - "/" ve "/sunum/<id>": oturum çerezi olmayan ziyaretçiler için
+    #     sürüm kontrolü, 304 ve sayfa önbelleği. Önbellekte olmayan sayfayı
+    #     Flask render eder ve önbelleğe yazar; sonraki istekler buradan döner.
+    #   - "/sunum/<id>/canli": SSE akışı bağlantı başına thread tutmaz.
+    #   - "/api/sunumlar": yalnızca oturum çerezi admin kullanıcıya ait
+    #     isteklerde; diğerleri giriş ve yetki denetimi için Flask'a gider.
+
+    def __init__(self, app: Flask, okuyucu: AsenkronOkuyucu, wsgi):
+        self.app = app
+        self.okuyucu = okuyucu
+        self._wsgi = wsgi
+        self.skor_yayini = AsenkronSkorYayini(
+            okuyucu,
+            kontrol_araligi=app.config["CANLI_SKOR_KONTROL_ARALIGI"],
+            nabiz_araligi=app.config["CANLI_SKOR_NABIZ_ARALIGI"],
+            akis_suresi=app.config["CANLI_SKOR_AKIS_SURESI"],
+        )
+        # Bu çerezlerden biri varsa sayfa kullanıcıya ya da bekleyen flash
+        # mesajlarına göre değişebilir; istek Flask'a bırakılır.
+        self._oturum_cerezleri = (
+            app.config["SESSION_COOKIE_NAME"],
+            app.config.get("REMEMBER_COOKIE_NAME", "remember_token"),
+        )
+        self._yollar = (
+            (re.compile(r"/"), self._index),
+            (re.compile(r"/sunum/(\d+)"), self._sunum_detay),
+            (re.compile(r"/sunum/(\d+)/canli"), self._canli_skor),
+            (re.compile(r"/api/sunumlar"), self._api_sunumlar),
+        )
+
+        def _icerik_degisti(sender, anahtarlar: frozenset[str], **kwargs) -> None:
+            if GENEL in anahtarlar or any(a.startswith("sunum:") for a in anahtarlar):
+                self.skor_yayini.haber_ver()
+
+        icerik_degisti.connect(_icerik_degisti, weak=False)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            for desen, isleyici in self._yollar:
+                eslesme = desen.fullmatch(scope["path"])
+                if eslesme is not None:
+                    await isleyici(scope, receive, send, *map(int, eslesme.groups()))
+                    return
+
+        await self._wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            mesaj = await receive()
+            if mesaj["type"] == "lifespan.startup":
+                self.skor_yayini.baglan(asyncio.get_running_loop())
+                await send({"type": "lifespan.startup.complete"})
+            elif mesaj["type"] == "lifespan.shutdown":
+                await self.okuyucu.kapat()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _index(self, scope, receive, send) -> None:
+        await self._onbellekli_sayfa(scope, receive, send, "index", (LISTE,))
+
+    async def _sunum_detay(self, scope, receive, send, sunum_id: int) -> None:
+        await self._onbellekli_sayfa(
+            scope, receive, send, f"sunum:{sunum_id}", (sunum_anahtari(sunum_id),)
+        )
+
+    async def _onbellekli_sayfa(
+        self, scope, receive, send, sayfa: str, surum_anahtarlari: tuple[str, ...]
+    ) -> None:
+        # sayfa_onbellegi.onbellekli_sayfa'nın anonim ziyaretçi yolu; anahtar
+        # ve ETag aynı fonksiyonla üretilir.
+        basliklar = _basliklar(scope)
+        cerezler = parse_cookie(basliklar.get("cookie", ""))
+        if any(ad in cerezler for ad in self._oturum_cerezleri):
+            await self._wsgi(scope, receive, send)
+            return
+
+        anahtarlar = (GENEL, *surum_anahtarlari)
+        anahtar, etag = sayfa_dogrulayicilari(
+            sayfa, "anonim", anahtarlar, await self.okuyucu.surumler(*anahtarlar)
+        )
+
+        environ = {"REQUEST_METHOD": scope["method"]}
+        if "if-none-match" in basliklar:
+            environ["HTTP_IF_NONE_MATCH"] = basliklar["if-none-match"]
+
+        if not is_resource_modified(environ, etag=etag):
+            yanit = Response(status=304)
+        else:
+            onbellek = self.app.extensions.get("sayfa_onbellegi")
+            html = None
+            if onbellek is not None:
+                # Paylaşımlı önbellek SQLite dosyasından okur; döngü bloklanmasın.
+                if onbellek.paylasimli:
+                    html = await asyncio.to_thread(onbellek.get, anahtar)
+                else:
+                    html = onbellek.get(anahtar)
+            if html is None:
+                await self._wsgi(scope, receive, send)
+                return
+            yanit = Response(html, mimetype="text/html")
+
+        dogrulayicilari_ekle(yanit, etag)
+        await _yanit_gonder(send, yanit, environ, govde=scope["method"] != "HEAD")
+
+    async def _admin_oturumu(self, scope) -> bool:
+        # Flask oturum çerezi aynı anahtar ve süreyle doğrulanır; Flask-Login'in
+        # sakladığı kullanıcı admin ise True döner. Çerez yoksa, geçersizse ya
+        # da oturum yalnızca "beni hatırla" çereziyle açılacaksa False döner.
+        cerez = parse_cookie(_basliklar(scope).get("cookie", "")).get(
+            self.app.config["SESSION_COOKIE_NAME"]
+        )
+        imzalayici = self.app.session_interface.get_signing_serializer(self.app)
+        if not cerez or imzalayici is None:
+            return False
+        try:
+            oturum = imzalayici.loads(
+                cerez, max_age=int(self.app.permanent_session_lifetime.total_seconds())
+            )
+            kullanici_id = int(oturum["_user_id"])
+        except (BadSignature, KeyError, TypeError, ValueError):
+            return False
+        return await self.okuyucu.admin_mi(kullanici_id)
+
+    async def _api_sunumlar(self, scope, receive, send) -> None:
+        if not await self._admin_oturumu(scope):
+            await self._wsgi(scope, receive, send)
+            return
+
+        # İlk değer kullanılır (request.args.get gibi).
+        argumanlar: dict[str, str] = {}
+        sorgu = scope["query_string"].decode("latin-1")
+        for ad, deger in parse_qsl(sorgu, keep_blank_values=True):
+            argumanlar.setdefault(ad, deger)
+
+        try:
+            alanlar = alanlari_coz(
+                argumanlar.get("fields"), SUNUM_ALANLARI, VARSAYILAN_SUNUM_ALANLARI
+            )
+        except AlanSecimiHatasi as exc:
+            yanit = self.app.json.response({"hata": str(exc)})
+            yanit.status_code = 400
+        else:
+            yanit = self.app.json.response(
+                await self.okuyucu.sunum_sayfasi(
+                    alanlar,
+                    per_page=per_page_coz(argumanlar.get("per_page"), 50),
+                    cursor=argumanlar.get("cursor"),
+                )
+            )
+
+        environ = {"REQUEST_METHOD": scope["method"]}
+        await _yanit_gonder(send, yanit, environ, govde=scope["method"] != "HEAD")
+
+    async def _canli_skor(self, scope, receive, send, sunum_id: int) -> None:
+        # lifespan desteklemeyen sunucular için döngü burada da kaydedilir.
+        self.skor_yayini.baglan(asyncio.get_running_loop())
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream; charset=utf-8"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def yayinla() -> None:
+            async with aclosing(self.skor_yayini.olay_akisi(sunum_id)) as akis:
+                async for olay in akis:
+                    await send(
+                        {"type": "http.response.body", "body": olay.encode(), "more_body": True}
+                    )
+            await send({"type": "http.response.body", "body": b""})
+
+        # İstemci bağlantıyı kapattığında bekleyen akış iptal edilir.
+        yayin = asyncio.ensure_future(yayinla())
+        kopma = asyncio.ensure_future(_baglanti_kopmasi(receive))
+        await asyncio.wait((yayin, kopma), return_when=asyncio.FIRST_COMPLETED)
+        for gorev in (yayin, kopma):
+            gorev.cancel()
+        await asyncio.gather(yayin, kopma, return_exceptions=True)
+        if not yayin.cancelled() and yayin.exception() is not None:
+            raise yayin.exception()
+
+
+def asgi_uygulamasi_olustur(config: Optional[Mapping[str, Any]] = None) -> AsgiUygulamasi:
+    # WSGI→ASGI adaptörü (a2wsgi) isteğe bağlıdır; requirements-async.txt
+    # ile kurulur. Varsayılan dağıtım app.py ve gunicorn ile senkron kalır.
+    try:
+        from a2wsgi import WSGIMiddleware
+    except ImportError as exc:
+        raise AsenkronDesteklenmiyor(
+            "ASGI modu için 'pip install -r requirements-async.txt' ile a2wsgi kurulmalıdır."
+        ) from exc
+
+    app = create_app(config)
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    return AsgiUygulamasi(
+        app,
+        asenkron_okuyucu_olustur(app),
+        WSGIMiddleware(app, workers=app.config["ASGI_WSGI_THREADS"]),
+    )
@@ -1,26 +1,93 @@
 from __future__ import annotations
 
+import csv
+import io
+import math
 from datetime import datetime
 
-from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
-from flask import flash, redirect, render_template, request, url_for
+from flask import (
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask.views import MethodView
 from flask_login import login_required, login_user, logout_user, current_user
 
 from .extensions import db
 from .models import Ayarlar, Degerlendirme, Ekip, Ogrenci, Ogretmen, Sunum, User
-from .services.not_hesaplama import NotHesaplamaServisi
+from .services.ayarlar_onbellegi import aktif_ayarlar, ayarlar_onbellegi
+from .services.canli_skor import retry_olayi
+from .services.degerlendirici_adaylari import degerlendirici_adaylari
+from .services.disa_aktarim import (
+    BICIMLER,
+    TURLER,
+    XlsxDesteklenmiyor,
+    disa_aktarim_akisi,
+)
+from .services.icerik_surumleri import LISTE, sunum_anahtari
+from .services.not_hesaplama import NotHesaplamaServisi, degerlendirme_sorgusu, kolonlara_ayir
+from .services.ogrenci_arama import ogrenci_arama_filtresi
+from .services.okuma_api import (
+    DEGERLENDIRME_ALANLARI,
+    SUNUM_ALANLARI,
+    VARSAYILAN_DEGERLENDIRME_ALANLARI,
+    VARSAYILAN_SUNUM_ALANLARI,
+    AlanSecimiHatasi,
+    alanlari_coz,
+    degerlendirme_sayfasi,
+    sunum_not_dokumu,
+    sunum_sayfasi,
+)
+from .services.ogrenci_ice_aktarim import OgrenciIceAktarimServisi
+from .services.panel_istatistikleri import panel_sayaclari
+from .services.sayfa_onbellegi import onbellekli_sayfa
+from .services.sayfalama import keyset_sayfala, per_page_coz
+from .services.toplu_degerlendirme import TopluDegerlendirmeServisi
+
+
+def _per_page_argumani(per_page_arg: str, varsayilan_per_page: int) -> int:
+    return per_page_coz(request.args.get(per_page_arg), varsayilan_per_page)
+
+
+def _api_yetkisiz():
+    # Admin sayfalarındaki is_admin yönlendirmesinin JSON karşılığı.
+    return jsonify({"hata": "Bu işlem için yetkiniz yok."}), 403
+
+
+def _sayfa_argumanlari(page_arg: str, per_page_arg: str, varsayilan_per_page: int):
+    try:
+        page = int(request.args.get(page_arg, 1))
+    except (TypeError, ValueError):
+        page = 1
+
+    return page, _per_page_argumani(per_page_arg, varsayilan_per_page)
 
 
 class IndexView(MethodView):
     def get(self):
-        sunumlar = Sunum.query.order_by(Sunum.sunum_tarihi.desc()).all()
+        return onbellekli_sayfa("index", (LISTE,), self._render)
+
+    def _render(self) -> str:
+        sunumlar = (
+            Sunum.query.options(joinedload(Sunum.ekip))
+            .order_by(Sunum.sunum_tarihi.desc())
+            .all()
+        )
 
         servis = NotHesaplamaServisi()
+        final_notlari = servis.ozetten_final_notlari(sunumlar)
         sunum_listesi = []
         for sunum in sunumlar:
-            final_not_bilgisi = servis.hesapla_final_notu(sunum)
+            final_not_bilgisi = final_notlari[sunum.id]
             sunum_listesi.append(
                 {
                     "sunum": sunum,
@@ -39,20 +106,40 @@ class LoginView(MethodView):
         return render_template("login.html")
 
     def post(self):
-        username = request.form.get("username")
-        password = request.form.get("password")
+        username = request.form.get("username") or ""
+        password = request.form.get("password") or ""
+
+        sinir = current_app.extensions["giris_siniri"]
+        if sinir is not None:
+            bekleme = sinir.deneme_izni(request.remote_addr, username)
+            if bekleme:
+                return self._cok_fazla_deneme(bekleme)
 
         user = User.query.filter_by(username=username).first()
 
         if user and user.check_password(password):
+            if user.hash_yenilenmeli():
+                # Şifre düz metin olarak yalnızca burada elde olduğundan
+                # hash, ayarlı maliyetle giriş sırasında yeniden üretilir.
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             flash("Başarıyla giriş yaptınız!", "success")
             next_page = request.args.get("next")
             return redirect(next_page) if next_page else redirect(url_for("admin_panel"))
 
+        if sinir is not None:
+            sinir.basarisiz_deneme(request.remote_addr, username)
         flash("Kullanıcı adı veya şifre yanlış!", "error")
         return render_template("login.html")
 
+    @staticmethod
+    def _cok_fazla_deneme(bekleme: float):
+        flash("Çok fazla giriş denemesi. Lütfen biraz sonra tekrar deneyin.", "error")
+        yanit = make_response(render_template("login.html"), 429)
+        yanit.headers["Retry-After"] = str(math.ceil(bekleme))
+        return yanit
+
 
 class LogoutView(MethodView):
     decorators = [login_required]
@@ -74,50 +161,22 @@ class AdminPanelView(MethodView):
         ogr_q = (request.args.get("ogr_q") or "").strip()
         ogr_ekip_id = (request.args.get("ogr_ekip_id") or "").strip()
 
-        try:
-            ogr_page = int(request.args.get("ogr_page", 1))
-        except (TypeError, ValueError):
-            ogr_page = 1
-
-        try:
-            ogr_per_page = int(request.args.get("ogr_per_page", 10))
-        except (TypeError, ValueError):
-            ogr_per_page = 10
-
-        if ogr_per_page not in (10, 25, 50, 100):
-            ogr_per_page = 10
-
-        try:
-            deg_page = int(request.args.get("deg_page", 1))
-        except (TypeError, ValueError):
-            deg_page = 1
+        ogr_cursor = request.args.get("ogr_cursor") or None
+        ogr_per_page = _per_page_argumani("ogr_per_page", 10)
+        ogt_page, ogt_per_page = _sayfa_argumanlari("ogt_page", "ogt_per_page", 10)
+        sun_page, sun_per_page = _sayfa_argumanlari("sun_page", "sun_per_page", 10)
+        deg_cursor = request.args.get("deg_cursor") or None
+        deg_per_page = _per_page_argumani("deg_per_page", 10)
 
-        try:
-            deg_per_page = int(request.args.get("deg_per_page", 10))
-        except (TypeError, ValueError):
-            deg_per_page = 10
-
-        if deg_per_page not in (10, 25, 50, 100):
-            deg_per_page = 10
-
-        ekip_sayisi = Ekip.query.count()
-        ogrenci_sayisi = Ogrenci.query.count()
-        ogretmen_sayisi = Ogretmen.query.count()
-        sunum_sayisi = Sunum.query.count()
+        sayaclar = panel_sayaclari()
 
         ekipler = Ekip.query.all()
+        ekip_uye_sayilari = Ekip.uye_sayilari()
 
-        ogr_query = Ogrenci.query
+        ogr_query = Ogrenci.query.options(joinedload(Ogrenci.ekip))
 
         if ogr_q:
-            like = f"%{ogr_q}%"
-            ogr_query = ogr_query.filter(
-                or_(
-                    Ogrenci.ad.ilike(like),
-                    Ogrenci.soyad.ilike(like),
-                    Ogrenci.numara.ilike(like),
-                )
-            )
+            ogr_query = ogr_query.filter(ogrenci_arama_filtresi(ogr_q))
 
         if ogr_ekip_id:
             try:
@@ -126,39 +185,82 @@ class AdminPanelView(MethodView):
             except (TypeError, ValueError):
                 ogr_ekip_id = ""
 
-        ogr_query = ogr_query.order_by(Ogrenci.id.asc())
-        ogr_pagination = ogr_query.paginate(page=ogr_page, per_page=ogr_per_page, error_out=False)
+        # Filtresiz listelerin toplamları sayaçlardan bilindiği için
+        # ayrıca COUNT(*) çalıştırılmaz.
+        ogr_filtreli = bool(ogr_q or ogr_ekip_id)
+        ogr_pagination = keyset_sayfala(
+            ogr_query,
+            Ogrenci.id,
+            per_page=ogr_per_page,
+            cursor=ogr_cursor,
+            total=None if ogr_filtreli else sayaclar.ogrenci,
+            total_hesapla=ogr_query.count if ogr_filtreli else None,
+        )
         ogrenciler = ogr_pagination.items
 
-        ogretmenler = Ogretmen.query.all()
-        sunumlar = Sunum.query.all()
+        ogt_pagination = Ogretmen.query.order_by(Ogretmen.id.asc()).paginate(
+            page=ogt_page, per_page=ogt_per_page, error_out=False, count=False
+        )
+        ogt_pagination.total = sayaclar.ogretmen
+
+        sun_pagination = (
+            Sunum.query.options(joinedload(Sunum.ekip))
+            .order_by(Sunum.id.asc())
+            .paginate(page=sun_page, per_page=sun_per_page, error_out=False, count=False)
+        )
+        sun_pagination.total = sayaclar.sunum
 
-        deg_query = Degerlendirme.query.order_by(Degerlendirme.id.desc())
-        deg_pagination = deg_query.paginate(page=deg_page, per_page=deg_per_page, error_out=False)
+        deg_query = (
+            degerlendirme_sorgusu(
+                Sunum.baslik.label("sunum_baslik"),
+                Ekip.isim.label("ekip_isim"),
+                degerlendiren=True,
+            )
+            .join(Sunum, Sunum.id == Degerlendirme.sunum_id)
+            .join(Ekip, Ekip.id == Sunum.ekip_id)
+        )
+        deg_pagination = keyset_sayfala(
+            deg_query,
+            Degerlendirme.id,
+            per_page=deg_per_page,
+            cursor=deg_cursor,
+            azalan=True,
+            total=sayaclar.degerlendirme,
+        )
 
         servis = NotHesaplamaServisi()
+        ortalamalar = servis.hesapla_agirlikli_ortalamalar(
+            kolonlara_ayir(deg_pagination.items).kriterler
+        )
         degerlendirmeler_with_avg = [
-            {"degerlendirme": d, "ortalama": servis.hesapla_agirlikli_ortalama(d)}
-            for d in deg_pagination.items
+            {"degerlendirme": d, "ortalama": ortalama}
+            for d, ortalama in zip(deg_pagination.items, ortalamalar)
         ]
 
         return render_template(
             "admin.html",
-            ekip_sayisi=ekip_sayisi,
-            ogrenci_sayisi=ogrenci_sayisi,
-            ogretmen_sayisi=ogretmen_sayisi,
-            sunum_sayisi=sunum_sayisi,
+            ekip_sayisi=sayaclar.ekip,
+            ogrenci_sayisi=sayaclar.ogrenci,
+            ogretmen_sayisi=sayaclar.ogretmen,
+            sunum_sayisi=sayaclar.sunum,
             ekipler=ekipler,
+            ekip_uye_sayilari=ekip_uye_sayilari,
             ogrenciler=ogrenciler,
             ogr_pagination=ogr_pagination,
+            ogr_cursor=ogr_cursor,
             ogr_q=ogr_q,
             ogr_ekip_id=ogr_ekip_id,
             ogr_per_page=ogr_per_page,
             degerlendirmeler_with_avg=degerlendirmeler_with_avg,
             deg_pagination=deg_pagination,
+            deg_cursor=deg_cursor,
             deg_per_page=deg_per_page,
-            ogretmenler=ogretmenler,
-            sunumlar=sunumlar,
+            ogretmenler=ogt_pagination.items,
+            ogt_pagination=ogt_pagination,
+            ogt_per_page=ogt_per_page,
+            sunumlar=sun_pagination.items,
+            sun_pagination=sun_pagination,
+            sun_per_page=sun_per_page,
         )
 
 
@@ -181,7 +283,9 @@ class AdminDegerlendirmeView(MethodView):
                 flash("Değerlendirme bulunamadı!", "error")
                 return redirect(url_for("admin_panel") + "#degerlendirme")
 
+            sunum_id = degerlendirme.sunum_id
             db.session.delete(degerlendirme)
+            NotHesaplamaServisi().ozet_guncelle(sunum_id)
             db.session.commit()
             flash("Değerlendirme başarıyla silindi!", "success")
 
@@ -190,19 +294,30 @@ class AdminDegerlendirmeView(MethodView):
 
 class SunumDetayView(MethodView):
     def get(self, sunum_id: int):
-        sunum = Sunum.query.get_or_404(sunum_id)
+        return onbellekli_sayfa(
+            f"sunum:{sunum_id}",
+            (sunum_anahtari(sunum_id),),
+            lambda: self._render(sunum_id),
+        )
+
+    def _render(self, sunum_id: int) -> str:
+        sunum = Sunum.query.options(joinedload(Sunum.ekip)).filter_by(id=sunum_id).first_or_404()
         servis = NotHesaplamaServisi()
 
-        final_not_bilgisi = servis.hesapla_final_notu(sunum)
+        final_not_bilgisi = servis.ozetten_final_notlari([sunum])[sunum.id]
         degerlendirmeler = (
-            Degerlendirme.query.filter_by(sunum_id=sunum_id)
+            degerlendirme_sorgusu(Degerlendirme.yorum, degerlendiren=True)
+            .filter(Degerlendirme.sunum_id == sunum_id)
             .order_by(Degerlendirme.id.desc())
             .all()
         )
 
+        ortalamalar = servis.hesapla_agirlikli_ortalamalar(
+            kolonlara_ayir(degerlendirmeler).kriterler
+        )
         degerlendirmeler_with_avg = [
-            {"degerlendirme": d, "ortalama": servis.hesapla_agirlikli_ortalama(d)}
-            for d in degerlendirmeler
+            {"degerlendirme": d, "ortalama": ortalama}
+            for d, ortalama in zip(degerlendirmeler, ortalamalar)
         ]
 
         return render_template(
@@ -213,63 +328,43 @@ class SunumDetayView(MethodView):
         )
 
 
-class DegerlendirmeYapView(MethodView):
+class SunumCanliSkorView(MethodView):
     def get(self, sunum_id: int):
-        sunum = Sunum.query.get_or_404(sunum_id)
-
-        # Öğrenci aynı sunuma birden fazla değerlendirme yapamasın:
-        # formdaki listeden daha önce değerlendirme yapan öğrencileri çıkar.
-        existing_student_rows = (
-            db.session.query(Degerlendirme.degerlendiren_ogrenci_id)
-            .filter(
-                Degerlendirme.sunum_id == sunum_id,
-                Degerlendirme.degerlendiren_tipi == "ogrenci",
-                Degerlendirme.degerlendiren_ogrenci_id.isnot(None),
+        yayin = current_app.extensions["skor_yayini"]
+        if not yayin.akis_ayir():
+            # Worker'ın akış kotası dolu; istemci bir akış süresi sonra
+            # yeniden dener.
+            return Response(
+                retry_olayi(yayin.akis_suresi),
+                status=503,
+                mimetype="text/event-stream",
+                headers={
+                    "Cache-Control": "no-cache",
+                    "Retry-After": str(math.ceil(yayin.akis_suresi)),
+                },
             )
-            .all()
+
+        yanit = Response(
+            stream_with_context(yayin.olay_akisi(sunum_id)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
-        existing_student_ids = [row[0] for row in existing_student_rows if row[0] is not None]
+        # Akış hiç başlamadan kapansa da yer geri verilir.
+        yanit.call_on_close(yayin.akis_birak)
+        return yanit
 
-        query = Ogrenci.query.filter(Ogrenci.ekip_id != sunum.ekip_id)
-        if existing_student_ids:
-            query = query.filter(~Ogrenci.id.in_(existing_student_ids))
 
-        ogrenciler = query.all()
-        ogretmenler = Ogretmen.query.all()
+class DegerlendirmeYapView(MethodView):
+    def get(self, sunum_id: int):
+        sunum = (
+            Sunum.query.options(joinedload(Sunum.ekip)).filter_by(id=sunum_id).first_or_404()
+        )
 
-        ayarlar_obj = Ayarlar.get_aktif_ayarlar()
-        kriterler = [
-            {
-                "key": "konu_hakimiyeti",
-                "label": ayarlar_obj.konu_hakimiyeti_etiket or "Konu Hakimiyeti",
-                "weight": ayarlar_obj.konu_hakimiyeti_agirlik,
-            },
-            {
-                "key": "anlatim",
-                "label": ayarlar_obj.anlatim_etiket or "Anlatım",
-                "weight": ayarlar_obj.anlatim_agirlik,
-            },
-            {
-                "key": "giyim",
-                "label": ayarlar_obj.giyim_etiket or "Giyim",
-                "weight": ayarlar_obj.giyim_agirlik,
-            },
-            {
-                "key": "ekip_uyumu",
-                "label": ayarlar_obj.ekip_uyumu_etiket or "Ekip Uyumu ve Görev Paylaşımı",
-                "weight": ayarlar_obj.ekip_uyumu_agirlik,
-            },
-            {
-                "key": "gorsellik",
-                "label": ayarlar_obj.gorsellik_etiket or "Görsellik",
-                "weight": ayarlar_obj.gorsellik_agirlik,
-            },
-            {
-                "key": "genel_gorus",
-                "label": ayarlar_obj.genel_gorus_etiket or "Genel Görüş",
-                "weight": ayarlar_obj.genel_gorus_agirlik,
-            },
-        ]
+        # Öğrenci aynı sunuma birden fazla değerlendirme yapamasın: listede
+        # yalnızca sunumu henüz değerlendirmemiş, başka ekiplerden öğrenciler.
+        ogrenciler, ogretmenler = degerlendirici_adaylari().getir(sunum)
+
+        kriterler = aktif_ayarlar().kriterler()
 
         return render_template(
             "degerlendirme_yap.html",
@@ -322,6 +417,7 @@ class DegerlendirmeYapView(MethodView):
 
         try:
             db.session.add(degerlendirme)
+            NotHesaplamaServisi().ozet_guncelle(sunum_id)
             db.session.commit()
             flash("Değerlendirme başarıyla kaydedildi!", "success")
             return redirect(url_for("sunum_detay", sunum_id=sunum_id))
@@ -338,6 +434,167 @@ class DegerlendirmeYapView(MethodView):
             return redirect(url_for("degerlendirme_yap", sunum_id=sunum_id))
 
 
+class TopluDegerlendirmeView(MethodView):
+    decorators = [login_required]
+
+    def post(self):
+        if not current_user.is_admin:
+            return _api_yetkisiz()
+
+        veri = request.get_json(silent=True)
+        satirlar = veri.get("degerlendirmeler") if isinstance(veri, dict) else veri
+
+        if not isinstance(satirlar, list) or not satirlar:
+            return jsonify({"hata": "'degerlendirmeler' listesi gerekli."}), 400
+
+        if len(satirlar) > TopluDegerlendirmeServisi.MAKS_SATIR:
+            return (
+                jsonify(
+                    {
+                        "hata": "Tek istekte en fazla "
+                        f"{TopluDegerlendirmeServisi.MAKS_SATIR} değerlendirme gönderilebilir."
+                    }
+                ),
+                413,
+            )
+
+        sonuc = TopluDegerlendirmeServisi().kaydet(satirlar)
+        return jsonify(sonuc.to_dict())
+
+
+class ApiSunumlarView(MethodView):
+    decorators = [login_required]
+
+    def get(self):
+        if not current_user.is_admin:
+            return _api_yetkisiz()
+
+        try:
+            alanlar = alanlari_coz(
+                request.args.get("fields"), SUNUM_ALANLARI, VARSAYILAN_SUNUM_ALANLARI
+            )
+        except AlanSecimiHatasi as exc:
+            return jsonify({"hata": str(exc)}), 400
+
+        return jsonify(
+            sunum_sayfasi(
+                alanlar,
+                per_page=_per_page_argumani("per_page", 50),
+                cursor=request.args.get("cursor"),
+            )
+        )
+
+
+class ApiSunumView(MethodView):
+    decorators = [login_required]
+
+    def get(self, sunum_id: int):
+        if not current_user.is_admin:
+            return _api_yetkisiz()
+
+        sunum = Sunum.query.options(joinedload(Sunum.ekip)).filter_by(id=sunum_id).first()
+        if sunum is None:
+            return jsonify({"hata": "Sunum bulunamadı."}), 404
+        return jsonify(sunum_not_dokumu(sunum))
+
+
+class ApiDegerlendirmelerView(MethodView):
+    decorators = [login_required]
+
+    def get(self):
+        if not current_user.is_admin:
+            return _api_yetkisiz()
+
+        try:
+            alanlar = alanlari_coz(
+                request.args.get("fields"),
+                DEGERLENDIRME_ALANLARI,
+                VARSAYILAN_DEGERLENDIRME_ALANLARI,
+            )
+        except AlanSecimiHatasi as exc:
+            return jsonify({"hata": str(exc)}), 400
+
+        return jsonify(
+            degerlendirme_sayfasi(
+                alanlar,
+                per_page=_per_page_argumani("per_page", 50),
+                cursor=request.args.get("cursor"),
+                sunum_id=request.args.get("sunum_id", type=int),
+            )
+        )
+
+
+class AdminDisaAktarView(MethodView):
+    decorators = [login_required]
+
+    _MIME_TURLERI = {
+        "csv": "text/csv",
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    }
+
+    def get(self):
+        if not current_user.is_admin:
+            return redirect(url_for("index"))
+
+        tur = request.args.get("tur", "notlar")
+        bicim = request.args.get("bicim", "csv")
+        if tur not in TURLER or bicim not in BICIMLER:
+            flash("Geçersiz dışa aktarım seçimi!", "error")
+            return redirect(url_for("admin_panel") + "#degerlendirme")
+
+        try:
+            akis = disa_aktarim_akisi(tur, bicim)
+        except XlsxDesteklenmiyor as exc:
+            flash(str(exc), "error")
+            return redirect(url_for("admin_panel") + "#degerlendirme")
+
+        dosya_adi = f"{tur}_{datetime.now():%Y%m%d_%H%M}.{bicim}"
+        return Response(
+            stream_with_context(akis),
+            mimetype=self._MIME_TURLERI[bicim],
+            headers={"Content-Disposition": f'attachment; filename="{dosya_adi}"'},
+        )
+
+
+class AdminIstatistikView(MethodView):
+    decorators = [login_required]
+
+    def get(self):
+        if not current_user.is_admin:
+            return redirect(url_for("index"))
+
+        olcumu = current_app.extensions["istek_olcumu"]
+        return render_template(
+            "admin_istatistik.html",
+            olcum_acik=olcumu is not None,
+            istatistikler=olcumu.istatistikler() if olcumu else [],
+        )
+
+    def post(self):
+        if not current_user.is_admin:
+            return redirect(url_for("index"))
+
+        olcumu = current_app.extensions["istek_olcumu"]
+        if olcumu is not None:
+            olcumu.sifirla()
+            flash("İstek istatistikleri sıfırlandı.", "success")
+        return redirect(url_for("admin_istatistik"))
+
+
+class MetricsView(MethodView):
+    def get(self):
+        olcumu = current_app.extensions["istek_olcumu"]
+        if olcumu is None:
+            return ("", 404)
+        izinli = request.remote_addr in current_app.config["ISTEK_OLCUMU_METRICS_ADRESLERI"]
+        if not izinli and not (current_user.is_authenticated and current_user.is_admin):
+            return ("", 403)
+        return Response(
+            olcumu.prometheus_metni(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
 class AyarlarView(MethodView):
     decorators = [login_required]
 
@@ -397,7 +654,10 @@ class AyarlarView(MethodView):
             )
             return redirect(url_for("ayarlar"))
 
+        # Ağırlıklar tüm notları etkilediği için özet tablosu baştan kurulur.
+        NotHesaplamaServisi(ayarlar_obj).ozetleri_yeniden_olustur()
         db.session.commit()
+        ayarlar_onbellegi().surumu_artir()
         flash("Ayarlar başarıyla güncellendi!", "success")
         return redirect(url_for("ayarlar"))
 
@@ -409,7 +669,9 @@ class AdminEkipView(MethodView):
         if not current_user.is_admin:
             return redirect(url_for("index"))
         ekipler = Ekip.query.all()
-        return render_template("admin_ekip.html", ekipler=ekipler)
+        return render_template(
+            "admin_ekip.html", ekipler=ekipler, ekip_uye_sayilari=Ekip.uye_sayilari()
+        )
 
     def post(self):
         if not current_user.is_admin:
@@ -447,30 +709,13 @@ class AdminOgrenciView(MethodView):
         q = (request.args.get("q") or "").strip()
         ekip_id = (request.args.get("ekip_id") or "").strip()
 
-        try:
-            page = int(request.args.get("page", 1))
-        except (TypeError, ValueError):
-            page = 1
-
-        try:
-            per_page = int(request.args.get("per_page", 25))
-        except (TypeError, ValueError):
-            per_page = 25
-
-        if per_page not in (10, 25, 50, 100):
-            per_page = 25
+        cursor = request.args.get("cursor") or None
+        per_page = _per_page_argumani("per_page", 25)
 
-        query = Ogrenci.query
+        query = Ogrenci.query.options(joinedload(Ogrenci.ekip))
 
         if q:
-            like = f"%{q}%"
-            query = query.filter(
-                or_(
-                    Ogrenci.ad.ilike(like),
-                    Ogrenci.soyad.ilike(like),
-                    Ogrenci.numara.ilike(like),
-                )
-            )
+            query = query.filter(ogrenci_arama_filtresi(q))
 
         if ekip_id:
             try:
@@ -479,8 +724,13 @@ class AdminOgrenciView(MethodView):
             except (TypeError, ValueError):
                 ekip_id = ""
 
-        query = query.order_by(Ogrenci.id.asc())
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        pagination = keyset_sayfala(
+            query,
+            Ogrenci.id,
+            per_page=per_page,
+            cursor=cursor,
+            total_hesapla=query.count,
+        )
 
         ekipler = Ekip.query.order_by(Ekip.isim.asc()).all()
         return render_template(
@@ -542,9 +792,43 @@ class AdminOgrenciView(MethodView):
                 db.session.delete(ogrenci)
                 db.session.commit()
                 flash("Öğrenci başarıyla silindi!", "success")
+        elif "ice_aktar" in request.form:
+            self._ice_aktar()
 
         return redirect(url_for("admin_panel") + "#ogrenci")
 
+    def _ice_aktar(self) -> None:
+        dosya = request.files.get("dosya")
+        if not dosya or not dosya.filename:
+            flash("Lütfen bir CSV dosyası seçin!", "error")
+            return
+
+        metin = io.TextIOWrapper(dosya.stream, encoding="utf-8-sig", newline="")
+        try:
+            sonuc = OgrenciIceAktarimServisi().ice_aktar(metin)
+        except UnicodeDecodeError:
+            db.session.rollback()
+            flash("Dosya UTF-8 kodlamalı bir CSV olmalıdır!", "error")
+            return
+        except csv.Error as exc:
+            db.session.rollback()
+            flash(f"CSV dosyası okunamadı: {exc}", "error")
+            return
+        except IntegrityError:
+            # Aynı numara başka bir istekle eşzamanlı eklendiyse hiçbir satır
+            # yazılmaz; dosya yeniden yüklenebilir.
+            db.session.rollback()
+            flash("İçe aktarım sırasında kayıt çakışması oluştu, hiçbir satır kaydedilmedi!", "error")
+            return
+
+        flash(
+            f"İçe aktarım tamamlandı. Eklenen: {sonuc.eklenen}, güncellenen: {sonuc.guncellenen}, "
+            f"yeni ekip: {sonuc.olusturulan_ekip}, hatalı satır: {len(sonuc.hatalar)}.",
+            "success" if not sonuc.hatalar else "warning",
+        )
+        for hata in sonuc.hatalar[:5]:
+            flash(f"Satır {hata.satir}: {hata.mesaj}", "error")
+
 
 class AdminOgretmenView(MethodView):
     decorators = [login_required]
@@ -592,7 +876,7 @@ class AdminSunumView(MethodView):
     def get(self):
         if not current_user.is_admin:
             return redirect(url_for("index"))
-        sunumlar = Sunum.query.all()
+        sunumlar = Sunum.query.options(joinedload(Sunum.ekip)).all()
         ekipler = Ekip.query.all()
         return render_template("admin_sunum.html", sunumlar=sunumlar, ekipler=ekipler)
 
@@ -608,6 +892,8 @@ class AdminSunumView(MethodView):
                 ekip_id=int(request.form.get("ekip_id")),
             )
             db.session.add(sunum)
+            db.session.flush()
+            NotHesaplamaServisi().ozet_guncelle(sunum.id)
             db.session.commit()
             flash("Sunum başarıyla eklendi!", "success")
         elif "duzenle" in request.form:
@@ -2,12 +2,35 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from flask import current_app, has_app_context
 from flask_login import UserMixin
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .extensions import db
 
 
+# werkzeug biçimi: "scrypt:N:r:p" ya da "pbkdf2:hash:iterasyon".
+VARSAYILAN_SIFRE_HASH_YONTEMI = "scrypt:32768:8:1"
+_HASH_VARSAYILANLARI = {"scrypt": ("32768", "8", "1"), "pbkdf2": ("sha256", "600000")}
+
+
+def hash_yontemi_coz(yontem: str) -> str:
+    # Eksik parametreler werkzeug varsayılanlarıyla tamamlanır; sonuç,
+    # saklanan hash'in "$" öncesindeki kısmıyla birebir karşılaştırılabilir.
+    ad, *parametreler = yontem.split(":")
+    varsayilanlar = _HASH_VARSAYILANLARI.get(ad)
+    if varsayilanlar is None or len(parametreler) > len(varsayilanlar):
+        raise ValueError(f"Desteklenmeyen şifre hash yöntemi: {yontem!r}")
+    return ":".join([ad, *parametreler, *varsayilanlar[len(parametreler) :]])
+
+
+def sifre_hash_yontemi() -> str:
+    yontem = VARSAYILAN_SIFRE_HASH_YONTEMI
+    if has_app_context():
+        yontem = current_app.config.get("SIFRE_HASH_YONTEMI", yontem)
+    return hash_yontemi_coz(yontem)
+
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -16,11 +39,15 @@ class User(UserMixin, db.Model):
     is_admin = db.Column(db.Boolean, default=False)
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=sifre_hash_yontemi())
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
 
+    def hash_yenilenmeli(self) -> bool:
+        # Hash, ayarlı yöntem/parametrelerden farklı bir maliyetle üretilmiş.
+        return self.password_hash.split("$", 1)[0] != sifre_hash_yontemi()
+
     @classmethod
     def ensure_default_admin(cls) -> None:
         if not cls.query.filter_by(username="admin").first():
@@ -70,6 +97,18 @@ class Ekip(db.Model):
     ogrenciler = db.relationship("Ogrenci", backref="ekip", lazy=True)
     sunumlar = db.relationship("Sunum", backref="ekip", lazy=True)
 
+    @classmethod
+    def uye_sayilari(cls) -> dict[int, int]:
+        # Ekip başına öğrenci sayısı tek bir GROUP BY sorgusuyla alınır;
+        # listelerde ekip.ogrenciler koleksiyonunu yüklemeye gerek kalmaz.
+        rows = (
+            db.session.query(Ogrenci.ekip_id, db.func.count(Ogrenci.id))
+            .filter(Ogrenci.ekip_id.isnot(None))
+            .group_by(Ogrenci.ekip_id)
+            .all()
+        )
+        return {ekip_id: sayi for ekip_id, sayi in rows}
+
     def __repr__(self) -> str:
         return f"<Ekip {self.isim}>"
 
@@ -79,7 +118,7 @@ class Ogrenci(db.Model):
     ad = db.Column(db.String(100), nullable=False)
     soyad = db.Column(db.String(100), nullable=False)
     numara = db.Column(db.String(20), unique=True, nullable=False)
-    ekip_id = db.Column(db.Integer, db.ForeignKey("ekip.id"), nullable=True)
+    ekip_id = db.Column(db.Integer, db.ForeignKey("ekip.id"), nullable=True, index=True)
 
     yaptigi_degerlendirmeler = db.relationship(
         "Degerlendirme", backref="degerlendiren_ogrenci", lazy=True
@@ -115,12 +154,15 @@ class Sunum(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     baslik = db.Column(db.String(200), nullable=False)
     aciklama = db.Column(db.Text)
-    sunum_tarihi = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    ekip_id = db.Column(db.Integer, db.ForeignKey("ekip.id"), nullable=False)
+    sunum_tarihi = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    ekip_id = db.Column(db.Integer, db.ForeignKey("ekip.id"), nullable=False, index=True)
 
     degerlendirmeler = db.relationship(
         "Degerlendirme", backref="sunum", lazy=True, cascade="all, delete-orphan"
     )
+    not_ozeti = db.relationship(
+        "SunumNotOzeti", backref="sunum", uselist=False, cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<Sunum {self.baslik}>"
@@ -145,6 +187,7 @@ class Degerlendirme(db.Model):
     __table_args__ = (
         db.UniqueConstraint("sunum_id", "degerlendiren_ogrenci_id", name="unique_ogrenci_degerlendirme"),
         db.UniqueConstraint("sunum_id", "degerlendiren_ogretmen_id", name="unique_ogretmen_degerlendirme"),
+        db.Index("ix_degerlendirme_sunum_tipi", "sunum_id", "degerlendiren_tipi"),
     )
 
     def degerlendiren_adi(self) -> str:
@@ -156,3 +199,43 @@ class Degerlendirme(db.Model):
 
     def __repr__(self) -> str:
         return f"<Degerlendirme {self.id}>"
+
+
+class SunumNotOzeti(db.Model):
+    # Sunum başına önceden hesaplanmış not özeti. Değerlendirme yazımlarıyla
+    # aynı transaction içinde güncellenir, ağırlıklar değişince yeniden kurulur.
+    __tablename__ = "sunum_not_ozeti"
+
+    sunum_id = db.Column(db.Integer, db.ForeignKey("sunum.id"), primary_key=True)
+    ogretmen_notu = db.Column(db.Float, nullable=True)
+    ogrenci_not_toplami = db.Column(db.Float, nullable=False, default=0.0)
+    ogrenci_degerlendirme_sayisi = db.Column(db.Integer, nullable=False, default=0)
+    ogrenci_ortalama = db.Column(db.Float, nullable=True)
+    final_notu = db.Column(db.Float, nullable=True)
+    degerlendirme_sayisi = db.Column(db.Integer, nullable=False, default=0)
+
+    def final_not_bilgisi(self) -> dict:
+        # Alanlar not_hesaplama.OZET_ALANLARI ile aynı kalmalıdır.
+        return {
+            "ogretmen_notu": self.ogretmen_notu,
+            "ogrenci_ortalama": self.ogrenci_ortalama,
+            "final_notu": self.final_notu,
+            "degerlendirme_sayisi": self.ogrenci_degerlendirme_sayisi,
+        }
+
+    def __repr__(self) -> str:
+        return f"<SunumNotOzeti {self.sunum_id}>"
+
+
+class IcerikSurumu(db.Model):
+    # Herkese açık sayfaların önbellek anahtarlarında kullanılan sürüm
+    # sayaçları ("genel", "liste", "sunum:<id>"). Veriyi değiştiren flush ile
+    # aynı transaction içinde artırılır.
+    __tablename__ = "icerik_surumu"
+
+    anahtar = db.Column(db.String(64), primary_key=True)
+    surum = db.Column(db.Integer, nullable=False, default=0)
+    guncellenme = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<IcerikSurumu {self.anahtar}={self.surum}>"
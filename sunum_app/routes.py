@@ -3,21 +3,29 @@ from __future__ import annotations
 import os
 
 from flask import Flask
-from flask import jsonify
+from flask import jsonify, request
 
 from .controllers import (
     AdminEkipView,
     AdminDegerlendirmeView,
+    AdminDisaAktarView,
+    AdminIstatistikView,
     AdminOgretmenView,
     AdminOgrenciView,
     AdminPanelView,
     AdminSunumView,
+    ApiDegerlendirmelerView,
+    ApiSunumlarView,
+    ApiSunumView,
     AyarlarView,
     DegerlendirmeYapView,
     IndexView,
     LoginView,
     LogoutView,
+    MetricsView,
+    SunumCanliSkorView,
     SunumDetayView,
+    TopluDegerlendirmeView,
 )
 
 
@@ -26,7 +34,7 @@ def register_routes(app: Flask) -> None:
         return ("", 204)
 
     def build_info():
-        return jsonify(
+        yanit = jsonify(
             {
                 "render": {
                     "service_id": os.getenv("RENDER_SERVICE_ID"),
@@ -35,6 +43,9 @@ def register_routes(app: Flask) -> None:
                 }
             }
         )
+        yanit.add_etag()
+        yanit.cache_control.no_cache = True
+        return yanit.make_conditional(request)
 
     app.add_url_rule("/", view_func=IndexView.as_view("index"))
 
@@ -42,6 +53,8 @@ def register_routes(app: Flask) -> None:
 
     app.add_url_rule("/__build", view_func=build_info)
 
+    app.add_url_rule("/metrics", view_func=MetricsView.as_view("metrics"))
+
     app.add_url_rule(
         "/login",
         view_func=LoginView.as_view("login"),
@@ -55,6 +68,10 @@ def register_routes(app: Flask) -> None:
         "/sunum/<int:sunum_id>",
         view_func=SunumDetayView.as_view("sunum_detay"),
     )
+    app.add_url_rule(
+        "/sunum/<int:sunum_id>/canli",
+        view_func=SunumCanliSkorView.as_view("sunum_canli_skor"),
+    )
 
     app.add_url_rule(
         "/sunum/<int:sunum_id>/degerlendirme",
@@ -62,6 +79,22 @@ def register_routes(app: Flask) -> None:
         methods=["GET", "POST"],
     )
 
+    app.add_url_rule("/api/sunumlar", view_func=ApiSunumlarView.as_view("api_sunumlar"))
+    app.add_url_rule(
+        "/api/sunumlar/<int:sunum_id>",
+        view_func=ApiSunumView.as_view("api_sunum"),
+    )
+    app.add_url_rule(
+        "/api/degerlendirmeler",
+        view_func=ApiDegerlendirmelerView.as_view("api_degerlendirmeler"),
+    )
+
+    app.add_url_rule(
+        "/api/degerlendirmeler/toplu",
+        view_func=TopluDegerlendirmeView.as_view("toplu_degerlendirme"),
+        methods=["POST"],
+    )
+
     app.add_url_rule(
         "/ayarlar",
         view_func=AyarlarView.as_view("ayarlar"),
@@ -78,6 +111,15 @@ def register_routes(app: Flask) -> None:
         view_func=AdminDegerlendirmeView.as_view("admin_degerlendirme"),
         methods=["POST"],
     )
+    app.add_url_rule(
+        "/admin/disa-aktar",
+        view_func=AdminDisaAktarView.as_view("admin_disa_aktar"),
+    )
+    app.add_url_rule(
+        "/admin/istatistikler",
+        view_func=AdminIstatistikView.as_view("admin_istatistik"),
+        methods=["GET", "POST"],
+    )
     app.add_url_rule(
         "/admin/ogrenci",
         view_func=AdminOgrenciView.as_view("admin_ogrenci"),
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from .extensions import db
+from .models import Ayarlar, IcerikSurumu, Sunum, SunumNotOzeti, User
+from .services.not_hesaplama import NotHesaplamaServisi
+from .services.ogrenci_arama import arama_tablosunu_olustur
+
+
+SURUM_TABLOSU = "schema_version"
+KILIT_DOSYASI = "db-upgrade.lock"
+
+
+@dataclass(frozen=True)
+class Goc:
+    surum: int
+    aciklama: str
+    uygula: Callable[[], None]
+
+
+def _sqlite_mi() -> bool:
+    return db.engine.dialect.name == "sqlite"
+
+
+# Her adım idempotenttir: schema_version tablosundan önceki veritabanlarında
+# adımların bir kısmı zaten uygulanmış olabilir.
+
+
+def _temel_tablolar() -> None:
+    db.metadata.create_all(bind=db.session.connection())
+
+
+def _ayarlar_etiket_kolonlari() -> None:
+    # create_all mevcut tablolara kolon eklemez.
+    conn = db.session.connection()
+    if not _sqlite_mi():
+        return
+
+    columns = conn.exec_driver_sql("PRAGMA table_info(ayarlar)").fetchall()
+    existing = {row[1] for row in columns}
+    for col in (
+        "konu_hakimiyeti_etiket",
+        "anlatim_etiket",
+        "giyim_etiket",
+        "ekip_uyumu_etiket",
+        "gorsellik_etiket",
+        "genel_gorus_etiket",
+    ):
+        if col not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE ayarlar ADD COLUMN {col} TEXT")
+
+
+def _ikincil_indexler() -> None:
+    conn = db.session.connection()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _ogrenci_arama_indeksi() -> None:
+    if _sqlite_mi():
+        arama_tablosunu_olustur(db.session.connection())
+
+
+def _varsayilan_ayarlar() -> None:
+    # Ayar satırı istek ortasında commit ile oluşturulursa session'daki
+    # eager-load edilmiş nesneler expire olur; satır baştan garanti edilir.
+    Ayarlar.get_aktif_ayarlar()
+
+
+def _not_ozetleri() -> None:
+    # Özet tablosu sonradan eklendiği için mevcut veritabanlarında boş gelir;
+    # mevcut değerlendirmelerden bir kez doldurulur.
+    if SunumNotOzeti.query.first() is not None or Sunum.query.first() is None:
+        return
+    NotHesaplamaServisi(Ayarlar.get_aktif_ayarlar()).ozetleri_yeniden_olustur()
+
+
+def _varsayilan_yonetici() -> None:
+    User.ensure_default_admin()
+
+
+def _icerik_surum_tablosu() -> None:
+    IcerikSurumu.__table__.create(bind=db.session.connection(), checkfirst=True)
+
+
+# Sıra önemlidir; yeni adımlar yalnızca listenin sonuna, bir sonraki
+# sürüm numarasıyla eklenir.
+GOCLER: tuple[Goc, ...] = (
+    Goc(1, "Temel tablolar", _temel_tablolar),
+    Goc(2, "Ayarlar etiket kolonları", _ayarlar_etiket_kolonlari),
+    Goc(3, "İkincil index'ler", _ikincil_indexler),
+    Goc(4, "Öğrenci arama indeksi", _ogrenci_arama_indeksi),
+    Goc(5, "Varsayılan ayarlar", _varsayilan_ayarlar),
+    Goc(6, "Sunum not özetleri", _not_ozetleri),
+    Goc(7, "Varsayılan yönetici", _varsayilan_yonetici),
+    Goc(8, "İçerik sürüm tablosu", _icerik_surum_tablosu),
+)
+
+HEDEF_SURUM = GOCLER[-1].surum
+
+
+def sema_surumu() -> int:
+    # Açılışta yapılan tek kontrol: tablo yoksa veritabanı hiç taşınmamıştır.
+    try:
+        with db.engine.connect() as conn:
+            surum = conn.exec_driver_sql(f"SELECT MAX(surum) FROM {SURUM_TABLOSU}").scalar()
+    except OperationalError:
+        return 0
+    return surum or 0
+
+
+def bekleyen_goc_var() -> bool:
+    return sema_surumu() < HEDEF_SURUM
+
+
+@contextmanager
+def _goc_kilidi() -> Iterator[None]:
+    # Aynı makinedeki worker'lar ve CLI çağrıları göçleri sırayla çalıştırsın
+    # diye instance klasöründeki bir dosya üzerinde advisory lock alınır.
+    kilit_yolu = Path(current_app.instance_path) / KILIT_DOSYASI
+    kilit_yolu.parent.mkdir(parents=True, exist_ok=True)
+    with open(kilit_yolu, "a+b") as dosya:
+        if os.name == "nt":
+            import msvcrt
+
+            dosya.seek(0)
+            # LK_LOCK en fazla ~10 saniye dener; göç sürerken beklemeye devam edilir.
+            while True:
+                try:
+                    msvcrt.locking(dosya.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                dosya.seek(0)
+                msvcrt.locking(dosya.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(dosya.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(dosya.fileno(), fcntl.LOCK_UN)
+
+
+def semayi_guncelle() -> list[Goc]:
+    # Bekleyen adımları sırayla uygular; her adım kendi sürüm kaydıyla
+    # birlikte commit edilir. Uygulanan adımlar döndürülür.
+    with _goc_kilidi():
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {SURUM_TABLOSU} ("
+                "surum INTEGER PRIMARY KEY, "
+                "aciklama VARCHAR(200) NOT NULL, "
+                "uygulanma_tarihi DATETIME NOT NULL)"
+            )
+
+        # Kilit beklenirken başka bir süreç göçleri bitirmiş olabilir.
+        mevcut = sema_surumu()
+        uygulananlar = []
+        for goc in GOCLER:
+            if goc.surum <= mevcut:
+                continue
+            try:
+                goc.uygula()
+                db.session.execute(
+                    text(
+                        f"INSERT INTO {SURUM_TABLOSU} (surum, aciklama, uygulanma_tarihi) "
+                        "VALUES (:surum, :aciklama, :tarih)"
+                    ),
+                    {"surum": goc.surum, "aciklama": goc.aciklama, "tarih": datetime.utcnow()},
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            uygulananlar.append(goc)
+        return uygulananlar
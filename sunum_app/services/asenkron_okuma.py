@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+from flask import Flask
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import Sunum, SunumNotOzeti, User
+from ..sqlite_pragmalari import sqlite_pragmalarini_kur
+from .icerik_surumleri import surum_sorgusu
+from .not_hesaplama import NotHesaplamaServisi, ozet_bicimi
+from .okuma_api import notlar_gerekli, sayfa_sozlugu, sunum_sozlukleri
+from .sayfalama import cursor_coz, keyset_sayfasi, keyset_sorgusu
+
+
+# app.config üzerinden değiştirilebilir. ASENKRON_VERITABANI_URI None ise
+# SQLALCHEMY_DATABASE_URI'deki SQLite dosyası aiosqlite sürücüsüyle açılır.
+VARSAYILAN_AYARLAR = {
+    "ASENKRON_VERITABANI_URI": None,
+}
+
+
+class AsenkronDesteklenmiyor(RuntimeError):
+    pass
+
+
+class AsenkronOkuyucu:
+    # ASGI modunda olay döngüsünde yanıtlanan okuma uçlarının kullandığı
+    # asenkron sorgular. Yazımlar ve diğer tüm sayfalar Flask-SQLAlchemy'nin senkron
+    # session'ında kalır; burada yalnızca tek sorguluk okumalar yapılır.
+    # Özeti henüz oluşmamış sunumlar için senkron not hesaplamasına bir
+    # thread üzerinden düşülür.
+
+    def __init__(self, app: Flask, engine):
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        self.app = app
+        self.engine = engine
+        self._oturum = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def surumler(self, *anahtarlar: str) -> dict[str, tuple[int, datetime]]:
+        async with self._oturum() as oturum:
+            satirlar = await oturum.execute(surum_sorgusu(*anahtarlar))
+            return {anahtar: (surum, guncellenme) for anahtar, surum, guncellenme in satirlar}
+
+    async def admin_mi(self, kullanici_id: int) -> bool:
+        async with self._oturum() as oturum:
+            return bool(await oturum.scalar(select(User.is_admin).where(User.id == kullanici_id)))
+
+    async def sunum_notu(self, sunum_id: int) -> Optional[dict]:
+        # Sunum silinmişse None döner.
+        async with self._oturum() as oturum:
+            satir = (
+                await oturum.execute(
+                    select(Sunum.id, SunumNotOzeti)
+                    .outerjoin(SunumNotOzeti, SunumNotOzeti.sunum_id == Sunum.id)
+                    .where(Sunum.id == sunum_id)
+                )
+            ).first()
+        if satir is None:
+            return None
+        if satir[1] is not None:
+            return satir[1].final_not_bilgisi()
+        return (await self._canli_notlar([sunum_id]))[sunum_id]
+
+    async def not_bilgileri(self, sunum_idleri: Iterable[int]) -> dict[int, dict]:
+        sunum_idleri = list(sunum_idleri)
+        if not sunum_idleri:
+            return {}
+
+        async with self._oturum() as oturum:
+            ozetler = await oturum.scalars(
+                select(SunumNotOzeti).where(SunumNotOzeti.sunum_id.in_(sunum_idleri))
+            )
+            sonuc = {ozet.sunum_id: ozet.final_not_bilgisi() for ozet in ozetler}
+
+        eksikler = [sunum_id for sunum_id in sunum_idleri if sunum_id not in sonuc]
+        if eksikler:
+            sonuc.update(await self._canli_notlar(eksikler))
+        return sonuc
+
+    async def _canli_notlar(self, sunum_idleri: Sequence[int]) -> dict[int, dict]:
+        return await asyncio.to_thread(self._senkron_notlar, sunum_idleri)
+
+    def _senkron_notlar(self, sunum_idleri: Sequence[int]) -> dict[int, dict]:
+        with self.app.app_context():
+            sunumlar = Sunum.query.filter(Sunum.id.in_(sunum_idleri)).all()
+            notlar = NotHesaplamaServisi().hesapla_final_notlari(sunumlar)
+            return {sunum_id: ozet_bicimi(bilgi) for sunum_id, bilgi in notlar.items()}
+
+    async def sunum_sayfasi(
+        self, alanlar: Sequence[str], per_page: int, cursor: Optional[str]
+    ) -> dict:
+        # okuma_api.sunum_sayfasi'nın asenkron karşılığı; aynı cursor
+        # biçimini ve alan okuyucularını kullanır.
+        konum = cursor_coz(cursor)
+        sorgu = select(Sunum)
+        if "ekip" in alanlar:
+            sorgu = sorgu.options(joinedload(Sunum.ekip))
+        sorgu = keyset_sorgusu(sorgu, Sunum.id, konum).limit(per_page + 1)
+
+        async with self._oturum() as oturum:
+            satirlar = list((await oturum.scalars(sorgu)).all())
+
+        sayfa = keyset_sayfasi(
+            satirlar, Sunum.id, per_page, konum, konum["t"] if konum else None
+        )
+        notlar = {}
+        if notlar_gerekli(alanlar):
+            notlar = await self.not_bilgileri(sunum.id for sunum in sayfa.items)
+        return sayfa_sozlugu(sayfa, sunum_sozlukleri(sayfa.items, alanlar, notlar))
+
+    async def kapat(self) -> None:
+        await self.engine.dispose()
+
+
+def _asenkron_uri(app: Flask):
+    uri = app.config["ASENKRON_VERITABANI_URI"]
+    if uri:
+        return uri
+
+    with app.app_context():
+        url = db.engine.url
+    if url.get_backend_name() != "sqlite":
+        raise AsenkronDesteklenmiyor(
+            "SQLite dışındaki veritabanları için ASENKRON_VERITABANI_URI ayarlanmalıdır."
+        )
+    if url.database in (None, "", ":memory:"):
+        raise AsenkronDesteklenmiyor("ASGI modu bellek içi SQLite veritabanıyla çalışmaz.")
+    # Göreli dosya yolu Flask-SQLAlchemy tarafından instance klasörüne
+    # çözülmüş olarak gelir; iki engine aynı dosyayı açar.
+    return url.set(drivername="sqlite+aiosqlite")
+
+
+def asenkron_okuyucu_olustur(app: Flask) -> AsenkronOkuyucu:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    # SQLAlchemy'nin asyncio eklentisi (greenlet) ve aiosqlite isteğe
+    # bağlıdır; requirements-async.txt ile kurulur.
+    try:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engine = create_async_engine(_asenkron_uri(app))
+    except ImportError as exc:
+        raise AsenkronDesteklenmiyor(
+            "ASGI modu için 'pip install -r requirements-async.txt' ile "
+            "aiosqlite ve greenlet kurulmalıdır."
+        ) from exc
+
+    if engine.dialect.name == "sqlite":
+        sqlite_pragmalarini_kur(app, engine.sync_engine)
+    return AsenkronOkuyucu(app, engine)
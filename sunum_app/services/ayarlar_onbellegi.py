@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from flask import current_app
+
+from ..models import Ayarlar
+
+
+VARSAYILAN_ETIKETLER = {
+    "konu_hakimiyeti": "Konu Hakimiyeti",
+    "anlatim": "Anlatım",
+    "giyim": "Giyim",
+    "ekip_uyumu": "Ekip Uyumu ve Görev Paylaşımı",
+    "gorsellik": "Görsellik",
+    "genel_gorus": "Genel Görüş",
+}
+
+
+@dataclass(frozen=True)
+class AyarlarGoruntusu:
+    id: int
+
+    konu_hakimiyeti_agirlik: float
+    anlatim_agirlik: float
+    giyim_agirlik: float
+    ekip_uyumu_agirlik: float
+    gorsellik_agirlik: float
+    genel_gorus_agirlik: float
+
+    konu_hakimiyeti_etiket: Optional[str]
+    anlatim_etiket: Optional[str]
+    giyim_etiket: Optional[str]
+    ekip_uyumu_etiket: Optional[str]
+    gorsellik_etiket: Optional[str]
+    genel_gorus_etiket: Optional[str]
+
+    ogretmen_notu_agirlik: float
+    ogrenci_notu_agirlik: float
+
+    @classmethod
+    def from_model(cls, ayarlar: Ayarlar) -> "AyarlarGoruntusu":
+        return cls(
+            id=ayarlar.id,
+            konu_hakimiyeti_agirlik=ayarlar.konu_hakimiyeti_agirlik,
+            anlatim_agirlik=ayarlar.anlatim_agirlik,
+            giyim_agirlik=ayarlar.giyim_agirlik,
+            ekip_uyumu_agirlik=ayarlar.ekip_uyumu_agirlik,
+            gorsellik_agirlik=ayarlar.gorsellik_agirlik,
+            genel_gorus_agirlik=ayarlar.genel_gorus_agirlik,
+            konu_hakimiyeti_etiket=ayarlar.konu_hakimiyeti_etiket,
+            anlatim_etiket=ayarlar.anlatim_etiket,
+            giyim_etiket=ayarlar.giyim_etiket,
+            ekip_uyumu_etiket=ayarlar.ekip_uyumu_etiket,
+            gorsellik_etiket=ayarlar.gorsellik_etiket,
+            genel_gorus_etiket=ayarlar.genel_gorus_etiket,
+            ogretmen_notu_agirlik=ayarlar.ogretmen_notu_agirlik,
+            ogrenci_notu_agirlik=ayarlar.ogrenci_notu_agirlik,
+        )
+
+    def kriterler(self) -> list[dict]:
+        return [
+            {
+                "key": key,
+                "label": getattr(self, f"{key}_etiket") or varsayilan,
+                "weight": getattr(self, f"{key}_agirlik"),
+            }
+            for key, varsayilan in VARSAYILAN_ETIKETLER.items()
+        ]
+
+
+class AyarlarOnbellegi:
+    # Aktif ayarların süreç içi, değişmez kopyasını tutar. Sürüm sayacı
+    # instance klasöründeki küçük bir dosyadadır; her erişimde yalnızca
+    # dosyanın stat bilgisine bakılır, sayaç başka bir worker tarafından
+    # artırıldıysa ayarlar veritabanından yeniden okunur.
+
+    def __init__(self, surum_dosyasi: Path):
+        self._surum_dosyasi = Path(surum_dosyasi)
+        self._lock = threading.Lock()
+        self._goruntu: Optional[AyarlarGoruntusu] = None
+        self._imza: Optional[tuple[int, int, int]] = None
+
+    def _dosya_imzasi(self) -> tuple[int, int, int]:
+        try:
+            st = os.stat(self._surum_dosyasi)
+        except FileNotFoundError:
+            return (0, 0, 0)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def surum(self) -> int:
+        try:
+            return int(self._surum_dosyasi.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def get(self) -> AyarlarGoruntusu:
+        imza = self._dosya_imzasi()
+        goruntu = self._goruntu
+        if goruntu is not None and imza == self._imza:
+            return goruntu
+
+        with self._lock:
+            if self._goruntu is None or imza != self._imza:
+                self._goruntu = AyarlarGoruntusu.from_model(Ayarlar.get_aktif_ayarlar())
+                self._imza = imza
+            return self._goruntu
+
+    def surumu_artir(self) -> int:
+        with self._lock:
+            yeni_surum = self.surum() + 1
+            self._surum_dosyasi.parent.mkdir(parents=True, exist_ok=True)
+            gecici = self._surum_dosyasi.with_name(f"{self._surum_dosyasi.name}.{os.getpid()}.tmp")
+            gecici.write_text(str(yeni_surum))
+            os.replace(gecici, self._surum_dosyasi)
+            self._goruntu = None
+            self._imza = None
+            return yeni_surum
+
+
+def ayarlar_onbellegi() -> AyarlarOnbellegi:
+    return current_app.extensions["ayarlar_onbellegi"]
+
+
+def aktif_ayarlar() -> AyarlarGoruntusu:
+    return ayarlar_onbellegi().get()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Iterator, Optional
+
+from flask import Flask
+
+from ..extensions import db
+from ..models import Sunum
+from .icerik_surumleri import GENEL, icerik_degisti, sunum_anahtari, surum_imzasi, surumler
+from .not_hesaplama import NotHesaplamaServisi
+
+
+# app.config üzerinden değiştirilebilir (saniye).
+VARSAYILAN_AYARLAR = {
+    # Başka bir worker'daki yazımlar bu aralıkla sürüm sayacından yakalanır.
+    "CANLI_SKOR_KONTROL_ARALIGI": 5,
+    "CANLI_SKOR_NABIZ_ARALIGI": 15,
+    # Senkron worker'da her akış bir thread tutar. Akış bu süre sonunda
+    # kapanır ve EventSource kendiliğinden yeniden bağlanır; böylece thread
+    # uzun süre tek izleyiciye bağlı kalmaz.
+    "CANLI_SKOR_AKIS_SURESI": 25,
+    # Worker başına aynı anda açık akış sayısı; fazlası 503 alır. Geri kalan
+    # thread'ler değerlendirme gönderimleri gibi normal isteklere kalır.
+    # 0 sınırı kaldırır.
+    "CANLI_SKOR_AZAMI_AKIS": 4,
+}
+
+
+SILINDI_OLAYI = "event: silindi\ndata: {}\n\n"
+NABIZ_OLAYI = ": nabiz\n\n"
+
+
+def retry_olayi(kontrol_araligi: float) -> str:
+    return f"retry: {int(kontrol_araligi * 1000)}\n\n"
+
+
+def skor_olayi(veri: dict) -> str:
+    return f"event: skor\ndata: {json.dumps(veri, separators=(',', ':'))}\n\n"
+
+
+def skor_verisi(sunum_id: int, imza: str, bilgi: dict) -> dict:
+    return {"sunum_id": sunum_id, "surum": imza, **bilgi}
+
+
+class SkorYayini:
+    # Süreç içi yayın/abonelik. Aynı süreçteki yazımlar commit sonrasında
+    # izleyicileri hemen uyandırır; diğer worker'lardaki yazımlar için
+    # izleyiciler kontrol aralığında sürüm sayacını okur. Skor, sunumun
+    # sürüm imzası başına bir kez hesaplanır ve tüm izleyicilerle paylaşılır.
+
+    def __init__(
+        self,
+        kontrol_araligi: float,
+        nabiz_araligi: float,
+        akis_suresi: float,
+        azami_akis: int = 0,
+    ):
+        self.kontrol_araligi = kontrol_araligi
+        self.nabiz_araligi = nabiz_araligi
+        self.akis_suresi = akis_suresi
+        self.azami_akis = azami_akis
+        self._akis_sayisi = 0
+        self._kosul = threading.Condition()
+        self._yerel_surum = 0
+        self._lock = threading.Lock()
+        # Skor önbelleği akış sayacından ayrı bir kilitle korunur; kilit
+        # yalnızca sözlükler okunup yazılırken tutulur.
+        self._skor_lock = threading.Lock()
+        self._skorlar: dict[int, tuple[str, Optional[dict]]] = {}
+        self._hesaplananlar: dict[int, tuple[str, threading.Event]] = {}
+
+    def akis_ayir(self) -> bool:
+        # Yer yoksa False döner; ayrılan yer akis_birak ile geri verilir.
+        with self._lock:
+            if self.azami_akis and self._akis_sayisi >= self.azami_akis:
+                return False
+            self._akis_sayisi += 1
+            return True
+
+    def akis_birak(self) -> None:
+        with self._lock:
+            self._akis_sayisi -= 1
+
+    def haber_ver(self) -> None:
+        with self._kosul:
+            self._yerel_surum += 1
+            self._kosul.notify_all()
+
+    def _bekle(self, gorulen: int, sure: float) -> int:
+        with self._kosul:
+            if self._yerel_surum == gorulen:
+                self._kosul.wait(sure)
+            return self._yerel_surum
+
+    def _surum_imzasi(self, sunum_id: int) -> str:
+        anahtarlar = (GENEL, sunum_anahtari(sunum_id))
+        return surum_imzasi(surumler(*anahtarlar), anahtarlar)
+
+    def skor(self, sunum_id: int, imza: str) -> Optional[dict]:
+        # Aynı imza için eşzamanlı çağrılardan yalnızca biri hesaplar, diğerleri
+        # onun sonucunu bekler. Hesaplama kilit dışında yapılır.
+        while True:
+            with self._skor_lock:
+                onceki = self._skorlar.get(sunum_id)
+                if onceki is not None and onceki[0] == imza:
+                    return onceki[1]
+                suren = self._hesaplananlar.get(sunum_id)
+                if suren is None or suren[0] != imza:
+                    suren = (imza, threading.Event())
+                    self._hesaplananlar[sunum_id] = suren
+                    break
+            # Hesaplayan hata alırsa önbellek dolmaz ve döngü yeniden dener.
+            suren[1].wait()
+
+        try:
+            sunum = db.session.get(Sunum, sunum_id)
+            veri = None
+            if sunum is not None:
+                bilgi = NotHesaplamaServisi().ozetten_final_notlari([sunum])[sunum_id]
+                veri = skor_verisi(sunum_id, imza, bilgi)
+            with self._skor_lock:
+                self._skorlar[sunum_id] = (imza, veri)
+            return veri
+        finally:
+            with self._skor_lock:
+                if self._hesaplananlar.get(sunum_id) is suren:
+                    del self._hesaplananlar[sunum_id]
+            suren[1].set()
+
+    def olay_akisi(self, sunum_id: int) -> Iterator[str]:
+        bitis = time.monotonic() + self.akis_suresi
+        son_nabiz = time.monotonic()
+        gonderilen: Optional[str] = None
+        yerel = self._yerel_surum
+
+        yield retry_olayi(self.kontrol_araligi)
+        while time.monotonic() < bitis:
+            try:
+                imza = self._surum_imzasi(sunum_id)
+                veri = self.skor(sunum_id, imza) if imza != gonderilen else None
+            finally:
+                # Bekleme sırasında bağlantı havuzdan alınmış kalmasın ve bir
+                # sonraki okuma yeni bir snapshot görsün.
+                db.session.remove()
+
+            if imza != gonderilen:
+                if veri is None:
+                    yield SILINDI_OLAYI
+                    return
+                yield skor_olayi(veri)
+                gonderilen = imza
+                son_nabiz = time.monotonic()
+            elif time.monotonic() - son_nabiz >= self.nabiz_araligi:
+                yield NABIZ_OLAYI
+                son_nabiz = time.monotonic()
+
+            yerel = self._bekle(yerel, self.kontrol_araligi)
+
+
+def skor_yayini_olustur(app: Flask) -> SkorYayini:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    yayin = SkorYayini(
+        kontrol_araligi=app.config["CANLI_SKOR_KONTROL_ARALIGI"],
+        nabiz_araligi=app.config["CANLI_SKOR_NABIZ_ARALIGI"],
+        akis_suresi=app.config["CANLI_SKOR_AKIS_SURESI"],
+        azami_akis=app.config["CANLI_SKOR_AZAMI_AKIS"],
+    )
+
+    def _icerik_degisti(sender, anahtarlar: frozenset[str], **kwargs) -> None:
+        if GENEL in anahtarlar or any(a.startswith("sunum:") for a in anahtarlar):
+            yayin.haber_ver()
+
+    icerik_degisti.connect(_icerik_degisti, weak=False)
+    return yayin
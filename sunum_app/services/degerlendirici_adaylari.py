@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import Flask, current_app
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models import Degerlendirme, Ogrenci, Ogretmen, Sunum
+from .icerik_surumleri import GENEL, KADRO, sunum_anahtari, surumler
+
+
+# app.config üzerinden değiştirilebilir; önbellekte tutulan en fazla sunum.
+VARSAYILAN_AYARLAR = {
+    "DEGERLENDIRICI_ONBELLEGI_BOYUTU": 256,
+}
+
+
+@dataclass(frozen=True)
+class Aday:
+    id: int
+    tam_ad: str
+
+
+@dataclass(frozen=True)
+class _SunumAdaylari:
+    kadro_imzasi: tuple[int, int]
+    sunum_surumu: int
+    ekip_id: int
+    degerlendirenler: frozenset[int]
+    ogrenciler: tuple[Aday, ...]
+
+
+def _surum(mevcut: dict, anahtar: str) -> int:
+    return mevcut.get(anahtar, (0, None))[0]
+
+
+def uygun_ogrenciler(sunum: Sunum) -> tuple[Aday, ...]:
+    # Sunumun ekibinden olmayan ve bu sunumu henüz değerlendirmemiş
+    # öğrenciler; tek bir NOT EXISTS anti-join sorgusu.
+    degerlendirmis = select(Degerlendirme.id).where(
+        Degerlendirme.sunum_id == sunum.id,
+        Degerlendirme.degerlendiren_tipi == "ogrenci",
+        Degerlendirme.degerlendiren_ogrenci_id == Ogrenci.id,
+    )
+    satirlar = db.session.execute(
+        select(Ogrenci.id, Ogrenci.ad, Ogrenci.soyad)
+        .where(Ogrenci.ekip_id != sunum.ekip_id, ~degerlendirmis.exists())
+        .order_by(Ogrenci.id)
+    )
+    return tuple(Aday(id, f"{ad} {soyad}") for id, ad, soyad in satirlar)
+
+
+def _degerlendirenler(sunum_id: int) -> frozenset[int]:
+    # (sunum_id, degerlendiren_ogrenci_id) unique index'inden okunur.
+    return frozenset(
+        db.session.scalars(
+            select(Degerlendirme.degerlendiren_ogrenci_id).where(
+                Degerlendirme.sunum_id == sunum_id,
+                Degerlendirme.degerlendiren_tipi == "ogrenci",
+                Degerlendirme.degerlendiren_ogrenci_id.is_not(None),
+            )
+        )
+    )
+
+
+class DegerlendiriciAdaylari:
+    # Değerlendirme formundaki öğrenci ve öğretmen listeleri. Sunum başına
+    # liste, içerik sürümleriyle doğrulanır:
+    #   - sürümler değişmediyse liste doğrudan kullanılır,
+    #   - yalnızca sunumun sürümü değiştiyse yeni değerlendirenler listeden
+    #     çıkarılır (silinen bir değerlendirme varsa liste baştan kurulur),
+    #   - kadro (ekip/öğrenci/öğretmen) değiştiyse liste baştan kurulur.
+
+    def __init__(self, boyut: int):
+        self._boyut = boyut
+        self._lock = threading.Lock()
+        self._sunumlar: OrderedDict[int, _SunumAdaylari] = OrderedDict()
+        self._ogretmenler: Optional[tuple[tuple[int, int], tuple[Aday, ...]]] = None
+
+    def getir(self, sunum: Sunum) -> tuple[tuple[Aday, ...], tuple[Aday, ...]]:
+        mevcut = surumler(GENEL, KADRO, sunum_anahtari(sunum.id))
+        kadro_imzasi = (_surum(mevcut, GENEL), _surum(mevcut, KADRO))
+        sunum_surumu = _surum(mevcut, sunum_anahtari(sunum.id))
+        return (
+            self._ogrenciler(sunum, kadro_imzasi, sunum_surumu),
+            self._ogretmen_listesi(kadro_imzasi),
+        )
+
+    def _ogrenciler(
+        self, sunum: Sunum, kadro_imzasi: tuple[int, int], sunum_surumu: int
+    ) -> tuple[Aday, ...]:
+        with self._lock:
+            girdi = self._sunumlar.get(sunum.id)
+            if girdi is not None:
+                self._sunumlar.move_to_end(sunum.id)
+
+        if (
+            girdi is not None
+            and girdi.kadro_imzasi == kadro_imzasi
+            and girdi.ekip_id == sunum.ekip_id
+        ):
+            if girdi.sunum_surumu == sunum_surumu:
+                return girdi.ogrenciler
+
+            degerlendirenler = _degerlendirenler(sunum.id)
+            if degerlendirenler >= girdi.degerlendirenler:
+                yeniler = degerlendirenler - girdi.degerlendirenler
+                ogrenciler = tuple(a for a in girdi.ogrenciler if a.id not in yeniler)
+                self._kaydet(
+                    sunum.id,
+                    _SunumAdaylari(
+                        kadro_imzasi, sunum_surumu, sunum.ekip_id, degerlendirenler, ogrenciler
+                    ),
+                )
+                return ogrenciler
+
+        ogrenciler = uygun_ogrenciler(sunum)
+        self._kaydet(
+            sunum.id,
+            _SunumAdaylari(
+                kadro_imzasi,
+                sunum_surumu,
+                sunum.ekip_id,
+                _degerlendirenler(sunum.id),
+                ogrenciler,
+            ),
+        )
+        return ogrenciler
+
+    def _kaydet(self, sunum_id: int, girdi: _SunumAdaylari) -> None:
+        with self._lock:
+            self._sunumlar[sunum_id] = girdi
+            self._sunumlar.move_to_end(sunum_id)
+            while len(self._sunumlar) > self._boyut:
+                self._sunumlar.popitem(last=False)
+
+    def _ogretmen_listesi(self, kadro_imzasi: tuple[int, int]) -> tuple[Aday, ...]:
+        onbellek = self._ogretmenler
+        if onbellek is not None and onbellek[0] == kadro_imzasi:
+            return onbellek[1]
+
+        satirlar = db.session.execute(
+            select(Ogretmen.id, Ogretmen.ad, Ogretmen.soyad).order_by(Ogretmen.id)
+        )
+        ogretmenler = tuple(Aday(id, f"{ad} {soyad}") for id, ad, soyad in satirlar)
+        self._ogretmenler = (kadro_imzasi, ogretmenler)
+        return ogretmenler
+
+
+def degerlendirici_adaylari_olustur(app: Flask) -> DegerlendiriciAdaylari:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+    return DegerlendiriciAdaylari(app.config["DEGERLENDIRICI_ONBELLEGI_BOYUTU"])
+
+
+def degerlendirici_adaylari() -> DegerlendiriciAdaylari:
+    return current_app.extensions["degerlendirici_adaylari"]
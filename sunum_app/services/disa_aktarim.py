@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models import Degerlendirme, Ekip, Ogrenci, Ogretmen, Sunum
+from .not_hesaplama import KRITERLER, NotHesaplamaServisi
+
+
+TURLER = ("notlar", "degerlendirmeler")
+BICIMLER = ("csv", "xlsx")
+
+# Satırlar bu boyutta parçalar halinde okunur ve yazılır; bellek kullanımı
+# dışa aktarılan satır sayısından bağımsızdır.
+PARCA_BOYUTU = 1000
+
+NOT_BASLIKLARI = (
+    "sunum_id",
+    "baslik",
+    "ekip",
+    "sunum_tarihi",
+    "ogretmen_notu",
+    "ogrenci_ortalama",
+    "final_notu",
+    "ogrenci_degerlendirme_sayisi",
+)
+
+DEGERLENDIRME_BASLIKLARI = (
+    "degerlendirme_id",
+    "sunum_id",
+    "baslik",
+    "ekip",
+    "degerlendiren_tipi",
+    "degerlendiren",
+    "ogrenci_numara",
+    *KRITERLER,
+    "agirlikli_ortalama",
+    "yorum",
+)
+
+
+# Bu karakterlerle başlayan hücreleri Excel/LibreOffice formül olarak
+# çalıştırır; metin hücrelerinin başına "'" eklenerek düz metin kalmaları
+# sağlanır (CSV formula injection).
+FORMUL_BASLANGICLARI = ("=", "+", "-", "@", "\t", "\r")
+
+
+class XlsxDesteklenmiyor(RuntimeError):
+    pass
+
+
+def not_satirlari(servis: NotHesaplamaServisi | None = None) -> Iterator[Sequence]:
+    # Final notları her parça için not özeti tablosundan okunur (özeti
+    # olmayan sunumlar canlı hesaplanır).
+    servis = servis or NotHesaplamaServisi()
+    yield NOT_BASLIKLARI
+
+    sorgu = (
+        select(Sunum.id, Sunum.baslik, Ekip.isim, Sunum.sunum_tarihi)
+        .join(Ekip, Ekip.id == Sunum.ekip_id)
+        .order_by(Sunum.sunum_tarihi, Sunum.id)
+        .execution_options(yield_per=PARCA_BOYUTU)
+    )
+    for parca in db.session.execute(sorgu).partitions():
+        notlar = servis.ozetten_final_notlari(parca)
+        for satir in parca:
+            bilgi = notlar[satir.id]
+            yield (
+                satir.id,
+                satir.baslik,
+                satir.isim,
+                satir.sunum_tarihi.strftime("%Y-%m-%d %H:%M"),
+                bilgi["ogretmen_notu"],
+                bilgi["ogrenci_ortalama"],
+                bilgi["final_notu"],
+                bilgi["degerlendirme_sayisi"],
+            )
+
+
+def degerlendirme_satirlari(servis: NotHesaplamaServisi | None = None) -> Iterator[Sequence]:
+    servis = servis or NotHesaplamaServisi()
+    yield DEGERLENDIRME_BASLIKLARI
+
+    ogrenci = aliased(Ogrenci)
+    ogretmen = aliased(Ogretmen)
+    sorgu = (
+        select(
+            Degerlendirme.id,
+            Degerlendirme.sunum_id,
+            Sunum.baslik,
+            Ekip.isim,
+            Degerlendirme.degerlendiren_tipi,
+            ogrenci.ad,
+            ogrenci.soyad,
+            ogrenci.numara,
+            ogretmen.ad,
+            ogretmen.soyad,
+            Degerlendirme.yorum,
+            *[getattr(Degerlendirme, kriter) for kriter in KRITERLER],
+        )
+        .join(Sunum, Sunum.id == Degerlendirme.sunum_id)
+        .join(Ekip, Ekip.id == Sunum.ekip_id)
+        .outerjoin(ogrenci, ogrenci.id == Degerlendirme.degerlendiren_ogrenci_id)
+        .outerjoin(ogretmen, ogretmen.id == Degerlendirme.degerlendiren_ogretmen_id)
+        .order_by(Degerlendirme.id)
+        .execution_options(yield_per=PARCA_BOYUTU)
+    )
+    for parca in db.session.execute(sorgu).partitions():
+        puanlar = [satir[11:] for satir in parca]
+        ortalamalar = servis.hesapla_agirlikli_ortalamalar(list(zip(*puanlar)))
+        for satir, puan, ortalama in zip(parca, puanlar, ortalamalar):
+            (
+                degerlendirme_id,
+                sunum_id,
+                baslik,
+                ekip,
+                tip,
+                ogrenci_ad,
+                ogrenci_soyad,
+                numara,
+                ogretmen_ad,
+                ogretmen_soyad,
+                yorum,
+            ) = satir[:11]
+            if tip == "ogrenci" and ogrenci_ad is not None:
+                degerlendiren = f"{ogrenci_ad} {ogrenci_soyad}"
+            elif tip == "ogretmen" and ogretmen_ad is not None:
+                degerlendiren = f"{ogretmen_ad} {ogretmen_soyad}"
+            else:
+                degerlendiren = "Bilinmeyen"
+            yield (
+                degerlendirme_id,
+                sunum_id,
+                baslik,
+                ekip,
+                tip,
+                degerlendiren,
+                numara or "",
+                *puan,
+                ortalama,
+                yorum or "",
+            )
+
+
+def satirlar(tur: str) -> Iterator[Sequence]:
+    if tur == "notlar":
+        return not_satirlari()
+    if tur == "degerlendirmeler":
+        return degerlendirme_satirlari()
+    raise ValueError(f"Geçersiz dışa aktarım türü: {tur!r}")
+
+
+def guvenli_hucre(deger):
+    if isinstance(deger, str) and deger.startswith(FORMUL_BASLANGICLARI):
+        return "'" + deger
+    return deger
+
+
+def csv_akisi(kaynak: Iterable[Sequence]) -> Iterator[bytes]:
+    # Excel'in UTF-8'i (Türkçe karakterleri) tanıması için BOM ile başlar.
+    tampon = io.StringIO()
+    yazici = csv.writer(tampon)
+    tampon.write("\ufeff")
+
+    for index, satir in enumerate(kaynak, start=1):
+        yazici.writerow([guvenli_hucre(deger) for deger in satir])
+        if index % PARCA_BOYUTU == 0:
+            yield tampon.getvalue().encode("utf-8")
+            tampon.seek(0)
+            tampon.truncate()
+
+    kalan = tampon.getvalue()
+    if kalan:
+        yield kalan.encode("utf-8")
+
+
+def xlsx_destekleniyor() -> bool:
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def xlsx_akisi(kaynak: Iterable[Sequence], sayfa_adi: str) -> Iterator[bytes]:
+    # openpyxl isteğe bağlıdır. write_only kipinde satırlar belleğe
+    # toplanmadan geçici dosyaya yazılır, dosya da parça parça okunur.
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:
+        raise XlsxDesteklenmiyor("XLSX dışa aktarımı için openpyxl kurulmalıdır.") from exc
+
+    kitap = Workbook(write_only=True)
+    sayfa = kitap.create_sheet(sayfa_adi)
+    for satir in kaynak:
+        sayfa.append(list(satir))
+
+    with tempfile.TemporaryFile() as dosya:
+        kitap.save(dosya)
+        dosya.seek(0)
+        while True:
+            parca = dosya.read(64 * 1024)
+            if not parca:
+                break
+            yield parca
+
+
+def disa_aktarim_akisi(tur: str, bicim: str) -> Iterator[bytes]:
+    if bicim == "csv":
+        return csv_akisi(satirlar(tur))
+    if bicim == "xlsx":
+        if not xlsx_destekleniyor():
+            raise XlsxDesteklenmiyor("XLSX dışa aktarımı için openpyxl kurulmalıdır.")
+        return xlsx_akisi(satirlar(tur), tur)
+    raise ValueError(f"Geçersiz dışa aktarım biçimi: {bicim!r}")
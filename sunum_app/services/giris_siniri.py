@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Protocol
+
+from flask import Flask
+
+
+# app.config üzerinden değiştirilebilir. Kova ayarları (kapasite, dakikada
+# eklenen jeton) şeklindedir. GIRIS_SINIRI_PAYLASIMLI True ise instance
+# klasöründeki giris_siniri.db, metin ise verilen dosya kullanılır.
+VARSAYILAN_AYARLAR = {
+    "GIRIS_SINIRI": True,
+    "GIRIS_SINIRI_IP": (20, 10),
+    "GIRIS_SINIRI_KULLANICI": (5, 2),
+    "GIRIS_SINIRI_PAYLASIMLI": False,
+}
+
+
+@dataclass(frozen=True)
+class Kova:
+    kapasite: float
+    dakikalik: float
+
+    def doldur(self, jeton: float, gecen: float) -> float:
+        return min(self.kapasite, jeton + gecen * self.dakikalik / 60)
+
+    def bekleme(self, jeton: float) -> float:
+        # Bir jeton birikene kadar geçecek süre (saniye).
+        return (1 - jeton) * 60 / self.dakikalik if self.dakikalik else float("inf")
+
+
+class KovaDeposu(Protocol):
+    def al(self, anahtar: str, kova: Kova, tuket: bool) -> float: ...
+
+
+class BellekKovaDeposu:
+    # Süreç içi token bucket'lar. Dolmuş kovalar saklamaya değmez; sözlük
+    # büyüdüğünde bunlar atılır.
+
+    _TEMIZLEME_ESIGI = 10000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._kovalar: dict[str, tuple[float, float, Kova]] = {}
+
+    def al(self, anahtar: str, kova: Kova, tuket: bool) -> float:
+        # Jeton varsa (tuket ise bir tane harcayıp) 0, yoksa bekleme süresi döner.
+        simdi = time.time()
+        with self._lock:
+            jeton, zaman, _ = self._kovalar.get(anahtar, (kova.kapasite, simdi, kova))
+            jeton = kova.doldur(jeton, simdi - zaman)
+            if jeton < 1:
+                self._kovalar[anahtar] = (jeton, simdi, kova)
+                return kova.bekleme(jeton)
+            if tuket:
+                jeton -= 1
+            self._kovalar[anahtar] = (jeton, simdi, kova)
+            if len(self._kovalar) > self._TEMIZLEME_ESIGI:
+                self._temizle(simdi)
+            return 0.0
+
+    def _temizle(self, simdi: float) -> None:
+        for anahtar, (jeton, zaman, kova) in list(self._kovalar.items()):
+            if kova.doldur(jeton, simdi - zaman) >= kova.kapasite:
+                del self._kovalar[anahtar]
+
+
+class SqliteKovaDeposu:
+    # Aynı makinedeki worker'ların paylaştığı kovalar. Oku-hesapla-yaz adımı
+    # BEGIN IMMEDIATE ile tek yazıcıya indirgenir.
+
+    _TEMIZLEME_ARALIGI = 500
+
+    def __init__(self, yol: Path):
+        self._yol = Path(yol)
+        self._yerel = threading.local()
+        self._yazma_sayisi = 0
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            self._yol.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._yol, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kova ("
+                "anahtar TEXT PRIMARY KEY, jeton REAL NOT NULL, zaman REAL NOT NULL, "
+                "dolma REAL NOT NULL)"
+            )
+            self._yerel.conn = conn
+        return conn
+
+    def al(self, anahtar: str, kova: Kova, tuket: bool) -> float:
+        conn = self._baglanti()
+        simdi = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            satir = conn.execute(
+                "SELECT jeton, zaman FROM kova WHERE anahtar = ?", (anahtar,)
+            ).fetchone()
+            jeton = kova.doldur(satir[0], simdi - satir[1]) if satir else kova.kapasite
+            bekleme = kova.bekleme(jeton) if jeton < 1 else 0.0
+            if not bekleme and tuket:
+                jeton -= 1
+            # dolma: kovanın yeniden tamamen dolacağı an; temizlikte kullanılır.
+            dolma = simdi + (kova.kapasite - jeton) * 60 / kova.dakikalik if kova.dakikalik else simdi
+            conn.execute(
+                "INSERT OR REPLACE INTO kova (anahtar, jeton, zaman, dolma) VALUES (?, ?, ?, ?)",
+                (anahtar, jeton, simdi, dolma),
+            )
+            self._yazma_sayisi += 1
+            if self._yazma_sayisi % self._TEMIZLEME_ARALIGI == 0:
+                conn.execute("DELETE FROM kova WHERE dolma <= ?", (simdi,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return bekleme
+
+
+class GirisSiniri:
+    # /login denemeleri için token bucket'lar: IP başına bir kova ve
+    # (kullanıcı adı, IP) çifti başına bir kova. İki kova da veritabanı ve
+    # şifre hash'inden önce denetlenir; boşsa istek hash hesaplanmadan 429
+    # alır. IP kovası her denemede, çift kovası yalnızca başarısız denemede
+    # harcanır. Çift kovası IP'ye bağlı olduğundan bir saldırgan yanlış
+    # şifre göndererek hesabı yalnızca kendi adresinden kilitleyebilir;
+    # hesabın sahibi başka bir adresten girmeye devam eder.
+
+    def __init__(self, depo: KovaDeposu, ip_kovasi: Kova, kullanici_kovasi: Kova):
+        self._depo = depo
+        self._ip_kovasi = ip_kovasi
+        self._kullanici_kovasi = kullanici_kovasi
+
+    @staticmethod
+    def _kullanici_anahtari(ip: Optional[str], kullanici_adi: str) -> str:
+        return f"kullanici:{ip or '-'}:{kullanici_adi.strip().casefold()}"
+
+    def deneme_izni(self, ip: Optional[str], kullanici_adi: str) -> float:
+        # 0 ise deneme yapılabilir; değilse Retry-After için saniye döner.
+        # Çift kovasına yalnızca bakılır, jeton basarisiz_deneme'de harcanır.
+        bekleme = self._depo.al(
+            self._kullanici_anahtari(ip, kullanici_adi), self._kullanici_kovasi, tuket=False
+        )
+        if bekleme:
+            return bekleme
+        return self._depo.al(f"ip:{ip or '-'}", self._ip_kovasi, tuket=True)
+
+    def basarisiz_deneme(self, ip: Optional[str], kullanici_adi: str) -> None:
+        self._depo.al(
+            self._kullanici_anahtari(ip, kullanici_adi), self._kullanici_kovasi, tuket=True
+        )
+
+
+def giris_siniri_olustur(app: Flask) -> Optional[GirisSiniri]:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    if not app.config["GIRIS_SINIRI"]:
+        return None
+
+    depo: KovaDeposu = BellekKovaDeposu()
+    yol = app.config["GIRIS_SINIRI_PAYLASIMLI"]
+    if yol:
+        if yol is True:
+            yol = Path(app.instance_path) / "giris_siniri.db"
+        depo = SqliteKovaDeposu(yol)
+
+    return GirisSiniri(
+        depo,
+        ip_kovasi=Kova(*app.config["GIRIS_SINIRI_IP"]),
+        kullanici_kovasi=Kova(*app.config["GIRIS_SINIRI_KULLANICI"]),
+    )
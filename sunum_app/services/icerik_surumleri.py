@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable
+
+from blinker import Namespace
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import (
+    Ayarlar,
+    Degerlendirme,
+    Ekip,
+    IcerikSurumu,
+    Ogrenci,
+    Ogretmen,
+    Sunum,
+    SunumNotOzeti,
+)
+
+
+GENEL = "genel"
+LISTE = "liste"
+# Yeni ekip/öğrenci/öğretmen eklenmesi sayfalarda görünmez, ancak
+# değerlendirme formundaki aday listelerini değiştirir.
+KADRO = "kadro"
+
+_sinyaller = Namespace()
+# Commit edilen transaction'ın artırdığı sürüm anahtarlarıyla gönderilir.
+icerik_degisti = _sinyaller.signal("icerik-degisti")
+
+_DEGISEN_ANAHTARLAR = "degisen_icerik_anahtarlari"
+
+
+def sunum_anahtari(sunum_id: int) -> str:
+    return f"sunum:{sunum_id}"
+
+
+def _etkilenen_anahtarlar(session: Session) -> set[str]:
+    # Sunum, değerlendirme ve not özeti yazımları yalnızca ilgili sunumun
+    # ve listenin sürümünü artırır. Ekip/öğrenci/öğretmen adları ve ayarlar
+    # birden çok sayfada göründüğü için bunlar "genel" sürümü artırır.
+    anahtarlar: set[str] = set()
+    for nesne in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(nesne, Sunum):
+            anahtarlar.update((LISTE, sunum_anahtari(nesne.id)))
+        elif isinstance(nesne, (Degerlendirme, SunumNotOzeti)):
+            anahtarlar.update((LISTE, sunum_anahtari(nesne.sunum_id)))
+        elif isinstance(nesne, Ayarlar):
+            anahtarlar.add(GENEL)
+        elif isinstance(nesne, (Ekip, Ogrenci, Ogretmen)):
+            anahtarlar.add(KADRO if nesne in session.new else GENEL)
+
+    # "genel" diğer tüm anahtarları kapsar; ayar değişikliği gibi her sunumun
+    # özetini yeniden yazan işlemler tek satır günceller.
+    if GENEL in anahtarlar:
+        return {GENEL}
+    return anahtarlar
+
+
+def surumleri_artir(session: Session, anahtarlar: Iterable[str]) -> None:
+    anahtarlar = set(anahtarlar)
+    session.info.setdefault(_DEGISEN_ANAHTARLAR, set()).update(anahtarlar)
+    conn = session.connection()
+    tablo = IcerikSurumu.__table__
+    simdi = datetime.utcnow()
+    for anahtar in sorted(anahtarlar):
+        sonuc = conn.execute(
+            update(tablo)
+            .where(tablo.c.anahtar == anahtar)
+            .values(surum=tablo.c.surum + 1, guncellenme=simdi)
+        )
+        if sonuc.rowcount == 0:
+            conn.execute(insert(tablo).values(anahtar=anahtar, surum=1, guncellenme=simdi))
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_sonrasi(session: Session, flush_context) -> None:
+    anahtarlar = _etkilenen_anahtarlar(session)
+    if anahtarlar:
+        surumleri_artir(session, anahtarlar)
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_sonrasi(session: Session) -> None:
+    anahtarlar = session.info.pop(_DEGISEN_ANAHTARLAR, None)
+    if anahtarlar:
+        icerik_degisti.send(None, anahtarlar=frozenset(anahtarlar))
+
+
+@event.listens_for(Session, "after_rollback")
+def _rollback_sonrasi(session: Session) -> None:
+    session.info.pop(_DEGISEN_ANAHTARLAR, None)
+
+
+def surum_sorgusu(*anahtarlar: str):
+    # Tek bir PK IN sorgusu; hiç yazılmamış anahtarlar sonuçta yer almaz.
+    return select(IcerikSurumu.anahtar, IcerikSurumu.surum, IcerikSurumu.guncellenme).where(
+        IcerikSurumu.anahtar.in_(anahtarlar)
+    )
+
+
+def surumler(*anahtarlar: str) -> dict[str, tuple[int, datetime]]:
+    satirlar = db.session.execute(surum_sorgusu(*anahtarlar))
+    return {anahtar: (surum, guncellenme) for anahtar, surum, guncellenme in satirlar}
+
+
+def surum_imzasi(mevcut: dict[str, tuple[int, datetime]], anahtarlar: Iterable[str]) -> str:
+    return ",".join(str(mevcut.get(anahtar, (0, None))[0]) for anahtar in anahtarlar)
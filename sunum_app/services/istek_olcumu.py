@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from flask import (
+    Flask,
+    Response,
+    before_render_template,
+    g,
+    has_request_context,
+    request,
+    request_finished,
+    request_started,
+    template_rendered,
+)
+from sqlalchemy import event
+
+from ..extensions import db
+
+
+# app.config üzerinden değiştirilebilir. ISTEK_OLCUMU_BASLIK None ise
+# Server-Timing başlıkları yalnızca debug modunda eklenir.
+VARSAYILAN_AYARLAR = {
+    "ISTEK_OLCUMU": False,
+    "ISTEK_OLCUMU_BASLIK": None,
+    # /metrics bu istemci adreslerine ve giriş yapmış adminlere açıktır;
+    # boş bırakılırsa yalnızca adminler erişir.
+    "ISTEK_OLCUMU_METRICS_ADRESLERI": ("127.0.0.1", "::1"),
+}
+
+# Prometheus histogramının üst sınırları (saniye).
+SURE_ARALIKLARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# URL kuralına uymayan istekler (404) tek bir etiket altında toplanır.
+ESLESMEYEN = "<eslesmeyen>"
+
+
+@dataclass
+class _IstekOlcumu:
+    baslangic: float
+    sorgu: int = 0
+    db_suresi: float = 0.0
+    render_suresi: float = 0.0
+    render_baslangic: Optional[float] = None
+
+
+@dataclass
+class EndpointIstatistigi:
+    istek: int = 0
+    sorgu: int = 0
+    en_fazla_sorgu: int = 0
+    db_suresi: float = 0.0
+    render_suresi: float = 0.0
+    toplam_sure: float = 0.0
+    en_uzun_sure: float = 0.0
+    sure_dagilimi: list[int] = field(default_factory=lambda: [0] * len(SURE_ARALIKLARI))
+
+    def _ortalama(self, deger: float) -> float:
+        return deger / self.istek if self.istek else 0.0
+
+    @property
+    def ortalama_sorgu(self) -> float:
+        return self._ortalama(self.sorgu)
+
+    @property
+    def ortalama_db_ms(self) -> float:
+        return self._ortalama(self.db_suresi) * 1000
+
+    @property
+    def ortalama_render_ms(self) -> float:
+        return self._ortalama(self.render_suresi) * 1000
+
+    @property
+    def ortalama_toplam_ms(self) -> float:
+        return self._ortalama(self.toplam_sure) * 1000
+
+
+class IstekOlcumu:
+    # Endpoint başına toplanan sayaçlar süreç içinde tutulur; her gunicorn
+    # worker'ı kendi istatistiklerini raporlar.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._istatistikler: dict[str, EndpointIstatistigi] = {}
+
+    def kaydet(self, endpoint: str, olcum: _IstekOlcumu, toplam_sure: float) -> None:
+        with self._lock:
+            ist = self._istatistikler.get(endpoint)
+            if ist is None:
+                ist = self._istatistikler[endpoint] = EndpointIstatistigi()
+            ist.istek += 1
+            ist.sorgu += olcum.sorgu
+            ist.en_fazla_sorgu = max(ist.en_fazla_sorgu, olcum.sorgu)
+            ist.db_suresi += olcum.db_suresi
+            ist.render_suresi += olcum.render_suresi
+            ist.toplam_sure += toplam_sure
+            ist.en_uzun_sure = max(ist.en_uzun_sure, toplam_sure)
+            for i, sinir in enumerate(SURE_ARALIKLARI):
+                if toplam_sure <= sinir:
+                    ist.sure_dagilimi[i] += 1
+
+    def istatistikler(self) -> list[tuple[str, EndpointIstatistigi]]:
+        # En çok toplam süre harcayan endpoint'ler başta.
+        with self._lock:
+            kopya = [
+                (endpoint, replace(ist, sure_dagilimi=list(ist.sure_dagilimi)))
+                for endpoint, ist in self._istatistikler.items()
+            ]
+        return sorted(kopya, key=lambda kayit: kayit[1].toplam_sure, reverse=True)
+
+    def sifirla(self) -> None:
+        with self._lock:
+            self._istatistikler.clear()
+
+    def prometheus_metni(self) -> str:
+        istatistikler = sorted(self.istatistikler())
+        satirlar: list[str] = []
+
+        def metrik(ad: str, tip: str, aciklama: str, degerler) -> None:
+            satirlar.append(f"# HELP {ad} {aciklama}")
+            satirlar.append(f"# TYPE {ad} {tip}")
+            for endpoint, deger in degerler:
+                satirlar.append(f'{ad}{{endpoint="{_etiket(endpoint)}"}} {deger}')
+
+        satirlar.append("# HELP sunum_istek_suresi_seconds İstek başına toplam süre.")
+        satirlar.append("# TYPE sunum_istek_suresi_seconds histogram")
+        for endpoint, ist in istatistikler:
+            etiket = _etiket(endpoint)
+            for sinir, adet in zip(SURE_ARALIKLARI, ist.sure_dagilimi):
+                satirlar.append(
+                    f'sunum_istek_suresi_seconds_bucket{{endpoint="{etiket}",le="{sinir}"}} {adet}'
+                )
+            satirlar.append(
+                f'sunum_istek_suresi_seconds_bucket{{endpoint="{etiket}",le="+Inf"}} {ist.istek}'
+            )
+            satirlar.append(f'sunum_istek_suresi_seconds_sum{{endpoint="{etiket}"}} {ist.toplam_sure}')
+            satirlar.append(f'sunum_istek_suresi_seconds_count{{endpoint="{etiket}"}} {ist.istek}')
+
+        metrik(
+            "sunum_sql_sorgulari_total",
+            "counter",
+            "Çalıştırılan SQL sorgusu sayısı.",
+            ((e, ist.sorgu) for e, ist in istatistikler),
+        )
+        metrik(
+            "sunum_sql_suresi_seconds_total",
+            "counter",
+            "SQL sorgularında geçen süre.",
+            ((e, ist.db_suresi) for e, ist in istatistikler),
+        )
+        metrik(
+            "sunum_render_suresi_seconds_total",
+            "counter",
+            "Şablon render süresi.",
+            ((e, ist.render_suresi) for e, ist in istatistikler),
+        )
+        metrik(
+            "sunum_istek_basina_en_fazla_sorgu",
+            "gauge",
+            "Tek bir istekte görülen en yüksek sorgu sayısı.",
+            ((e, ist.en_fazla_sorgu) for e, ist in istatistikler),
+        )
+        return "\n".join(satirlar) + "\n"
+
+
+def _etiket(deger: str) -> str:
+    return deger.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _olcum() -> Optional[_IstekOlcumu]:
+    if not has_request_context():
+        return None
+    return g.get("_istek_olcumu")
+
+
+def _server_timing(olcum: _IstekOlcumu, toplam_sure: float) -> str:
+    return (
+        f'db;dur={olcum.db_suresi * 1000:.2f};desc="{olcum.sorgu} sorgu", '
+        f"render;dur={olcum.render_suresi * 1000:.2f}, "
+        f"toplam;dur={toplam_sure * 1000:.2f}"
+    )
+
+
+def istek_olcumu_olustur(app: Flask) -> Optional[IstekOlcumu]:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    if not app.config["ISTEK_OLCUMU"]:
+        return None
+
+    olcumu = IstekOlcumu()
+
+    def _sorgu_basladi(conn, cursor, statement, parameters, context, executemany) -> None:
+        # Bir bağlantıda aynı anda tek sorgu çalışır; hata veren sorgunun
+        # değeri bir sonraki sorguda üzerine yazılır.
+        conn.info["_sorgu_baslangici"] = time.perf_counter()
+
+    def _sorgu_bitti(conn, cursor, statement, parameters, context, executemany) -> None:
+        olcum = _olcum()
+        if olcum is not None:
+            olcum.sorgu += 1
+            olcum.db_suresi += time.perf_counter() - conn.info["_sorgu_baslangici"]
+
+    def _istek_basladi(sender, **kwargs) -> None:
+        g._istek_olcumu = _IstekOlcumu(baslangic=time.perf_counter())
+
+    def _render_basladi(sender, template, context, **kwargs) -> None:
+        olcum = _olcum()
+        if olcum is not None:
+            olcum.render_baslangic = time.perf_counter()
+
+    def _render_bitti(sender, template, context, **kwargs) -> None:
+        olcum = _olcum()
+        if olcum is not None and olcum.render_baslangic is not None:
+            olcum.render_suresi += time.perf_counter() - olcum.render_baslangic
+            olcum.render_baslangic = None
+
+    def _istek_bitti(sender, response: Response, **kwargs) -> None:
+        olcum = _olcum()
+        if olcum is None:
+            return
+        # Akış yanıtlarında (SSE, dışa aktarım) gövde bu noktadan sonra
+        # üretildiği için yalnızca yanıtın hazırlanma süresi sayılır.
+        toplam_sure = time.perf_counter() - olcum.baslangic
+        endpoint = request.url_rule.endpoint if request.url_rule else ESLESMEYEN
+        olcumu.kaydet(endpoint, olcum, toplam_sure)
+
+        baslik = app.config["ISTEK_OLCUMU_BASLIK"]
+        if baslik if baslik is not None else app.debug:
+            response.headers["Server-Timing"] = _server_timing(olcum, toplam_sure)
+            response.headers["X-Sorgu-Sayisi"] = str(olcum.sorgu)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _sorgu_basladi)
+        event.listen(db.engine, "after_cursor_execute", _sorgu_bitti)
+
+    # Sinyaller sender=app ile bağlanır; aynı süreçteki diğer uygulamaların
+    # istekleri bu ölçüme karışmaz. Dinleyiciler olcumu ile birlikte yaşar.
+    request_started.connect(_istek_basladi, app, weak=False)
+    before_render_template.connect(_render_basladi, app, weak=False)
+    template_rendered.connect(_render_bitti, app, weak=False)
+    request_finished.connect(_istek_bitti, app, weak=False)
+    return olcumu
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import Flask, current_app, has_app_context
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import VARSAYILAN_SIFRE_HASH_YONTEMI, User, hash_yontemi_coz
+
+
+# app.config üzerinden değiştirilebilir. KULLANICI_ONBELLEGI_TTL 0 ise
+# user_loader her istekte veritabanından okur.
+VARSAYILAN_AYARLAR = {
+    "KULLANICI_ONBELLEGI_TTL": 30,
+    "SIFRE_HASH_YONTEMI": VARSAYILAN_SIFRE_HASH_YONTEMI,
+}
+
+_DEGISEN_KULLANICILAR = "degisen_kullanicilar"
+
+
+@dataclass(frozen=True, eq=False)
+class KullaniciGoruntusu(UserMixin):
+    # current_user olarak kullanılan, session'a bağlı olmayan kopya;
+    # istekler arasında paylaşıldığı için expire/detach sorunu yaşamaz.
+    id: int
+    username: str
+    email: str
+    is_admin: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "KullaniciGoruntusu":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_admin=bool(user.is_admin),
+        )
+
+
+class KullaniciOnbellegi:
+    # Süreç içi, kullanıcı id'sine göre TTL'li önbellek. Bu süreçte commit
+    # edilen kullanıcı değişiklikleri girdiyi hemen düşürür; diğer
+    # worker'lardaki kopyalar en geç TTL sonunda yenilenir.
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._girdiler: dict[int, tuple[float, Optional[KullaniciGoruntusu]]] = {}
+
+    def getir(self, user_id: int) -> Optional[KullaniciGoruntusu]:
+        simdi = time.monotonic()
+        with self._lock:
+            girdi = self._girdiler.get(user_id)
+        if girdi is not None and girdi[0] > simdi:
+            return girdi[1]
+
+        user = db.session.get(User, user_id)
+        goruntu = KullaniciGoruntusu.from_model(user) if user is not None else None
+        with self._lock:
+            self._girdiler[user_id] = (simdi + self.ttl, goruntu)
+        return goruntu
+
+    def gecersiz_kil(self, user_idleri) -> None:
+        with self._lock:
+            for user_id in user_idleri:
+                self._girdiler.pop(user_id, None)
+
+    def temizle(self) -> None:
+        with self._lock:
+            self._girdiler.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_sonrasi(session: Session, flush_context) -> None:
+    idler = {
+        nesne.id
+        for nesne in (*session.dirty, *session.deleted)
+        if isinstance(nesne, User) and nesne.id is not None
+    }
+    if idler:
+        session.info.setdefault(_DEGISEN_KULLANICILAR, set()).update(idler)
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_sonrasi(session: Session) -> None:
+    # Girdi commit'ten önce düşürülürse başka bir istek eski satırı
+    # yeniden önbelleğe alabilir.
+    idler = session.info.pop(_DEGISEN_KULLANICILAR, None)
+    if idler and has_app_context():
+        onbellek = current_app.extensions.get("kullanici_onbellegi")
+        if onbellek is not None:
+            onbellek.gecersiz_kil(idler)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rollback_sonrasi(session: Session) -> None:
+    session.info.pop(_DEGISEN_KULLANICILAR, None)
+
+
+def kullanici_onbellegi_olustur(app: Flask) -> Optional[KullaniciOnbellegi]:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    # Hatalı yöntem ilk girişte değil, açılışta fark edilsin.
+    hash_yontemi_coz(app.config["SIFRE_HASH_YONTEMI"])
+
+    if not app.config["KULLANICI_ONBELLEGI_TTL"]:
+        return None
+    return KullaniciOnbellegi(app.config["KULLANICI_ONBELLEGI_TTL"])
@@ -1,9 +1,80 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import Dict, Optional
+from itertools import repeat
+from typing import Dict, Iterable, Optional, Sequence
 
-from ..models import Ayarlar, Degerlendirme, Sunum
+from sqlalchemy import case
+
+from ..extensions import db
+from ..models import Ayarlar, Degerlendirme, Ogrenci, Ogretmen, Sunum, SunumNotOzeti
+from .ayarlar_onbellegi import AyarlarGoruntusu, aktif_ayarlar
+
+
+KRITERLER = (
+    "konu_hakimiyeti",
+    "anlatim",
+    "giyim",
+    "ekip_uyumu",
+    "gorsellik",
+    "genel_gorus",
+)
+
+
+@dataclass
+class DegerlendirmeKolonlari:
+    idler: array
+    sunum_idleri: array
+    tipler: list[str]
+    kriterler: tuple[array, ...]
+
+    def __len__(self) -> int:
+        return len(self.idler)
+
+
+def degerlendirme_sorgusu(*ek_kolonlar, degerlendiren: bool = False):
+    # Değerlendirmeler ORM nesnesi kurulmadan kolon olarak okunur. İlk
+    # kolonlar (id, sunum_id, tip, kriterler) kolonlara_ayir'ın beklediği
+    # sıradadır; sayfalar gösterim için ek kolonları sona ekler.
+    # degerlendiren=True ise değerlendirenin adı "degerlendiren" kolonunda
+    # gelir (bulunamazsa None).
+    kolonlar = [
+        Degerlendirme.id,
+        Degerlendirme.sunum_id,
+        Degerlendirme.degerlendiren_tipi,
+        *[getattr(Degerlendirme, kriter) for kriter in KRITERLER],
+        *ek_kolonlar,
+    ]
+    if not degerlendiren:
+        return db.session.query(*kolonlar)
+
+    adi = case(
+        (Degerlendirme.degerlendiren_tipi == "ogrenci", Ogrenci.ad + " " + Ogrenci.soyad),
+        (Degerlendirme.degerlendiren_tipi == "ogretmen", Ogretmen.ad + " " + Ogretmen.soyad),
+    ).label("degerlendiren")
+    return (
+        db.session.query(*kolonlar, adi)
+        .outerjoin(Ogrenci, Ogrenci.id == Degerlendirme.degerlendiren_ogrenci_id)
+        .outerjoin(Ogretmen, Ogretmen.id == Degerlendirme.degerlendiren_ogretmen_id)
+    )
+
+
+def kolonlara_ayir(satirlar: Iterable[Sequence]) -> DegerlendirmeKolonlari:
+    kolonlar = DegerlendirmeKolonlari(
+        idler=array("q"),
+        sunum_idleri=array("q"),
+        tipler=[],
+        kriterler=tuple(array("d") for _ in KRITERLER),
+    )
+    son = 3 + len(KRITERLER)
+    for satir in satirlar:
+        kolonlar.idler.append(satir[0])
+        kolonlar.sunum_idleri.append(satir[1])
+        kolonlar.tipler.append(satir[2])
+        for kolon, deger in zip(kolonlar.kriterler, satir[3:son]):
+            kolon.append(deger)
+    return kolonlar
 
 
 @dataclass
@@ -15,14 +86,24 @@ class FinalNotBilgisi:
     degerlendirme_sayisi: int
 
 
+# ozetten_final_notlari'nın döndürdüğü alanlar; SunumNotOzeti.final_not_bilgisi
+# ile aynıdır. Özet tablosu öğrenci notlarını tek tek tutmadığından canlı
+# hesaplamadaki "ogrenci_notlari" bu biçimde yer almaz.
+OZET_ALANLARI = ("ogretmen_notu", "ogrenci_ortalama", "final_notu", "degerlendirme_sayisi")
+
+
+def ozet_bicimi(bilgi: Dict) -> Dict:
+    return {alan: bilgi[alan] for alan in OZET_ALANLARI}
+
+
 class NotHesaplamaServisi:
-    def __init__(self, ayarlar: Optional[Ayarlar] = None):
+    def __init__(self, ayarlar: Optional[Ayarlar | AyarlarGoruntusu] = None):
         self._ayarlar = ayarlar
 
     @property
-    def ayarlar(self) -> Ayarlar:
+    def ayarlar(self) -> Ayarlar | AyarlarGoruntusu:
         if self._ayarlar is None:
-            self._ayarlar = Ayarlar.get_aktif_ayarlar()
+            self._ayarlar = aktif_ayarlar()
         return self._ayarlar
 
     def hesapla_agirlikli_ortalama(self, degerlendirme: Degerlendirme) -> float:
@@ -39,26 +120,140 @@ class NotHesaplamaServisi:
 
         return round(toplam, 2)
 
-    def hesapla_final_notu(self, sunum: Sunum) -> Dict:
+    def hesapla_agirlikli_ortalamalar(self, kolonlar: Sequence[Sequence[float]]) -> list[float]:
+        # Her kriter kolonu ağırlığıyla tek vektör işleminde çarpılıp toplama
+        # eklenir. Terimlerin işlem ve toplanma sırası hesapla_agirlikli_ortalama
+        # ile aynıdır (IEEE double); yuvarlama Python round ile yapıldığından
+        # sonuç satır satır hesapla birebir aynı çıkar. numpy, uygulama
+        # açılışını yavaşlatmaması için ilk kullanımda yüklenir.
+        import numpy as np
+
         a = self.ayarlar
+        toplam = None
+        for kolon, kriter in zip(kolonlar, KRITERLER):
+            terim = np.asarray(kolon, dtype=np.float64) * getattr(a, f"{kriter}_agirlik") / 100
+            toplam = terim if toplam is None else toplam + terim
+        if toplam is None:
+            return []
+        return list(map(round, toplam.tolist(), repeat(2)))
 
-        ogretmen_degerlendirme = Degerlendirme.query.filter_by(
-            sunum_id=sunum.id, degerlendiren_tipi="ogretmen"
-        ).first()
+    def degerlendirme_kolonlari(self, *kosullar) -> DegerlendirmeKolonlari:
+        sorgu = degerlendirme_sorgusu().filter(*kosullar).order_by(Degerlendirme.id.asc())
+        return kolonlara_ayir(sorgu.yield_per(1000))
 
-        ogrenci_degerlendirmeleri = Degerlendirme.query.filter_by(
-            sunum_id=sunum.id, degerlendiren_tipi="ogrenci"
-        ).all()
+    def hesapla_final_notu(self, sunum: Sunum) -> Dict:
+        ogretmen_by_sunum, ogrenci_by_sunum, _ = self._degerlendirmeleri_grupla([sunum.id])
+        return self._final_notu_bilgisi(
+            ogretmen_by_sunum.get(sunum.id), ogrenci_by_sunum[sunum.id]
+        )
 
-        ogretmen_notu = (
-            self.hesapla_agirlikli_ortalama(ogretmen_degerlendirme)
-            if ogretmen_degerlendirme
-            else None
+    def hesapla_final_notlari(self, sunumlar: Iterable[Sunum]) -> Dict[int, Dict]:
+        # Tüm sunumların değerlendirmeleri tek sorguda okunur; sonuç
+        # sunum_id -> hesapla_final_notu çıktısı şeklindedir.
+        sunum_idleri = [sunum.id for sunum in sunumlar]
+        if not sunum_idleri:
+            return {}
+
+        ogretmen_by_sunum, ogrenci_by_sunum, _ = self._degerlendirmeleri_grupla(sunum_idleri)
+        return {
+            sunum_id: self._final_notu_bilgisi(
+                ogretmen_by_sunum.get(sunum_id), ogrenci_by_sunum[sunum_id]
+            )
+            for sunum_id in sunum_idleri
+        }
+
+    def ozetten_final_notlari(self, sunumlar: Iterable[Sunum]) -> Dict[int, Dict]:
+        # Notlar sunum_not_ozeti tablosundan okunur; özeti henüz oluşmamış
+        # sunumlar için canlı hesaplamaya düşülür. İki yol da OZET_ALANLARI
+        # biçiminde döner.
+        sunumlar = list(sunumlar)
+        sunum_idleri = [sunum.id for sunum in sunumlar]
+        if not sunum_idleri:
+            return {}
+
+        ozetler = SunumNotOzeti.query.filter(SunumNotOzeti.sunum_id.in_(sunum_idleri)).all()
+        sonuc = {ozet.sunum_id: ozet.final_not_bilgisi() for ozet in ozetler}
+
+        eksikler = [sunum for sunum in sunumlar if sunum.id not in sonuc]
+        if eksikler:
+            canli = self.hesapla_final_notlari(eksikler)
+            sonuc.update((sunum_id, ozet_bicimi(bilgi)) for sunum_id, bilgi in canli.items())
+        return sonuc
+
+    def ozet_guncelle(self, sunum_id: int) -> SunumNotOzeti:
+        # Commit çağıranın sorumluluğundadır; böylece özet, değerlendirme
+        # yazımı ile aynı transaction içinde kalır.
+        db.session.flush()
+        gruplar = self._degerlendirmeleri_grupla([sunum_id])
+        return self._ozet_yaz(sunum_id, *gruplar)
+
+    def ozetleri_guncelle(self, sunum_idleri: Iterable[int]) -> None:
+        # ozet_guncelle'nin çoklu hali: etkilenen sunumlar tek taramada
+        # yeniden hesaplanır.
+        sunum_idleri = sorted(set(sunum_idleri))
+        if not sunum_idleri:
+            return
+
+        db.session.flush()
+        gruplar = self._degerlendirmeleri_grupla(sunum_idleri)
+        SunumNotOzeti.query.filter(SunumNotOzeti.sunum_id.in_(sunum_idleri)).all()
+        for sunum_id in sunum_idleri:
+            self._ozet_yaz(sunum_id, *gruplar)
+
+    def ozetleri_yeniden_olustur(self) -> int:
+        db.session.flush()
+        sunum_idleri = [row[0] for row in db.session.query(Sunum.id).all()]
+        gruplar = self._degerlendirmeleri_grupla(sunum_idleri)
+
+        SunumNotOzeti.query.filter(~SunumNotOzeti.sunum_id.in_(sunum_idleri)).delete(
+            synchronize_session=False
         )
+        # Mevcut özetleri tek sorguda session'a al; _ozet_yaz içindeki
+        # session.get çağrıları ayrı SELECT üretmesin.
+        SunumNotOzeti.query.all()
+        for sunum_id in sunum_idleri:
+            self._ozet_yaz(sunum_id, *gruplar)
+        return len(sunum_idleri)
+
+    def _ozet_yaz(
+        self, sunum_id: int, ogretmen_by_sunum, ogrenci_by_sunum, sayi_by_sunum
+    ) -> SunumNotOzeti:
+        bilgi = self._final_notu_bilgisi(
+            ogretmen_by_sunum.get(sunum_id), ogrenci_by_sunum[sunum_id]
+        )
+
+        ozet = db.session.get(SunumNotOzeti, sunum_id)
+        if ozet is None:
+            ozet = SunumNotOzeti(sunum_id=sunum_id)
+            db.session.add(ozet)
 
-        ogrenci_notlari: list[float] = [
-            self.hesapla_agirlikli_ortalama(d) for d in ogrenci_degerlendirmeleri
-        ]
+        ozet.ogretmen_notu = bilgi["ogretmen_notu"]
+        ozet.ogrenci_not_toplami = sum(bilgi["ogrenci_notlari"])
+        ozet.ogrenci_degerlendirme_sayisi = bilgi["degerlendirme_sayisi"]
+        ozet.ogrenci_ortalama = bilgi["ogrenci_ortalama"]
+        ozet.final_notu = bilgi["final_notu"]
+        ozet.degerlendirme_sayisi = sayi_by_sunum[sunum_id]
+        return ozet
+
+    def _degerlendirmeleri_grupla(self, sunum_idleri: list[int]):
+        kolonlar = self.degerlendirme_kolonlari(Degerlendirme.sunum_id.in_(sunum_idleri))
+        ortalamalar = self.hesapla_agirlikli_ortalamalar(kolonlar.kriterler)
+
+        ogretmen_by_sunum: Dict[int, float] = {}
+        ogrenci_by_sunum: Dict[int, list[float]] = {sunum_id: [] for sunum_id in sunum_idleri}
+        sayi_by_sunum: Dict[int, int] = dict.fromkeys(sunum_idleri, 0)
+        for sunum_id, tip, ortalama in zip(kolonlar.sunum_idleri, kolonlar.tipler, ortalamalar):
+            sayi_by_sunum[sunum_id] += 1
+            if tip == "ogretmen":
+                ogretmen_by_sunum.setdefault(sunum_id, ortalama)
+            elif tip == "ogrenci":
+                ogrenci_by_sunum[sunum_id].append(ortalama)
+        return ogretmen_by_sunum, ogrenci_by_sunum, sayi_by_sunum
+
+    def _final_notu_bilgisi(
+        self, ogretmen_notu: Optional[float], ogrenci_notlari: list[float]
+    ) -> Dict:
+        a = self.ayarlar
 
         ogrenci_ortalama: Optional[float]
         if ogrenci_notlari:
@@ -85,7 +280,7 @@ class NotHesaplamaServisi:
             ogrenci_ortalama=ogrenci_ortalama,
             final_notu=final_notu,
             ogrenci_notlari=ogrenci_notlari,
-            degerlendirme_sayisi=len(ogrenci_degerlendirmeleri),
+            degerlendirme_sayisi=len(ogrenci_notlari),
         )
 
         return {
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from sqlalchemy import and_, column, event, func, or_, text, true
+
+from ..extensions import db
+from ..models import Ogrenci
+
+
+ARAMA_TABLOSU = "ogrenci_arama"
+
+# Sorgu ve indekslenen metin aynı şekilde katlanır; SQLite'ın LOWER/ILIKE
+# davranışı I/İ/ı/i ayrımını bilmediği için katlama Python tarafında yapılır.
+_TURKCE_BUYUK = str.maketrans({"I": "ı", "İ": "i"})
+
+# trigram tokenizer 3 karakterden kısa terimleri indeksten arayamaz.
+_MIN_TERIM_UZUNLUGU = 3
+
+
+def turkce_kucuk(metin: str) -> str:
+    return (metin or "").translate(_TURKCE_BUYUK).lower()
+
+
+def fts_destekleniyor() -> bool:
+    return db.engine.dialect.name == "sqlite"
+
+
+def arama_tablosunu_olustur(conn) -> None:
+    # İçerik ve numara için trigram FTS5 tablosu; rowid = ogrenci.id.
+    # Tablo yeni oluşturulduysa mevcut öğrencilerle doldurulur.
+    mevcut = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (ARAMA_TABLOSU,)
+    ).fetchone()
+    if mevcut:
+        return
+
+    conn.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE {ARAMA_TABLOSU} USING fts5("
+        "ad, soyad, numara, tokenize='trigram')"
+    )
+    indeksi_yeniden_olustur(conn)
+
+
+def indeksi_yeniden_olustur(conn) -> None:
+    conn.exec_driver_sql(f"DELETE FROM {ARAMA_TABLOSU}")
+    rows = conn.exec_driver_sql("SELECT id, ad, soyad, numara FROM ogrenci").fetchall()
+    if not rows:
+        return
+
+    conn.exec_driver_sql(
+        f"INSERT INTO {ARAMA_TABLOSU} (rowid, ad, soyad, numara) VALUES (?, ?, ?, ?)",
+        [
+            (row[0], turkce_kucuk(row[1]), turkce_kucuk(row[2]), turkce_kucuk(row[3]))
+            for row in rows
+        ],
+    )
+
+
+def indeks_satirlarini_yaz(conn, satirlar) -> None:
+    # satirlar: (id, ad, soyad, numara) demetleri; mevcut indeks satırları
+    # önce silinir, böylece ekleme ve güncelleme aynı şekilde yazılır.
+    satirlar = list(satirlar)
+    if not satirlar:
+        return
+
+    conn.exec_driver_sql(
+        f"DELETE FROM {ARAMA_TABLOSU} WHERE rowid = ?", [(row[0],) for row in satirlar]
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO {ARAMA_TABLOSU} (rowid, ad, soyad, numara) VALUES (?, ?, ?, ?)",
+        [
+            (row[0], turkce_kucuk(row[1]), turkce_kucuk(row[2]), turkce_kucuk(row[3]))
+            for row in satirlar
+        ],
+    )
+
+
+def _indeks_satirini_yaz(conn, ogrenci: Ogrenci) -> None:
+    indeks_satirlarini_yaz(conn, [(ogrenci.id, ogrenci.ad, ogrenci.soyad, ogrenci.numara)])
+
+
+@event.listens_for(Ogrenci, "after_insert")
+@event.listens_for(Ogrenci, "after_update")
+def _ogrenci_yazildi(mapper, connection, target: Ogrenci) -> None:
+    if connection.dialect.name == "sqlite":
+        _indeks_satirini_yaz(connection, target)
+
+
+@event.listens_for(Ogrenci, "after_delete")
+def _ogrenci_silindi(mapper, connection, target: Ogrenci) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"DELETE FROM {ARAMA_TABLOSU} WHERE rowid = ?", (target.id,)
+        )
+
+
+def _like_deseni(terim: str) -> str:
+    return "%" + terim.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _turkce_kucuk_sql(kolon):
+    # turkce_kucuk'un SQL karşılığı; I/İ önce çevrilir, kalan harfler LOWER ile
+    # küçültülür.
+    return func.lower(func.replace(func.replace(kolon, "I", "ı"), "İ", "i"))
+
+
+def ogrenci_arama_filtresi(q: str):
+    # Her terim ad, soyad veya numaranın bir parçasıyla eşleşmelidir; terimler
+    # AND ile birleşir. Numara da metin olarak indekslendiği için rakamlı
+    # terimler de ara eşleşme olarak aranır.
+    terimler = turkce_kucuk(q).split()
+    if not terimler:
+        return true()
+
+    if fts_destekleniyor():
+        uzunlar = [t for t in terimler if len(t) >= _MIN_TERIM_UZUNLUGU]
+        kisalar = [t for t in terimler if len(t) < _MIN_TERIM_UZUNLUGU]
+
+        # Uzun terimler trigram indeksinden aranır; indeksin kullanamadığı kısa
+        # terimler aynı tablodaki katlanmış metin üzerinde LIKE ile süzülür.
+        kosullar, parametreler = [], {}
+        if uzunlar:
+            kosullar.append(f"{ARAMA_TABLOSU} MATCH :arama_ifadesi")
+            parametreler["arama_ifadesi"] = " AND ".join(
+                '"' + t.replace('"', '""') + '"' for t in uzunlar
+            )
+        for sira, terim in enumerate(kisalar):
+            kosullar.append(
+                f"(ad || ' ' || soyad || ' ' || numara) LIKE :kisa_{sira} ESCAPE '\\'"
+            )
+            parametreler[f"kisa_{sira}"] = _like_deseni(terim)
+
+        eslesenler = (
+            text(f"SELECT rowid FROM {ARAMA_TABLOSU} WHERE " + " AND ".join(kosullar))
+            .bindparams(**parametreler)
+            .columns(column("rowid"))
+        )
+        return Ogrenci.id.in_(eslesenler)
+
+    return and_(
+        *(
+            or_(
+                *(
+                    _turkce_kucuk_sql(kolon).like(_like_deseni(terim), escape="\\")
+                    for kolon in (Ogrenci.ad, Ogrenci.soyad, Ogrenci.numara)
+                )
+            )
+            for terim in terimler
+        )
+    )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, TextIO
+
+from sqlalchemy import bindparam, func, insert, select, update
+
+from ..extensions import db
+from ..models import Ekip, Ogrenci
+from .icerik_surumleri import GENEL, KADRO, surumleri_artir
+from .ogrenci_arama import fts_destekleniyor, indeks_satirlarini_yaz
+
+
+ZORUNLU_KOLONLAR = ("numara", "ad", "soyad")
+
+
+@dataclass
+class SatirHatasi:
+    satir: int
+    mesaj: str
+
+    def to_dict(self) -> dict:
+        return {"satir": self.satir, "mesaj": self.mesaj}
+
+
+@dataclass
+class IceAktarimSonucu:
+    eklenen: int = 0
+    guncellenen: int = 0
+    olusturulan_ekip: int = 0
+    hatalar: list[SatirHatasi] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "eklenen": self.eklenen,
+            "guncellenen": self.guncellenen,
+            "olusturulan_ekip": self.olusturulan_ekip,
+            "hatalar": [h.to_dict() for h in self.hatalar],
+        }
+
+
+@dataclass
+class _Satir:
+    satir: int
+    numara: str
+    ad: str
+    soyad: str
+    ekip: str
+
+
+class OgrenciIceAktarimServisi:
+    # CSV'deki öğrencileri (numara, ad, soyad, ekip) tek transaction'da ekler
+    # ya da numarası kayıtlı olanları günceller. Dosya akış olarak okunur ve
+    # PARCA_BOYUTU satırlık parçalar halinde işlenir; her parça için ekipler
+    # ve mevcut numaralar birer IN sorgusuyla çözülür, yazımlar executemany
+    # ile yapılır. Eksik ekipler isimlerinden oluşturulur.
+
+    PARCA_BOYUTU = 1000
+
+    def __init__(self) -> None:
+        self._ekip_idleri: dict[str, int] = {}
+
+    def ice_aktar(self, dosya: TextIO) -> IceAktarimSonucu:
+        sonuc = IceAktarimSonucu()
+        okuyucu = self._okuyucu(dosya, sonuc)
+        if okuyucu is None:
+            return sonuc
+
+        gorulen_numaralar: set[str] = set()
+        try:
+            for parca in self._parcalar(self._satirlar(okuyucu, gorulen_numaralar, sonuc)):
+                self._parca_yaz(parca, sonuc)
+            if sonuc.guncellenen:
+                # Değerlendiren adları herkese açık sayfalarda görünür.
+                surumleri_artir(db.session, {GENEL})
+            elif sonuc.eklenen or sonuc.olusturulan_ekip:
+                surumleri_artir(db.session, {KADRO})
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return sonuc
+
+    def _okuyucu(self, dosya: TextIO, sonuc: IceAktarimSonucu) -> Optional[csv.DictReader]:
+        # Türkçe Excel CSV'leri ";" ile ayırır; ayraç başlık satırından seçilir.
+        baslik = dosya.readline()
+        ayrac = ";" if baslik.count(";") > baslik.count(",") else ","
+        kolonlar = [k.strip().lower() for k in next(csv.reader([baslik], delimiter=ayrac), [])]
+
+        eksik = [k for k in ZORUNLU_KOLONLAR if k not in kolonlar]
+        if eksik:
+            sonuc.hatalar.append(SatirHatasi(1, f"Eksik kolon: {', '.join(eksik)}"))
+            return None
+        return csv.DictReader(dosya, fieldnames=kolonlar, delimiter=ayrac)
+
+    def _satirlar(
+        self, okuyucu: csv.DictReader, gorulen_numaralar: set[str], sonuc: IceAktarimSonucu
+    ) -> Iterator[_Satir]:
+        for satir_no, kayit in enumerate(okuyucu, start=2):
+            numara = (kayit.get("numara") or "").strip()
+            ad = (kayit.get("ad") or "").strip()
+            soyad = (kayit.get("soyad") or "").strip()
+            ekip = (kayit.get("ekip") or "").strip()
+
+            if not (numara or ad or soyad or ekip):
+                continue
+            if not numara or not ad or not soyad:
+                sonuc.hatalar.append(SatirHatasi(satir_no, "Numara, ad ve soyad zorunludur."))
+            elif len(numara) > 20 or len(ad) > 100 or len(soyad) > 100 or len(ekip) > 200:
+                sonuc.hatalar.append(SatirHatasi(satir_no, "Alan uzunluğu sınırı aşıldı."))
+            elif numara in gorulen_numaralar:
+                sonuc.hatalar.append(SatirHatasi(satir_no, f"{numara} numarası dosyada tekrar ediyor."))
+            else:
+                gorulen_numaralar.add(numara)
+                yield _Satir(satir_no, numara, ad, soyad, ekip)
+
+    def _parcalar(self, satirlar: Iterable[_Satir]) -> Iterator[list[_Satir]]:
+        parca: list[_Satir] = []
+        for satir in satirlar:
+            parca.append(satir)
+            if len(parca) >= self.PARCA_BOYUTU:
+                yield parca
+                parca = []
+        if parca:
+            yield parca
+
+    def _ekipleri_coz(self, isimler: set[str], sonuc: IceAktarimSonucu) -> None:
+        isimler = {isim for isim in isimler if isim and isim not in self._ekip_idleri}
+        if not isimler:
+            return
+
+        # Aynı isimli birden fazla ekip varsa en eski kayıt kullanılır.
+        self._ekip_idleri.update(
+            db.session.execute(
+                select(Ekip.isim, func.min(Ekip.id)).where(Ekip.isim.in_(isimler)).group_by(Ekip.isim)
+            ).all()
+        )
+
+        yeni_isimler = sorted(isimler - self._ekip_idleri.keys())
+        if yeni_isimler:
+            db.session.execute(insert(Ekip), [{"isim": isim, "aciklama": ""} for isim in yeni_isimler])
+            self._ekip_idleri.update(
+                db.session.execute(
+                    select(Ekip.isim, func.min(Ekip.id))
+                    .where(Ekip.isim.in_(yeni_isimler))
+                    .group_by(Ekip.isim)
+                ).all()
+            )
+            sonuc.olusturulan_ekip += len(yeni_isimler)
+
+    def _parca_yaz(self, parca: list[_Satir], sonuc: IceAktarimSonucu) -> None:
+        self._ekipleri_coz({s.ekip for s in parca}, sonuc)
+
+        numaralar = [s.numara for s in parca]
+        mevcut = dict(
+            db.session.execute(
+                select(Ogrenci.numara, Ogrenci.id).where(Ogrenci.numara.in_(numaralar))
+            ).all()
+        )
+
+        eklenecekler = []
+        # Ekip hücresi boş (ya da ekip kolonu hiç yok) ise kayıtlı öğrencinin
+        # ekibine dokunulmaz; bu satırlar ekip_id'siz güncellenir.
+        guncellenecekler: dict[bool, list[dict]] = {True: [], False: []}
+        for s in parca:
+            ekip_id = self._ekip_idleri.get(s.ekip) if s.ekip else None
+            if s.numara in mevcut:
+                degerler = {"b_id": mevcut[s.numara], "ad": s.ad, "soyad": s.soyad}
+                if s.ekip:
+                    degerler["ekip_id"] = ekip_id
+                guncellenecekler[bool(s.ekip)].append(degerler)
+            else:
+                eklenecekler.append(
+                    {"numara": s.numara, "ad": s.ad, "soyad": s.soyad, "ekip_id": ekip_id}
+                )
+
+        if eklenecekler:
+            db.session.execute(insert(Ogrenci), eklenecekler)
+        tablo = Ogrenci.__table__
+        for ekipli, satirlar in guncellenecekler.items():
+            if not satirlar:
+                continue
+            kolonlar = {"ad": bindparam("ad"), "soyad": bindparam("soyad")}
+            if ekipli:
+                kolonlar["ekip_id"] = bindparam("ekip_id")
+            db.session.connection().execute(
+                update(tablo).where(tablo.c.id == bindparam("b_id")).values(**kolonlar),
+                satirlar,
+            )
+        sonuc.eklenen += len(eklenecekler)
+        sonuc.guncellenen += sum(len(satirlar) for satirlar in guncellenecekler.values())
+
+        # executemany yazımları mapper event'lerini tetiklemez; arama
+        # indeksi bu parçadaki öğrenciler için burada güncellenir.
+        if fts_destekleniyor():
+            conn = db.session.connection()
+            satirlar = conn.execute(
+                select(Ogrenci.id, Ogrenci.ad, Ogrenci.soyad, Ogrenci.numara).where(
+                    Ogrenci.numara.in_(numaralar)
+                )
+            ).all()
+            indeks_satirlarini_yaz(conn, satirlar)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.orm import joinedload
+
+from ..models import Degerlendirme, Sunum
+from .not_hesaplama import KRITERLER, NotHesaplamaServisi, degerlendirme_sorgusu, kolonlara_ayir
+from .sayfalama import KeysetSayfa, keyset_sayfala
+
+
+class AlanSecimiHatasi(ValueError):
+    pass
+
+
+# Her alan (nesne, hesaplanan) -> değer şeklinde okunur. "hesaplanan"
+# sözlüğü yalnızca seçilen alanlar gerektiriyorsa doldurulur.
+SUNUM_ALANLARI: dict[str, Callable[[Sunum, dict], Any]] = {
+    "id": lambda s, _: s.id,
+    "baslik": lambda s, _: s.baslik,
+    "aciklama": lambda s, _: s.aciklama,
+    "sunum_tarihi": lambda s, _: s.sunum_tarihi.isoformat(),
+    "ekip_id": lambda s, _: s.ekip_id,
+    "ekip": lambda s, _: s.ekip.isim,
+    "ogretmen_notu": lambda _, n: n["ogretmen_notu"],
+    "ogrenci_ortalama": lambda _, n: n["ogrenci_ortalama"],
+    "final_notu": lambda _, n: n["final_notu"],
+    "degerlendirme_sayisi": lambda _, n: n["degerlendirme_sayisi"],
+}
+_NOT_ALANLARI = frozenset(
+    ("ogretmen_notu", "ogrenci_ortalama", "final_notu", "degerlendirme_sayisi")
+)
+VARSAYILAN_SUNUM_ALANLARI = ("id", "baslik", "ekip", "sunum_tarihi", "final_notu")
+
+
+# Değerlendirmeler degerlendirme_sorgusu satırlarından (Row) okunur;
+# "degerlendiren" ve "yorum" kolonları yalnızca seçildiklerinde sorguya eklenir.
+DEGERLENDIRME_ALANLARI: dict[str, Callable[[Row, dict], Any]] = {
+    "id": lambda d, _: d.id,
+    "sunum_id": lambda d, _: d.sunum_id,
+    "degerlendiren_tipi": lambda d, _: d.degerlendiren_tipi,
+    "degerlendiren": lambda d, _: d.degerlendiren,
+    **{kriter: (lambda d, _, k=kriter: getattr(d, k)) for kriter in KRITERLER},
+    "agirlikli_ortalama": lambda d, h: h["ortalama"],
+    "yorum": lambda d, _: d.yorum,
+}
+VARSAYILAN_DEGERLENDIRME_ALANLARI = (
+    "id",
+    "sunum_id",
+    "degerlendiren_tipi",
+    *KRITERLER,
+    "agirlikli_ortalama",
+)
+
+
+def alanlari_coz(
+    istenen: Optional[str], tanimli: Mapping[str, Any], varsayilan: Sequence[str]
+) -> tuple[str, ...]:
+    if not istenen:
+        return tuple(varsayilan)
+    alanlar = tuple(dict.fromkeys(a.strip() for a in istenen.split(",") if a.strip()))
+    bilinmeyen = [a for a in alanlar if a not in tanimli]
+    if bilinmeyen or not alanlar:
+        raise AlanSecimiHatasi(
+            f"Bilinmeyen alan: {', '.join(bilinmeyen) or '-'}. Geçerli alanlar: {', '.join(tanimli)}"
+        )
+    return alanlar
+
+
+def notlar_gerekli(alanlar: Sequence[str]) -> bool:
+    return bool(_NOT_ALANLARI.intersection(alanlar))
+
+
+def sayfa_sozlugu(sayfa: KeysetSayfa, veriler: list[dict]) -> dict:
+    return {
+        "veriler": veriler,
+        "sonraki": sayfa.next_cursor,
+        "onceki": sayfa.prev_cursor,
+    }
+
+
+def sunum_sozlukleri(
+    sunumlar: Sequence[Sunum], alanlar: Sequence[str], notlar: Optional[dict[int, dict]] = None
+) -> list[dict]:
+    # Not alanları seçilmediyse not özeti tablosu hiç okunmaz. Notlar
+    # önceden okunduysa (ASGI modu) doğrudan kullanılır.
+    if notlar is None:
+        notlar = {}
+        if notlar_gerekli(alanlar):
+            notlar = NotHesaplamaServisi().ozetten_final_notlari(sunumlar)
+
+    okuyucular = [(alan, SUNUM_ALANLARI[alan]) for alan in alanlar]
+    return [
+        {alan: oku(sunum, notlar.get(sunum.id)) for alan, oku in okuyucular}
+        for sunum in sunumlar
+    ]
+
+
+def sunum_sayfasi(alanlar: Sequence[str], per_page: int, cursor: Optional[str]) -> dict:
+    query = Sunum.query
+    if "ekip" in alanlar:
+        query = query.options(joinedload(Sunum.ekip))
+    sayfa = keyset_sayfala(query, Sunum.id, per_page=per_page, cursor=cursor)
+    return sayfa_sozlugu(sayfa, sunum_sozlukleri(sayfa.items, alanlar))
+
+
+def degerlendirme_sayfasi(
+    alanlar: Sequence[str],
+    per_page: int,
+    cursor: Optional[str],
+    sunum_id: Optional[int] = None,
+) -> dict:
+    ek_kolonlar = [Degerlendirme.yorum] if "yorum" in alanlar else []
+    query = degerlendirme_sorgusu(*ek_kolonlar, degerlendiren="degerlendiren" in alanlar)
+    if sunum_id is not None:
+        query = query.filter(Degerlendirme.sunum_id == sunum_id)
+    sayfa = keyset_sayfala(query, Degerlendirme.id, per_page=per_page, cursor=cursor)
+
+    ortalamalar: list[Optional[float]] = [None] * len(sayfa.items)
+    if "agirlikli_ortalama" in alanlar:
+        ortalamalar = NotHesaplamaServisi().hesapla_agirlikli_ortalamalar(
+            kolonlara_ayir(sayfa.items).kriterler
+        )
+
+    okuyucular = [(alan, DEGERLENDIRME_ALANLARI[alan]) for alan in alanlar]
+    veriler = [
+        {alan: oku(d, {"ortalama": ortalama}) for alan, oku in okuyucular}
+        for d, ortalama in zip(sayfa.items, ortalamalar)
+    ]
+    return sayfa_sozlugu(sayfa, veriler)
+
+
+def sunum_not_dokumu(sunum: Sunum) -> dict:
+    # Sunumun final notu ve bu notu oluşturan bileşenler/ağırlıklar.
+    servis = NotHesaplamaServisi()
+    bilgi = servis.ozetten_final_notlari([sunum])[sunum.id]
+    a = servis.ayarlar
+
+    kolonlar = servis.degerlendirme_kolonlari(Degerlendirme.sunum_id == sunum.id)
+    kriter_ortalamalari = {}
+    for tip in ("ogretmen", "ogrenci"):
+        secili = [i for i, t in enumerate(kolonlar.tipler) if t == tip]
+        kriter_ortalamalari[tip] = {
+            kriter: (round(sum(kolon[i] for i in secili) / len(secili), 2) if secili else None)
+            for kriter, kolon in zip(KRITERLER, kolonlar.kriterler)
+        }
+
+    return {
+        "sunum_id": sunum.id,
+        "baslik": sunum.baslik,
+        "ekip": sunum.ekip.isim,
+        "ogretmen_notu": bilgi["ogretmen_notu"],
+        "ogrenci_ortalama": bilgi["ogrenci_ortalama"],
+        "final_notu": bilgi["final_notu"],
+        "ogrenci_degerlendirme_sayisi": bilgi["degerlendirme_sayisi"],
+        "agirliklar": {
+            "ogretmen_notu": a.ogretmen_notu_agirlik,
+            "ogrenci_notu": a.ogrenci_notu_agirlik,
+            **{kriter: getattr(a, f"{kriter}_agirlik") for kriter in KRITERLER},
+        },
+        "kriter_ortalamalari": kriter_ortalamalari,
+    }
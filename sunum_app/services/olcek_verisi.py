@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Sequence
+
+from sqlalchemy import func, insert, select
+
+from ..extensions import db
+from ..models import Degerlendirme, Ekip, Ogrenci, Ogretmen, Sunum
+from .icerik_surumleri import GENEL, surumleri_artir
+from .not_hesaplama import KRITERLER, NotHesaplamaServisi
+from .ogrenci_arama import fts_destekleniyor, indeks_satirlarini_yaz
+
+
+# Yazımlar bu boyutta executemany parçalarıyla yapılır.
+PARCA_BOYUTU = 5000
+
+_ADLAR = ("Ahmet", "Elif", "Mehmet", "Zeynep", "Mert", "Ayşe", "Can", "Ece", "Deniz", "Kaan")
+_SOYADLAR = ("Yılmaz", "Kaya", "Demir", "Çelik", "Aydın", "Şahin", "Koç", "Kurt", "Polat", "Taş")
+
+
+@dataclass
+class OlcekSonucu:
+    ekip: int = 0
+    ogrenci: int = 0
+    ogretmen: int = 0
+    sunum: int = 0
+    degerlendirme: int = 0
+
+
+def _parcalar(satirlar: Sequence[dict]) -> Iterator[Sequence[dict]]:
+    for i in range(0, len(satirlar), PARCA_BOYUTU):
+        yield satirlar[i : i + PARCA_BOYUTU]
+
+
+def _toplu_ekle(model, satirlar: Sequence[dict]) -> list[int]:
+    # executemany + RETURNING; id'ler satırların sırasıyla döner.
+    idler: list[int] = []
+    sorgu = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for parca in _parcalar(satirlar):
+        idler.extend(db.session.scalars(sorgu, parca).all())
+    return idler
+
+
+def _puan(rnd: random.Random) -> float:
+    return min(100.0, max(0.0, round(rnd.gauss(72, 15) * 4) / 4))
+
+
+def olcek_verisi_uret(
+    ekip_sayisi: int,
+    ogrenci_sayisi: int,
+    sunum_sayisi: int,
+    sunum_basina_degerlendirme: int,
+    ogretmen_sayisi: int = 3,
+    tohum: int = 1,
+) -> OlcekSonucu:
+    # Performans ölçümleri için sentetik veri: öğrenciler ekiplere sırayla
+    # dağıtılır, her sunumu kendi ekibi dışındaki öğrenciler değerlendirir
+    # ve her sunuma bir öğretmen notu verilir. Mevcut kayıtlara dokunulmaz.
+    rnd = random.Random(tohum)
+    sonuc = OlcekSonucu()
+    try:
+        etiket = db.session.execute(select(func.coalesce(func.max(Ekip.id), 0))).scalar() + 1
+        ekip_idleri = _toplu_ekle(
+            Ekip,
+            [{"isim": f"Ölçek Ekibi {etiket + i}", "aciklama": ""} for i in range(ekip_sayisi)],
+        )
+        sonuc.ekip = len(ekip_idleri)
+
+        ogrenci_satirlari = []
+        if ekip_idleri:
+            ilk_no = db.session.execute(select(func.coalesce(func.max(Ogrenci.id), 0))).scalar() + 1
+            ogrenci_satirlari = [
+                {
+                    "ad": rnd.choice(_ADLAR),
+                    "soyad": rnd.choice(_SOYADLAR),
+                    "numara": f"OLC{ilk_no + i:09d}",
+                    "ekip_id": ekip_idleri[i % len(ekip_idleri)],
+                }
+                for i in range(ogrenci_sayisi)
+            ]
+        ogrenci_idleri = _toplu_ekle(Ogrenci, ogrenci_satirlari)
+        sonuc.ogrenci = len(ogrenci_idleri)
+        if fts_destekleniyor():
+            conn = db.session.connection()
+            for parca in _parcalar(list(zip(ogrenci_idleri, ogrenci_satirlari))):
+                indeks_satirlarini_yaz(
+                    conn, [(i, s["ad"], s["soyad"], s["numara"]) for i, s in parca]
+                )
+
+        ogretmen_idleri = _toplu_ekle(
+            Ogretmen,
+            [
+                {"ad": rnd.choice(_ADLAR), "soyad": rnd.choice(_SOYADLAR), "unvan": "Dr."}
+                for _ in range(ogretmen_sayisi)
+            ],
+        )
+        sonuc.ogretmen = len(ogretmen_idleri)
+
+        baslangic = datetime(2024, 1, 1, 9, 0)
+        sunum_satirlari = []
+        if ekip_idleri:
+            sunum_satirlari = [
+                {
+                    "baslik": f"Ölçek Sunumu {i + 1}",
+                    "aciklama": "",
+                    "sunum_tarihi": baslangic + timedelta(minutes=20 * i),
+                    "ekip_id": ekip_idleri[i % len(ekip_idleri)],
+                }
+                for i in range(sunum_sayisi)
+            ]
+        sunum_idleri = _toplu_ekle(Sunum, sunum_satirlari)
+        sonuc.sunum = len(sunum_idleri)
+
+        ekip_by_ogrenci = dict(zip(ogrenci_idleri, (s["ekip_id"] for s in ogrenci_satirlari)))
+        # Kendi ekibinden seçilenler elendikten sonra yeterli öğrenci kalsın
+        # diye ekip büyüklüğü kadar fazla aday çekilir.
+        fazla = -(-len(ogrenci_idleri) // max(len(ekip_idleri), 1))
+        degerlendirmeler = []
+        for sunum_id, sunum in zip(sunum_idleri, sunum_satirlari):
+            adaylar = rnd.sample(
+                ogrenci_idleri, min(len(ogrenci_idleri), sunum_basina_degerlendirme + fazla)
+            )
+            secilenler = [o for o in adaylar if ekip_by_ogrenci[o] != sunum["ekip_id"]]
+            for ogrenci_id in secilenler[:sunum_basina_degerlendirme]:
+                degerlendirmeler.append(
+                    {
+                        "sunum_id": sunum_id,
+                        "degerlendiren_tipi": "ogrenci",
+                        "degerlendiren_ogrenci_id": ogrenci_id,
+                        "degerlendiren_ogretmen_id": None,
+                        **{kriter: _puan(rnd) for kriter in KRITERLER},
+                        "yorum": "",
+                    }
+                )
+            if ogretmen_idleri:
+                degerlendirmeler.append(
+                    {
+                        "sunum_id": sunum_id,
+                        "degerlendiren_tipi": "ogretmen",
+                        "degerlendiren_ogrenci_id": None,
+                        "degerlendiren_ogretmen_id": rnd.choice(ogretmen_idleri),
+                        **{kriter: _puan(rnd) for kriter in KRITERLER},
+                        "yorum": "",
+                    }
+                )
+        for parca in _parcalar(degerlendirmeler):
+            db.session.execute(insert(Degerlendirme), parca)
+        sonuc.degerlendirme = len(degerlendirmeler)
+
+        # Toplu yazımlar ORM event'lerini tetiklemez; özetler ve sayfa
+        # sürümleri burada güncellenir.
+        NotHesaplamaServisi().ozetleri_guncelle(sunum_idleri)
+        surumleri_artir(db.session, {GENEL})
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return sonuc
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..models import Degerlendirme, Ekip, Ogrenci, Ogretmen, Sunum
+
+
+@dataclass(frozen=True)
+class PanelSayaclari:
+    ekip: int
+    ogrenci: int
+    ogretmen: int
+    sunum: int
+    degerlendirme: int
+
+
+def _sayim(model):
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+def panel_sayaclari() -> PanelSayaclari:
+    # Admin panelindeki tüm sayaçlar tek bir SELECT ile okunur.
+    row = db.session.execute(
+        select(
+            _sayim(Ekip),
+            _sayim(Ogrenci),
+            _sayim(Ogretmen),
+            _sayim(Sunum),
+            _sayim(Degerlendirme),
+        )
+    ).one()
+    return PanelSayaclari(*row)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+from flask import Flask, Response, current_app, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+
+from .icerik_surumleri import GENEL, surum_imzasi, surumler
+
+
+# app.config üzerinden değiştirilebilir. SAYFA_ONBELLEGI_PAYLASIMLI True ise
+# instance klasöründeki sayfa_onbellegi.db, metin ise verilen dosya kullanılır.
+VARSAYILAN_AYARLAR = {
+    "SAYFA_ONBELLEGI": True,
+    "SAYFA_ONBELLEGI_BOYUTU": 256,
+    "SAYFA_ONBELLEGI_TTL": 300,
+    "SAYFA_ONBELLEGI_PAYLASIMLI": False,
+}
+
+
+class LRUOnbellek:
+    # Süreç içi, boyutu sınırlı ve girdileri TTL ile düşen önbellek.
+
+    def __init__(self, boyut: int, ttl: float):
+        self._boyut = boyut
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._girdiler: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, anahtar: str) -> Optional[str]:
+        with self._lock:
+            girdi = self._girdiler.get(anahtar)
+            if girdi is None:
+                return None
+            son_kullanma, deger = girdi
+            if son_kullanma < time.monotonic():
+                del self._girdiler[anahtar]
+                return None
+            self._girdiler.move_to_end(anahtar)
+            return deger
+
+    def set(self, anahtar: str, deger: str) -> None:
+        with self._lock:
+            self._girdiler[anahtar] = (time.monotonic() + self._ttl, deger)
+            self._girdiler.move_to_end(anahtar)
+            while len(self._girdiler) > self._boyut:
+                self._girdiler.popitem(last=False)
+
+
+class SqliteOnbellek:
+    # Aynı makinedeki gunicorn worker'larının paylaştığı, ayrı bir SQLite
+    # dosyasında tutulan önbellek. Her thread kendi bağlantısını kullanır.
+
+    _TEMIZLEME_ARALIGI = 100
+
+    def __init__(self, yol: Path, ttl: float):
+        self._yol = Path(yol)
+        self._ttl = ttl
+        self._yerel = threading.local()
+        self._yazma_sayisi = 0
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            self._yol.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._yol, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sayfa ("
+                "anahtar TEXT PRIMARY KEY, deger TEXT NOT NULL, son_kullanma REAL NOT NULL)"
+            )
+            self._yerel.conn = conn
+        return conn
+
+    def get(self, anahtar: str) -> Optional[str]:
+        satir = self._baglanti().execute(
+            "SELECT deger FROM sayfa WHERE anahtar = ? AND son_kullanma > ?",
+            (anahtar, time.time()),
+        ).fetchone()
+        return satir[0] if satir else None
+
+    def set(self, anahtar: str, deger: str) -> None:
+        conn = self._baglanti()
+        conn.execute(
+            "INSERT OR REPLACE INTO sayfa (anahtar, deger, son_kullanma) VALUES (?, ?, ?)",
+            (anahtar, deger, time.time() + self._ttl),
+        )
+        # Eski sürümlere ait girdiler bir daha okunmaz; ara sıra silinir.
+        self._yazma_sayisi += 1
+        if self._yazma_sayisi % self._TEMIZLEME_ARALIGI == 0:
+            conn.execute("DELETE FROM sayfa WHERE son_kullanma <= ?", (time.time(),))
+
+
+class SayfaOnbellegi:
+    # Render edilmiş sayfaları sürümlü anahtarlarla saklar. Anahtar, sayfanın
+    # bağlı olduğu içerik sürümlerini içerdiğinden bir yazma işleminden sonra
+    # yalnızca etkilenen sayfaların anahtarı değişir; eski girdiler TTL ile düşer.
+
+    def __init__(self, yerel: LRUOnbellek, paylasimli: Optional[SqliteOnbellek] = None):
+        self._yerel = yerel
+        self._paylasimli = paylasimli
+
+    @property
+    def paylasimli(self) -> bool:
+        return self._paylasimli is not None
+
+    def get(self, anahtar: str) -> Optional[str]:
+        deger = self._yerel.get(anahtar)
+        if deger is None and self._paylasimli is not None:
+            deger = self._paylasimli.get(anahtar)
+            if deger is not None:
+                self._yerel.set(anahtar, deger)
+        return deger
+
+    def set(self, anahtar: str, deger: str) -> None:
+        self._yerel.set(anahtar, deger)
+        if self._paylasimli is not None:
+            self._paylasimli.set(anahtar, deger)
+
+
+def sayfa_onbellegi_olustur(app: Flask) -> Optional[SayfaOnbellegi]:
+    for anahtar, deger in VARSAYILAN_AYARLAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    if not app.config["SAYFA_ONBELLEGI"]:
+        return None
+
+    ttl = app.config["SAYFA_ONBELLEGI_TTL"]
+    yerel = LRUOnbellek(app.config["SAYFA_ONBELLEGI_BOYUTU"], ttl)
+
+    paylasimli = None
+    yol = app.config["SAYFA_ONBELLEGI_PAYLASIMLI"]
+    if yol:
+        if yol is True:
+            yol = Path(app.instance_path) / "sayfa_onbellegi.db"
+        paylasimli = SqliteOnbellek(yol, ttl)
+
+    return SayfaOnbellegi(yerel, paylasimli)
+
+
+def _kullanici_varyanti() -> str:
+    # Şablonlar yalnızca giriş ve admin durumuna göre farklılaşır.
+    if not current_user.is_authenticated:
+        return "anonim"
+    return "admin" if current_user.is_admin else "kullanici"
+
+
+def sayfa_dogrulayicilari(
+    sayfa: str, varyant: str, anahtarlar: tuple[str, ...], mevcut: dict
+) -> tuple[str, str]:
+    # Önbellek anahtarı ve ETag yalnızca sürüm sayaçlarından üretilir; ASGI
+    # modundaki asenkron yol da aynı değerleri kullanır. Last-Modified
+    # gönderilmez: saniye çözünürlüklüdür ve giriş varyantını taşımaz, bu
+    # yüzden yalnızca If-Modified-Since gönderen bir istemci başka bir
+    # varyantın ya da aynı saniyedeki eski bir içeriğin 304'ünü alabilirdi.
+    anahtar = f"{sayfa}|{varyant}|{surum_imzasi(mevcut, anahtarlar)}"
+    etag = hashlib.sha1(anahtar.encode()).hexdigest()[:20]
+    return anahtar, etag
+
+
+def onbellekli_sayfa(
+    sayfa: str, surum_anahtarlari: tuple[str, ...], olustur: Callable[[], str]
+) -> Response:
+    # Bekleyen flash mesajları sayfaya gömülür; bu istekler önbelleğe girmez
+    # ve doğrulayıcı (ETag) almaz.
+    if session.get("_flashes"):
+        return make_response(olustur())
+
+    anahtarlar = (GENEL, *surum_anahtarlari)
+    anahtar, etag = sayfa_dogrulayicilari(
+        sayfa, _kullanici_varyanti(), anahtarlar, surumler(*anahtarlar)
+    )
+
+    # ETag yalnızca sürüm sayaçlarından üretildiği için istemcinin kopyası
+    # güncelse not hesaplama ve şablon adımları hiç çalışmaz.
+    if not is_resource_modified(request.environ, etag=etag):
+        yanit = Response(status=304)
+    else:
+        yanit = make_response(_sayfa_html(anahtar, olustur))
+    return dogrulayicilari_ekle(yanit, etag)
+
+
+def dogrulayicilari_ekle(yanit: Response, etag: str) -> Response:
+    yanit.set_etag(etag)
+    # Tarayıcı her seferinde doğrulasın; içerik giriş durumuna göre değişir.
+    yanit.cache_control.no_cache = True
+    yanit.vary.add("Cookie")
+    return yanit
+
+
+def _sayfa_html(anahtar: str, olustur: Callable[[], str]) -> str:
+    onbellek: Optional[SayfaOnbellegi] = current_app.extensions.get("sayfa_onbellegi")
+    if onbellek is None:
+        return olustur()
+
+    html = onbellek.get(anahtar)
+    if html is None:
+        html = olustur()
+        onbellek.set(anahtar, html)
+    return html
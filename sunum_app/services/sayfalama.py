@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Callable, Optional
+
+
+@dataclass
+class KeysetSayfa:
+    items: list
+    per_page: int
+    total: Optional[int]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def cursor_olustur(anahtar: int, yon: str, total: Optional[int]) -> str:
+    veri = json.dumps({"k": anahtar, "y": yon, "t": total}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(veri.encode()).decode().rstrip("=")
+
+
+def cursor_coz(cursor: Optional[str]) -> Optional[dict]:
+    if not cursor:
+        return None
+    try:
+        dolgu = "=" * (-len(cursor) % 4)
+        veri = json.loads(base64.urlsafe_b64decode(cursor + dolgu))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    if (
+        not isinstance(veri, dict)
+        or not isinstance(veri.get("k"), int)
+        or veri.get("y") not in ("n", "p")
+    ):
+        return None
+    if not isinstance(veri.get("t"), int):
+        veri["t"] = None
+    return veri
+
+
+def per_page_coz(deger, varsayilan: int) -> int:
+    try:
+        per_page = int(deger if deger is not None else varsayilan)
+    except (TypeError, ValueError):
+        per_page = varsayilan
+
+    if per_page not in (10, 25, 50, 100):
+        per_page = varsayilan
+
+    return per_page
+
+
+def keyset_sorgusu(query, kolon, konum: Optional[dict], azalan: bool = False):
+    # ORM Query ve select() için ortak: filter/order_by ikisinde de vardır.
+    geri = konum is not None and konum["y"] == "p"
+    # Geri giderken sıralama ters çevrilir, sonuç sonra düzeltilir.
+    ters_sira = azalan != geri
+
+    if konum is not None:
+        anahtar = konum["k"]
+        query = query.filter(kolon < anahtar if ters_sira else kolon > anahtar)
+
+    return query.order_by(kolon.desc() if ters_sira else kolon.asc())
+
+
+def keyset_sayfasi(
+    satirlar: list, kolon, per_page: int, konum: Optional[dict], total: Optional[int]
+) -> KeysetSayfa:
+    # satirlar, keyset_sorgusu'nun LIMIT per_page + 1 ile okunmuş sonucudur.
+    geri = konum is not None and konum["y"] == "p"
+    fazla_var = len(satirlar) > per_page
+    items = satirlar[:per_page]
+
+    if geri:
+        items.reverse()
+        has_prev, has_next = fazla_var, True
+    else:
+        has_prev, has_next = konum is not None, fazla_var
+
+    anahtar_al = attrgetter(kolon.key)
+    next_cursor = (
+        cursor_olustur(anahtar_al(items[-1]), "n", total) if has_next and items else None
+    )
+    prev_cursor = (
+        cursor_olustur(anahtar_al(items[0]), "p", total) if has_prev and items else None
+    )
+
+    return KeysetSayfa(
+        items=items,
+        per_page=per_page,
+        total=total,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+def keyset_sayfala(
+    query,
+    kolon,
+    per_page: int,
+    cursor: Optional[str] = None,
+    azalan: bool = False,
+    total: Optional[int] = None,
+    total_hesapla: Optional[Callable[[], int]] = None,
+) -> KeysetSayfa:
+    # OFFSET yerine son görülen anahtardan devam edilir (seek pagination);
+    # her sayfa index üzerinden "kolon > anahtar LIMIT n" kadar iş yapar.
+    # Toplam yalnızca ilk sayfada hesaplanır ve cursor içinde taşınır.
+    konum = cursor_coz(cursor)
+
+    if total is None and konum is not None:
+        total = konum["t"]
+    if total is None and konum is None and total_hesapla is not None:
+        total = total_hesapla()
+
+    query = keyset_sorgusu(query, kolon, konum, azalan)
+    satirlar = query.limit(per_page + 1).all()
+    return keyset_sayfasi(satirlar, kolon, per_page, konum, total)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import Degerlendirme, Ogrenci, Ogretmen, Sunum
+from .not_hesaplama import KRITERLER, NotHesaplamaServisi
+
+
+EKLENDI = "eklendi"
+CAKISMA = "cakisma"
+HATA = "hata"
+
+
+@dataclass
+class SatirSonucu:
+    index: int
+    durum: str
+    mesaj: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        veri: dict[str, Any] = {"index": self.index, "durum": self.durum}
+        if self.mesaj:
+            veri["mesaj"] = self.mesaj
+        return veri
+
+
+@dataclass
+class _Aday:
+    index: int
+    sunum_id: int
+    tip: str
+    degerlendiren_id: int
+    puanlar: dict[str, float]
+    yorum: str = ""
+
+
+@dataclass
+class TopluSonuc:
+    sonuclar: list[SatirSonucu]
+
+    @property
+    def eklenen(self) -> int:
+        return sum(1 for s in self.sonuclar if s.durum == EKLENDI)
+
+    def to_dict(self) -> dict:
+        return {
+            "eklenen": self.eklenen,
+            "sonuclar": [s.to_dict() for s in sorted(self.sonuclar, key=lambda s: s.index)],
+        }
+
+
+def _int(deger) -> Optional[int]:
+    if isinstance(deger, bool):
+        return None
+    try:
+        return int(deger)
+    except (TypeError, ValueError):
+        return None
+
+
+def _puan(deger) -> Optional[float]:
+    if isinstance(deger, bool):
+        return None
+    try:
+        puan = float(deger)
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= puan <= 100:
+        return None
+    return puan
+
+
+class TopluDegerlendirmeServisi:
+    # Bir JSON yükündeki çok sayıda değerlendirmeyi tek transaction'da
+    # kaydeder. Doğrulamalar satır başına değil küme bazlı sorgularla yapılır:
+    # sunumlar, öğrenciler, öğretmenler ve mevcut değerlendirmeler birer
+    # IN sorgusuyla okunur, eklemeler tek bir executemany ile yapılır.
+
+    MAKS_SATIR = 500
+    _DENEME_SAYISI = 2
+
+    def kaydet(self, satirlar: list) -> TopluSonuc:
+        adaylar, hatalar = self._ayristir(satirlar)
+
+        for _ in range(self._DENEME_SAYISI):
+            gecerli, reddedilenler = self._dogrula(adaylar)
+            try:
+                self._ekle(gecerli)
+                db.session.commit()
+            except IntegrityError:
+                # Aynı anda başka bir istek aynı değerlendirmeyi eklediyse
+                # çakışmalar yeniden hesaplanıp bir kez daha denenir.
+                db.session.rollback()
+                continue
+            return TopluSonuc(
+                hatalar + reddedilenler + [SatirSonucu(a.index, EKLENDI) for a in gecerli]
+            )
+
+        # Denemeler tükendiyse son doğrulamanın hataları korunur; yalnızca
+        # geçerli bulunan satırlar çakışma olarak işaretlenir.
+        return TopluSonuc(
+            hatalar
+            + reddedilenler
+            + [
+                SatirSonucu(a.index, CAKISMA, "Eşzamanlı kayıt nedeniyle eklenemedi.")
+                for a in gecerli
+            ]
+        )
+
+    def _ayristir(self, satirlar: list) -> tuple[list[_Aday], list[SatirSonucu]]:
+        adaylar: list[_Aday] = []
+        hatalar: list[SatirSonucu] = []
+
+        for index, satir in enumerate(satirlar):
+            if not isinstance(satir, dict):
+                hatalar.append(SatirSonucu(index, HATA, "Geçersiz satır."))
+                continue
+
+            sunum_id = _int(satir.get("sunum_id"))
+            tip = satir.get("degerlendiren_tipi")
+            if tip == "ogrenci":
+                degerlendiren_id = _int(satir.get("degerlendiren_ogrenci_id"))
+            elif tip == "ogretmen":
+                degerlendiren_id = _int(satir.get("degerlendiren_ogretmen_id"))
+            else:
+                hatalar.append(SatirSonucu(index, HATA, "Geçersiz değerlendiren tipi."))
+                continue
+
+            puanlar = {kriter: _puan(satir.get(kriter)) for kriter in KRITERLER}
+            if sunum_id is None or degerlendiren_id is None:
+                hatalar.append(SatirSonucu(index, HATA, "Sunum veya değerlendiren eksik."))
+                continue
+            if any(puan is None for puan in puanlar.values()):
+                hatalar.append(SatirSonucu(index, HATA, "Puanlar 0-100 arasında olmalıdır."))
+                continue
+
+            adaylar.append(
+                _Aday(
+                    index=index,
+                    sunum_id=sunum_id,
+                    tip=tip,
+                    degerlendiren_id=degerlendiren_id,
+                    puanlar=puanlar,
+                    yorum=str(satir.get("yorum") or ""),
+                )
+            )
+
+        return adaylar, hatalar
+
+    def _dogrula(self, adaylar: list[_Aday]) -> tuple[list[_Aday], list[SatirSonucu]]:
+        if not adaylar:
+            return [], []
+
+        sunum_idleri = {a.sunum_id for a in adaylar}
+        ogrenci_idleri = {a.degerlendiren_id for a in adaylar if a.tip == "ogrenci"}
+        ogretmen_idleri = {a.degerlendiren_id for a in adaylar if a.tip == "ogretmen"}
+
+        sunum_ekipleri = dict(
+            db.session.query(Sunum.id, Sunum.ekip_id).filter(Sunum.id.in_(sunum_idleri)).all()
+        )
+        ogrenci_ekipleri = (
+            dict(
+                db.session.query(Ogrenci.id, Ogrenci.ekip_id)
+                .filter(Ogrenci.id.in_(ogrenci_idleri))
+                .all()
+            )
+            if ogrenci_idleri
+            else {}
+        )
+        mevcut_ogretmenler = (
+            {
+                row[0]
+                for row in db.session.query(Ogretmen.id)
+                .filter(Ogretmen.id.in_(ogretmen_idleri))
+                .all()
+            }
+            if ogretmen_idleri
+            else set()
+        )
+        mevcut = self._mevcut_degerlendirmeler(adaylar)
+
+        gecerli: list[_Aday] = []
+        reddedilenler: list[SatirSonucu] = []
+        for aday in adaylar:
+            anahtar = (aday.tip, aday.sunum_id, aday.degerlendiren_id)
+            if aday.sunum_id not in sunum_ekipleri:
+                reddedilenler.append(SatirSonucu(aday.index, HATA, "Sunum bulunamadı."))
+            elif aday.tip == "ogrenci" and aday.degerlendiren_id not in ogrenci_ekipleri:
+                reddedilenler.append(SatirSonucu(aday.index, HATA, "Öğrenci bulunamadı."))
+            elif aday.tip == "ogretmen" and aday.degerlendiren_id not in mevcut_ogretmenler:
+                reddedilenler.append(SatirSonucu(aday.index, HATA, "Öğretmen bulunamadı."))
+            elif (
+                aday.tip == "ogrenci"
+                and ogrenci_ekipleri[aday.degerlendiren_id] == sunum_ekipleri[aday.sunum_id]
+            ):
+                reddedilenler.append(
+                    SatirSonucu(aday.index, HATA, "Ekipler kendi sunumlarına puan veremez!")
+                )
+            elif anahtar in mevcut:
+                reddedilenler.append(
+                    SatirSonucu(aday.index, CAKISMA, "Bu sunum zaten değerlendirildi.")
+                )
+            else:
+                # Aynı yük içindeki tekrarlar da çakışma sayılır.
+                mevcut.add(anahtar)
+                gecerli.append(aday)
+
+        return gecerli, reddedilenler
+
+    def _mevcut_degerlendirmeler(self, adaylar: list[_Aday]) -> set[tuple[str, int, int]]:
+        mevcut: set[tuple[str, int, int]] = set()
+        for tip, kolon in (
+            ("ogrenci", Degerlendirme.degerlendiren_ogrenci_id),
+            ("ogretmen", Degerlendirme.degerlendiren_ogretmen_id),
+        ):
+            ciftler = {(a.sunum_id, a.degerlendiren_id) for a in adaylar if a.tip == tip}
+            if not ciftler:
+                continue
+            rows = (
+                db.session.query(Degerlendirme.sunum_id, kolon)
+                .filter(tuple_(Degerlendirme.sunum_id, kolon).in_(ciftler))
+                .all()
+            )
+            mevcut.update((tip, sunum_id, degerlendiren_id) for sunum_id, degerlendiren_id in rows)
+        return mevcut
+
+    def _ekle(self, gecerli: list[_Aday]) -> None:
+        if not gecerli:
+            return
+
+        db.session.execute(
+            insert(Degerlendirme),
+            [
+                {
+                    "sunum_id": a.sunum_id,
+                    "degerlendiren_tipi": a.tip,
+                    "degerlendiren_ogrenci_id": a.degerlendiren_id if a.tip == "ogrenci" else None,
+                    "degerlendiren_ogretmen_id": a.degerlendiren_id if a.tip == "ogretmen" else None,
+                    "yorum": a.yorum,
+                    **a.puanlar,
+                }
+                for a in gecerli
+            ],
+        )
+        NotHesaplamaServisi().ozetleri_guncelle(a.sunum_id for a in gecerli)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .extensions import db
+
+
+# Her yeni SQLite bağlantısında çalıştırılan PRAGMA'lar. Değerler app.config
+# üzerinden değiştirilebilir; None verilen PRAGMA atlanır.
+VARSAYILAN_PRAGMALAR = {
+    "SQLITE_JOURNAL_MODE": "WAL",
+    "SQLITE_BUSY_TIMEOUT_MS": 5000,
+    "SQLITE_SYNCHRONOUS": "NORMAL",
+    # Negatif değer KiB cinsindendir (~64 MB).
+    "SQLITE_CACHE_SIZE": -64000,
+    "SQLITE_MMAP_SIZE": 256 * 1024 * 1024,
+    "SQLITE_TEMP_STORE": "MEMORY",
+}
+
+_PRAGMA_ADLARI = {
+    "SQLITE_JOURNAL_MODE": "journal_mode",
+    "SQLITE_BUSY_TIMEOUT_MS": "busy_timeout",
+    "SQLITE_SYNCHRONOUS": "synchronous",
+    "SQLITE_CACHE_SIZE": "cache_size",
+    "SQLITE_MMAP_SIZE": "mmap_size",
+    "SQLITE_TEMP_STORE": "temp_store",
+}
+
+
+def _pragma_komutlari(app: Flask) -> list[str]:
+    komutlar = []
+    for anahtar, pragma in _PRAGMA_ADLARI.items():
+        deger = app.config.get(anahtar)
+        if deger is None:
+            continue
+        if isinstance(deger, str) and not deger.isalnum():
+            raise ValueError(f"Geçersiz {anahtar} değeri: {deger!r}")
+        komutlar.append(f"PRAGMA {pragma}={deger}")
+    return komutlar
+
+
+def sqlite_pragmalarini_kur(app: Flask, engine: Optional[Engine] = None) -> None:
+    # engine verilmezse Flask-SQLAlchemy'nin engine'i kullanılır; ASGI modu
+    # asenkron engine'in sync_engine'ini verir.
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if not uri or not str(uri).startswith("sqlite"):
+        return
+
+    for anahtar, deger in VARSAYILAN_PRAGMALAR.items():
+        app.config.setdefault(anahtar, deger)
+
+    komutlar = _pragma_komutlari(app)
+    if not komutlar:
+        return
+
+    def _baglanti_acildi(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for komut in komutlar:
+                cursor.execute(komut)
+        finally:
+            cursor.close()
+
+    if engine is not None:
+        event.listen(engine, "connect", _baglanti_acildi)
+        return
+
+    with app.app_context():
+        event.listen(db.engine, "connect", _baglanti_acildi)
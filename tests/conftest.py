@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from sunum_app import create_app
+from sunum_app.extensions import db
+from sunum_app.services.olcek_verisi import olcek_verisi_uret
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.db"),
+            "TESTING": True,
+        }
+    )
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def olcek_verisi(app):
+    # Küçük ölçekli sentetik veri: 5 ekip, 40 öğrenci, 10 sunum.
+    with app.app_context():
+        return olcek_verisi_uret(5, 40, 10, 8)
+
+
+def giris_yap(client, kullanici_adi: str = "admin", sifre: str = "admin123"):
+    return client.post("/login", data={"username": kullanici_adi, "password": sifre})
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from sunum_app.extensions import db
+from sunum_app.services.olcek_verisi import olcek_verisi_uret
+
+from .conftest import giris_yap
+
+
+# Sayfa başına çalıştırılan SQL ifadesi üst sınırları. Sayılar veri
+# boyutundan bağımsız olmalıdır; artış N+1 sorgusunun geri döndüğünü gösterir.
+SORGU_SINIRLARI = {
+    "/": 3,
+    "/admin": 8,
+}
+
+
+@contextmanager
+def sorgu_sayaci(app):
+    sayilar = []
+    with app.app_context():
+        engine = db.engine
+
+    def say(*args, **kwargs):
+        sayilar.append(1)
+
+    event.listen(engine, "before_cursor_execute", say)
+    try:
+        yield sayilar
+    finally:
+        event.remove(engine, "before_cursor_execute", say)
+
+
+@pytest.mark.parametrize("adres", sorted(SORGU_SINIRLARI))
+def test_sayfa_sorgu_sayisi_veriyle_buyumez(app, client, olcek_verisi, adres):
+    giris_yap(client)
+
+    sayimlar = []
+    for _ in range(2):
+        # Ek veri içerik sürümünü değiştirir; sayfa önbellekten dönmez.
+        with sorgu_sayaci(app) as sayilar:
+            assert client.get(adres).status_code == 200
+        sayimlar.append(len(sayilar))
+        with app.app_context():
+            olcek_verisi_uret(5, 120, 30, 12, tohum=2)
+
+    assert max(sayimlar) <= SORGU_SINIRLARI[adres], sayimlar
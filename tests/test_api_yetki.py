@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from sunum_app.extensions import db
+from sunum_app.models import Sunum, User
+
+from .conftest import giris_yap
+
+OKUMA_ADRESLERI = ("/api/sunumlar", "/api/sunumlar/{sunum_id}", "/api/degerlendirmeler")
+TOPLU_ADRES = "/api/degerlendirmeler/toplu"
+
+
+@pytest.fixture
+def sunum_id(app, olcek_verisi):
+    with app.app_context():
+        kullanici = User(username="izleyici", email="izleyici@example.com", is_admin=False)
+        kullanici.set_password("izleyici123")
+        db.session.add(kullanici)
+        db.session.commit()
+        return Sunum.query.first().id
+
+
+def _istekler(client, sunum_id):
+    for adres in OKUMA_ADRESLERI:
+        yield client.get(adres.format(sunum_id=sunum_id))
+    yield client.post(TOPLU_ADRES, json={"degerlendirmeler": [{}]})
+
+
+def test_anonim_istek_girise_yonlendirilir(client, sunum_id):
+    for yanit in _istekler(client, sunum_id):
+        assert yanit.status_code == 302
+        assert "/login" in yanit.headers["Location"]
+
+
+def test_admin_olmayan_kullanici_403_alir(client, sunum_id):
+    giris_yap(client, kullanici_adi="izleyici", sifre="izleyici123")
+    for yanit in _istekler(client, sunum_id):
+        assert yanit.status_code == 403
+        assert yanit.get_json() == {"hata": "Bu işlem için yetkiniz yok."}
+
+
+def test_admin_api_uclarini_kullanabilir(client, sunum_id):
+    giris_yap(client)
+    for yanit in _istekler(client, sunum_id):
+        assert yanit.status_code == 200
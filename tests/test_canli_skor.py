@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+
+from sunum_app.models import Sunum
+from sunum_app.services.not_hesaplama import NotHesaplamaServisi
+
+
+def test_akis_kotasi_dolunca_503_ve_retry_doner(app, client, olcek_verisi):
+    yayin = app.extensions["skor_yayini"]
+    yayin.azami_akis = 1
+    with app.app_context():
+        sunum_id = Sunum.query.first().id
+    adres = f"/sunum/{sunum_id}/canli"
+
+    acik = client.get(adres, buffered=False)
+    assert acik.status_code == 200
+    assert next(acik.response).startswith(b"retry:")
+
+    dolu = client.get(adres)
+    assert dolu.status_code == 503
+    assert dolu.headers["Retry-After"] == str(yayin.akis_suresi)
+    assert dolu.get_data(as_text=True).startswith("retry: ")
+
+    # Kapanan akış yerini bırakır.
+    acik.close()
+    yeni = client.get(adres, buffered=False)
+    assert yeni.status_code == 200
+    yeni.close()
+
+
+def test_skor_hesaplanirken_akis_kilidi_bos_ve_hesap_tek_sefer_yapilir(app, olcek_verisi, monkeypatch):
+    yayin = app.extensions["skor_yayini"]
+    with app.app_context():
+        sunum_id = Sunum.query.first().id
+
+    basladi, birak = threading.Event(), threading.Event()
+    cagrilar = []
+    asil = NotHesaplamaServisi.ozetten_final_notlari
+
+    def yavas(self, sunumlar):
+        cagrilar.append(1)
+        basladi.set()
+        assert birak.wait(5)
+        return asil(self, sunumlar)
+
+    monkeypatch.setattr(NotHesaplamaServisi, "ozetten_final_notlari", yavas)
+
+    sonuclar = []
+
+    def hesapla():
+        with app.app_context():
+            sonuclar.append(yayin.skor(sunum_id, "imza-1"))
+
+    izleyiciler = [threading.Thread(target=hesapla) for _ in range(3)]
+    izleyiciler[0].start()
+    assert basladi.wait(5)
+    for izleyici in izleyiciler[1:]:
+        izleyici.start()
+
+    # Hesaplama sürerken akış kotası beklemeden ayrılıp bırakılabilir.
+    assert yayin.akis_ayir()
+    yayin.akis_birak()
+
+    birak.set()
+    for izleyici in izleyiciler:
+        izleyici.join(5)
+
+    assert len(cagrilar) == 1
+    assert len(sonuclar) == 3
+    assert sonuclar[0]["sunum_id"] == sunum_id
+    assert all(sonuc == sonuclar[0] for sonuc in sonuclar)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import csv
+import io
+
+import pytest
+
+from sunum_app.extensions import db
+from sunum_app.models import Degerlendirme
+from sunum_app.services.disa_aktarim import csv_akisi
+
+from .conftest import giris_yap
+
+
+def _oku(parcalar) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(b"".join(parcalar).decode("utf-8-sig"))))
+
+
+@pytest.mark.parametrize(
+    "deger, beklenen",
+    [
+        ("=HYPERLINK(\"http://x\")", "'=HYPERLINK(\"http://x\")"),
+        ("+1+2", "'+1+2"),
+        ("-2+3", "'-2+3"),
+        ("@SUM(A1)", "'@SUM(A1)"),
+        ("\tgizli", "'\tgizli"),
+        ("\rgizli", "'\rgizli"),
+        ("Güzel sunum - tebrikler", "Güzel sunum - tebrikler"),
+    ],
+)
+def test_formul_baslangicli_metin_hucreleri_kacirilir(deger, beklenen):
+    assert _oku(csv_akisi([("yorum",), (deger,)]))[1] == [beklenen]
+
+
+def test_sayisal_hucreler_degismez():
+    assert _oku(csv_akisi([(-5, 12.5, 0)]))[0] == ["-5", "12.5", "0"]
+
+
+def test_degerlendirme_disa_aktarimi_yorumu_kacirir(app, client, olcek_verisi):
+    with app.app_context():
+        degerlendirme = Degerlendirme.query.order_by(Degerlendirme.id).first()
+        degerlendirme.yorum = "=cmd|' /C calc'!A0"
+        db.session.commit()
+
+    giris_yap(client)
+    yanit = client.get("/admin/disa-aktar?tur=degerlendirmeler&bicim=csv")
+
+    assert yanit.status_code == 200
+    baslik, ilk = _oku([yanit.data])[:2]
+    assert ilk[baslik.index("yorum")] == "'=cmd|' /C calc'!A0"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import pytest
+
+from sunum_app import create_app
+from sunum_app.extensions import db
+from sunum_app.models import User
+
+from .conftest import giris_yap
+
+
+@pytest.fixture
+def sinirli_app(tmp_path):
+    def olustur(**ayarlar):
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.db"),
+                "TESTING": True,
+                "GIRIS_SINIRI_IP": (3, 1),
+                "GIRIS_SINIRI_KULLANICI": (2, 1),
+                **ayarlar,
+            }
+        )
+        olusturulanlar.append(app)
+        return app
+
+    olusturulanlar = []
+    yield olustur
+    for app in olusturulanlar:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def hash_sayaci(monkeypatch):
+    sayac = []
+    asil = User.check_password
+
+    def say(self, password):
+        sayac.append(1)
+        return asil(self, password)
+
+    monkeypatch.setattr(User, "check_password", say)
+    return sayac
+
+
+def test_kullanici_kovasi_bosken_hash_hesaplanmadan_429_doner(sinirli_app, hash_sayaci):
+    client = sinirli_app(GIRIS_SINIRI_IP=(50, 10)).test_client()
+
+    for _ in range(2):
+        assert giris_yap(client, sifre="yanlis").status_code == 200
+    assert len(hash_sayaci) == 2
+
+    for sifre in ("yanlis", "admin123"):
+        yanit = giris_yap(client, sifre=sifre)
+        assert yanit.status_code == 429
+        assert int(yanit.headers["Retry-After"]) > 0
+    assert len(hash_sayaci) == 2
+
+
+def test_kilitli_kullanici_baska_adresten_girebilir(sinirli_app):
+    client = sinirli_app(GIRIS_SINIRI_IP=(50, 10)).test_client()
+
+    def dene(ip, sifre):
+        return client.post(
+            "/login",
+            data={"username": "admin", "password": sifre},
+            environ_overrides={"REMOTE_ADDR": ip},
+        )
+
+    for _ in range(3):
+        dene("203.0.113.1", "yanlis")
+    assert dene("203.0.113.1", "admin123").status_code == 429
+
+    yanit = dene("203.0.113.2", "admin123")
+    assert yanit.status_code == 302
+    assert yanit.headers["Location"].endswith("/admin")
+
+
+def test_ip_kovasi_sifre_denetiminden_once_engeller(sinirli_app):
+    client = sinirli_app().test_client()
+
+    for son in range(3):
+        giris_yap(client, kullanici_adi=f"yok-{son}", sifre="yanlis")
+    assert giris_yap(client).status_code == 429
+
+
+def test_proxy_arkasinda_istemciler_ayri_ip_kovasi_kullanir(sinirli_app):
+    client = sinirli_app(PROXY_SAYISI=1, GIRIS_SINIRI_KULLANICI=(50, 10)).test_client()
+
+    def dene(ip):
+        return client.post(
+            "/login",
+            data={"username": "yok", "password": "yanlis"},
+            headers={"X-Forwarded-For": ip},
+        )
+
+    for _ in range(3):
+        dene("203.0.113.1")
+    assert dene("203.0.113.1").status_code == 429
+    assert dene("203.0.113.2").status_code == 200
+
+
+def test_proxy_sayisi_sifirken_x_forwarded_for_okunmaz(sinirli_app):
+    client = sinirli_app().test_client()
+
+    for son in range(3):
+        client.post(
+            "/login",
+            data={"username": f"yok-{son}", "password": "yanlis"},
+            headers={"X-Forwarded-For": f"203.0.113.{son}"},
+        )
+    assert giris_yap(client).status_code == 429
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from sunum_app import create_app
+from sunum_app.extensions import db
+
+from .conftest import giris_yap
+
+UZAK = {"REMOTE_ADDR": "203.0.113.9"}
+
+
+@pytest.fixture
+def olcumlu_app(tmp_path):
+    def olustur(**ayarlar):
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.db"),
+                "TESTING": True,
+                "ISTEK_OLCUMU": True,
+                **ayarlar,
+            }
+        )
+        olusturulanlar.append(app)
+        return app
+
+    olusturulanlar = []
+    yield olustur
+    for app in olusturulanlar:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def test_metrics_yerel_adrese_acik_uzak_adrese_kapali(olcumlu_app):
+    client = olcumlu_app().test_client()
+    client.get("/")
+
+    yanit = client.get("/metrics")
+    assert yanit.status_code == 200
+    assert yanit.content_type.startswith("text/plain")
+    assert client.get("/metrics", environ_overrides=UZAK).status_code == 403
+
+
+def test_metrics_uzak_adresten_admin_girisiyle_acilir(olcumlu_app):
+    client = olcumlu_app(ISTEK_OLCUMU_METRICS_ADRESLERI=()).test_client()
+    assert client.get("/metrics").status_code == 403
+
+    giris_yap(client)
+    assert client.get("/metrics", environ_overrides=UZAK).status_code == 200
+
+
+def test_metrics_olcum_kapaliyken_404_doner(client):
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from .conftest import giris_yap
+
+
+def test_etag_ile_304_doner_last_modified_gonderilmez(client, olcek_verisi):
+    ilk = client.get("/")
+    assert ilk.status_code == 200
+    assert ilk.headers.get("ETag")
+    assert "Last-Modified" not in ilk.headers
+
+    tekrar = client.get("/", headers={"If-None-Match": ilk.headers["ETag"]})
+    assert tekrar.status_code == 304
+    assert tekrar.headers["ETag"] == ilk.headers["ETag"]
+
+
+def test_yalnizca_if_modified_since_304_almaz(client, olcek_verisi):
+    client.get("/")
+    yanit = client.get("/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert yanit.status_code == 200
+
+
+def test_anonim_kopya_giris_yapmis_istemciye_304_olarak_donmez(app, client, olcek_verisi):
+    anonim = client.get("/")
+    etag = anonim.headers["ETag"]
+
+    admin = app.test_client()
+    giris_yap(admin)
+    admin.get("/admin")  # giriş flash mesajı tüketilir
+    yanit = admin.get(
+        "/",
+        headers={"If-None-Match": etag, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+    assert yanit.status_code == 200
+    assert yanit.headers["ETag"] != etag
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+from sunum_app.services.not_hesaplama import KRITERLER, NotHesaplamaServisi
+
+
+def test_kolonsal_ortalamalar_satir_hesabiyla_ayni():
+    rnd = random.Random(3)
+    agirliklar = dict(zip(KRITERLER, (25, 20, 10, 15, 15, 15)))
+    servis = NotHesaplamaServisi(
+        SimpleNamespace(**{f"{kriter}_agirlik": a for kriter, a in agirliklar.items()})
+    )
+    # Ondalıklı ve tam sayı puanlar karışık; yuvarlama sınırları da denenir.
+    satirlar = [
+        SimpleNamespace(
+            **{kriter: rnd.choice((rnd.uniform(0, 100), rnd.randint(0, 100))) for kriter in KRITERLER}
+        )
+        for _ in range(500)
+    ]
+    kolonlar = [[getattr(satir, kriter) for satir in satirlar] for kriter in KRITERLER]
+
+    assert servis.hesapla_agirlikli_ortalamalar(kolonlar) == [
+        servis.hesapla_agirlikli_ortalama(satir) for satir in satirlar
+    ]
+    assert servis.hesapla_agirlikli_ortalamalar([[] for _ in KRITERLER]) == []
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from sunum_app.extensions import db
+from sunum_app.models import Ayarlar, Degerlendirme, Ogrenci, Sunum, SunumNotOzeti
+from sunum_app.services.not_hesaplama import (
+    KRITERLER,
+    OZET_ALANLARI,
+    NotHesaplamaServisi,
+    ozet_bicimi,
+)
+
+from .conftest import giris_yap
+
+
+def _ozetler_canli_hesapla_esit(app) -> None:
+    with app.app_context():
+        db.session.expire_all()
+        servis = NotHesaplamaServisi()
+        ozetler = {ozet.sunum_id: ozet for ozet in SunumNotOzeti.query.all()}
+        sunumlar = Sunum.query.all()
+        assert set(ozetler) == {sunum.id for sunum in sunumlar}
+        for sunum in sunumlar:
+            assert ozetler[sunum.id].final_not_bilgisi() == ozet_bicimi(
+                servis.hesapla_final_notu(sunum)
+            ), sunum.id
+
+
+def _yeni_degerlendirme_adayi(app) -> tuple[int, int]:
+    with app.app_context():
+        for sunum in Sunum.query.order_by(Sunum.id):
+            degerlendirenler = {
+                d.degerlendiren_ogrenci_id
+                for d in Degerlendirme.query.filter_by(sunum_id=sunum.id)
+            }
+            for ogrenci in Ogrenci.query.filter(Ogrenci.ekip_id != sunum.ekip_id):
+                if ogrenci.id not in degerlendirenler:
+                    return sunum.id, ogrenci.id
+    raise AssertionError("Aday bulunamadı")
+
+
+def test_ozet_ekleme_silme_ve_agirlik_degisiminde_canli_hesapla_esit(
+    app, client, olcek_verisi
+):
+    _ozetler_canli_hesapla_esit(app)
+
+    sunum_id, ogrenci_id = _yeni_degerlendirme_adayi(app)
+    yanit = client.post(
+        f"/sunum/{sunum_id}/degerlendirme",
+        data={
+            "degerlendiren_tipi": "ogrenci",
+            "degerlendiren_ogrenci_id": str(ogrenci_id),
+            **{kriter: "91.5" for kriter in KRITERLER},
+        },
+    )
+    assert yanit.status_code == 302
+    _ozetler_canli_hesapla_esit(app)
+
+    giris_yap(client)
+    with app.app_context():
+        degerlendirme_id = (
+            Degerlendirme.query.filter_by(sunum_id=sunum_id).order_by(Degerlendirme.id).first().id
+        )
+    yanit = client.post("/admin/degerlendirme", data={"sil": "1", "degerlendirme_id": degerlendirme_id})
+    assert yanit.status_code == 302
+    with app.app_context():
+        assert db.session.get(Degerlendirme, degerlendirme_id) is None
+    _ozetler_canli_hesapla_esit(app)
+
+    agirliklar = {
+        "konu_hakimiyeti_agirlik": "30",
+        "anlatim_agirlik": "10",
+        "giyim_agirlik": "10",
+        "ekip_uyumu_agirlik": "20",
+        "gorsellik_agirlik": "15",
+        "genel_gorus_agirlik": "15",
+        "ogretmen_notu_agirlik": "50",
+        "ogrenci_notu_agirlik": "50",
+    }
+    assert client.post("/ayarlar", data=agirliklar).status_code == 302
+    with app.app_context():
+        assert Ayarlar.get_aktif_ayarlar().konu_hakimiyeti_agirlik == 30
+    _ozetler_canli_hesapla_esit(app)
+
+
+def test_ozet_ve_canli_yol_ayni_bicimde_doner(app, olcek_verisi):
+    with app.app_context():
+        sunumlar = Sunum.query.order_by(Sunum.id).limit(2).all()
+        ozetsiz = sunumlar[1]
+        SunumNotOzeti.query.filter_by(sunum_id=ozetsiz.id).delete()
+        db.session.commit()
+
+        notlar = NotHesaplamaServisi().ozetten_final_notlari(sunumlar)
+
+        for bilgi in notlar.values():
+            assert tuple(bilgi) == OZET_ALANLARI
+        assert notlar[ozetsiz.id] == ozet_bicimi(NotHesaplamaServisi().hesapla_final_notu(ozetsiz))
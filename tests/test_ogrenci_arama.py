@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from sunum_app.extensions import db
+from sunum_app.models import Ogrenci
+from sunum_app.services import ogrenci_arama
+from sunum_app.services.ogrenci_arama import ogrenci_arama_filtresi
+
+
+@pytest.fixture(params=["fts", "like"])
+def ogrenciler(request, app, monkeypatch):
+    if request.param == "like":
+        # FTS olmayan veritabanlarındaki yol aynı SQLite üzerinde denenir.
+        monkeypatch.setattr(ogrenci_arama, "fts_destekleniyor", lambda: False)
+    with app.app_context():
+        db.session.add_all(
+            [
+                Ogrenci(ad="İsmail", soyad="Işık", numara="2024105"),
+                Ogrenci(ad="Ilgın", soyad="Demir", numara="2023118"),
+                Ogrenci(ad="Ali", soyad="Yıldız", numara="2022991"),
+                Ogrenci(ad="Alper", soyad="Kaya", numara="2021050"),
+            ]
+        )
+        db.session.commit()
+        yield
+
+
+def _ara(q: str) -> list[str]:
+    return sorted(
+        o.ad for o in Ogrenci.query.filter(ogrenci_arama_filtresi(q)) if o.numara.startswith("202")
+    )
+
+
+@pytest.mark.parametrize(
+    "q, beklenen",
+    [
+        ("ışık", ["İsmail"]),
+        ("işık", []),
+        ("IŞIK", ["İsmail"]),
+        ("ismail", ["İsmail"]),
+        ("ılgın", ["Ilgın"]),
+        ("ilgin", []),
+        ("410", ["İsmail"]),
+        ("0", ["Alper", "Ali", "Ilgın", "İsmail"]),
+        ("al ya", ["Alper"]),
+        ("al yıl", ["Ali"]),
+        ("Yİ", []),
+        ("yı", ["Ali"]),
+        ("2022 al", ["Ali"]),
+        ("%", []),
+    ],
+)
+def test_arama_turkce_harfler_numara_parcasi_ve_kisa_terimler(app, ogrenciler, q, beklenen):
+    with app.app_context():
+        assert _ara(q) == sorted(beklenen)
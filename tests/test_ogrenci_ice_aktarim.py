@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import csv
+import io
+
+from sqlalchemy.exc import IntegrityError
+
+from sunum_app.extensions import db
+from sunum_app.models import Ekip, Ogrenci
+from sunum_app.services.ogrenci_ice_aktarim import OgrenciIceAktarimServisi
+
+from .conftest import giris_yap
+
+
+def _ice_aktar(metin: str):
+    return OgrenciIceAktarimServisi().ice_aktar(io.StringIO(metin))
+
+
+def test_ekip_kolonu_olmayan_dosya_mevcut_ekibi_korur(app):
+    with app.app_context():
+        ekip = Ekip(isim="Kutup Yıldızları", aciklama="")
+        db.session.add(ekip)
+        db.session.flush()
+        db.session.add(Ogrenci(ad="Ahmet", soyad="Yılmaz", numara="1001", ekip_id=ekip.id))
+        db.session.commit()
+        ekip_id = ekip.id
+
+        sonuc = _ice_aktar("numara,ad,soyad\n1001,Ahmet,Yıldız\n1002,Elif,Kaya\n")
+
+        assert sonuc.guncellenen == 1 and sonuc.eklenen == 1 and not sonuc.hatalar
+        db.session.expire_all()
+        ogrenci = Ogrenci.query.filter_by(numara="1001").one()
+        assert ogrenci.soyad == "Yıldız"
+        assert ogrenci.ekip_id == ekip_id
+        assert Ogrenci.query.filter_by(numara="1002").one().ekip_id is None
+
+
+def test_bos_ekip_hucresi_ekibi_korur_dolu_hucre_gunceller(app):
+    with app.app_context():
+        ekip = Ekip(isim="Mavi Ufuklar", aciklama="")
+        db.session.add(ekip)
+        db.session.flush()
+        db.session.add_all(
+            [
+                Ogrenci(ad="Ece", soyad="Taş", numara="2001", ekip_id=ekip.id),
+                Ogrenci(ad="Can", soyad="Kurt", numara="2002", ekip_id=ekip.id),
+            ]
+        )
+        db.session.commit()
+        ekip_id = ekip.id
+
+        sonuc = _ice_aktar("numara;ad;soyad;ekip\n2001;Ece;Taş;\n2002;Can;Kurt;Bilim Yolcuları\n")
+
+        assert sonuc.guncellenen == 2 and sonuc.olusturulan_ekip == 1
+        db.session.expire_all()
+        yeni_ekip = Ekip.query.filter_by(isim="Bilim Yolcuları").one()
+        assert Ogrenci.query.filter_by(numara="2001").one().ekip_id == ekip_id
+        assert Ogrenci.query.filter_by(numara="2002").one().ekip_id == yeni_ekip.id
+
+
+def _dosya_yukle(client, icerik: bytes):
+    giris_yap(client)
+    yanit = client.post(
+        "/admin/ogrenci",
+        data={"ice_aktar": "1", "dosya": (io.BytesIO(icerik), "ogrenciler.csv")},
+        content_type="multipart/form-data",
+    )
+    assert yanit.status_code == 302
+    with client.session_transaction() as oturum:
+        return [(kategori, mesaj) for kategori, mesaj in oturum.get("_flashes", [])]
+
+
+def test_bozuk_csv_hata_mesaji_ile_reddedilir(app, client):
+    uzun_alan = "A" * (csv.field_size_limit() + 1)
+    mesajlar = _dosya_yukle(client, f"numara,ad,soyad\n3001,{uzun_alan},Kaya\n".encode())
+
+    assert any(k == "error" and m.startswith("CSV dosyası okunamadı") for k, m in mesajlar)
+    with app.app_context():
+        assert Ogrenci.query.count() == 0
+
+
+def test_kayit_cakismasi_geri_alinir_ve_bildirilir(app, client, monkeypatch):
+    def cakisir(self, parca, sonuc):
+        db.session.add(Ogrenci(ad="Ece", soyad="Taş", numara="3001"))
+        db.session.flush()
+        raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+
+    monkeypatch.setattr(OgrenciIceAktarimServisi, "_parca_yaz", cakisir)
+    mesajlar = _dosya_yukle(client, "numara,ad,soyad\n3001,Ece,Taş\n".encode())
+
+    assert any(k == "error" and "kayıt çakışması" in m for k, m in mesajlar)
+    with app.app_context():
+        assert Ogrenci.query.count() == 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+
+from sunum_app.extensions import db
+from sunum_app.models import Degerlendirme, Ekip, Sunum
+
+
+YAZICI_SAYISI = 4
+OKUYUCU_SAYISI = 4
+TUR_SAYISI = 25
+
+
+def test_pragmalar_dosya_veritabaninda_uygulanir(app):
+    with app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db.session.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_eszamanli_yazma_ve_okumada_kilit_hatasi_olmaz(app, olcek_verisi):
+    hatalar: list[BaseException] = []
+    baslangic = threading.Barrier(YAZICI_SAYISI + OKUYUCU_SAYISI)
+
+    def calistir(is_):
+        def hedef(sira: int) -> None:
+            with app.app_context():
+                baslangic.wait()
+                try:
+                    for tur in range(TUR_SAYISI):
+                        is_(sira, tur)
+                except BaseException as exc:
+                    hatalar.append(exc)
+                finally:
+                    db.session.remove()
+
+        return hedef
+
+    def yaz(sira: int, tur: int) -> None:
+        db.session.add(Ekip(isim=f"Eş zamanlı {sira}-{tur}", aciklama=""))
+        db.session.commit()
+
+    def oku(sira: int, tur: int) -> None:
+        # Okuyucu, yazıcılar commit ederken açık bir okuma işlemi tutar.
+        db.session.execute(select(func.count(Ekip.id))).scalar()
+        db.session.execute(
+            select(Sunum.id, func.count(Degerlendirme.id))
+            .outerjoin(Degerlendirme, Degerlendirme.sunum_id == Sunum.id)
+            .group_by(Sunum.id)
+        ).all()
+        db.session.rollback()
+
+    threadler = [
+        threading.Thread(target=calistir(yaz), args=(sira,)) for sira in range(YAZICI_SAYISI)
+    ] + [
+        threading.Thread(target=calistir(oku), args=(sira,)) for sira in range(OKUYUCU_SAYISI)
+    ]
+    for thread in threadler:
+        thread.start()
+    for thread in threadler:
+        thread.join()
+
+    kilit_hatalari = [
+        h for h in hatalar if isinstance(h, OperationalError) and "locked" in str(h)
+    ]
+    assert not kilit_hatalari, kilit_hatalari
+    assert not hatalar, hatalar
+    with app.app_context():
+        yazilan = db.session.scalar(
+            select(func.count(Ekip.id)).where(Ekip.isim.like("Eş zamanlı %"))
+        )
+    assert yazilan == YAZICI_SAYISI * TUR_SAYISI
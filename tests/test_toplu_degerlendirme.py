@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from sqlalchemy.exc import IntegrityError
+
+from sunum_app.models import Degerlendirme, Ogrenci, Sunum
+from sunum_app.services.not_hesaplama import KRITERLER
+from sunum_app.services.toplu_degerlendirme import TopluDegerlendirmeServisi
+
+from .conftest import giris_yap
+
+ADRES = "/api/degerlendirmeler/toplu"
+
+
+def _satir(sunum_id: int, ogrenci_id: int, puan="75") -> dict:
+    return {
+        "sunum_id": sunum_id,
+        "degerlendiren_tipi": "ogrenci",
+        "degerlendiren_ogrenci_id": ogrenci_id,
+        **{kriter: puan for kriter in KRITERLER},
+    }
+
+
+def _yuk(app) -> list[dict]:
+    # Sırasıyla: geçerli, ayrıştırma hatası, kendi ekibinin sunumu, olmayan
+    # sunum ve aynı yükte tekrar eden satır.
+    with app.app_context():
+        sunum = Sunum.query.order_by(Sunum.id).first()
+        degerlendirenler = {
+            d.degerlendiren_ogrenci_id for d in Degerlendirme.query.filter_by(sunum_id=sunum.id)
+        }
+        yabanci = next(
+            o
+            for o in Ogrenci.query.filter(Ogrenci.ekip_id != sunum.ekip_id)
+            if o.id not in degerlendirenler
+        )
+        ekipten = Ogrenci.query.filter_by(ekip_id=sunum.ekip_id).first()
+        return [
+            _satir(sunum.id, yabanci.id),
+            _satir(sunum.id, yabanci.id, puan="120"),
+            _satir(sunum.id, ekipten.id),
+            _satir(10_000, yabanci.id),
+            _satir(sunum.id, yabanci.id),
+        ]
+
+
+def _durumlar(yanit) -> list[tuple[int, str]]:
+    return [(s["index"], s["durum"]) for s in yanit.get_json()["sonuclar"]]
+
+
+def test_toplu_kayit_satir_sonuclarini_doner(app, client, olcek_verisi):
+    giris_yap(client)
+    yuk = _yuk(app)
+    with app.app_context():
+        once = Degerlendirme.query.count()
+
+    yanit = client.post(ADRES, json={"degerlendirmeler": yuk})
+
+    assert yanit.status_code == 200
+    assert yanit.get_json()["eklenen"] == 1
+    assert _durumlar(yanit) == [
+        (0, "eklendi"),
+        (1, "hata"),
+        (2, "hata"),
+        (3, "hata"),
+        (4, "cakisma"),
+    ]
+    with app.app_context():
+        assert Degerlendirme.query.count() == once + 1
+
+
+def test_denemeler_tukenince_dogrulama_hatalari_korunur(app, client, olcek_verisi, monkeypatch):
+    def hep_cakisir(self, gecerli):
+        raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+
+    monkeypatch.setattr(TopluDegerlendirmeServisi, "_ekle", hep_cakisir)
+    giris_yap(client)
+    yuk = _yuk(app)
+    with app.app_context():
+        once = Degerlendirme.query.count()
+
+    yanit = client.post(ADRES, json=yuk)
+
+    assert yanit.status_code == 200
+    assert yanit.get_json()["eklenen"] == 0
+    sonuclar = yanit.get_json()["sonuclar"]
+    assert _durumlar(yanit) == [
+        (0, "cakisma"),
+        (1, "hata"),
+        (2, "hata"),
+        (3, "hata"),
+        (4, "cakisma"),
+    ]
+    assert sonuclar[0]["mesaj"] == "Eşzamanlı kayıt nedeniyle eklenemedi."
+    assert sonuclar[2]["mesaj"] == "Ekipler kendi sunumlarına puan veremez!"
+    assert sonuclar[3]["mesaj"] == "Sunum bulunamadı."
+    with app.app_context():
+        assert Degerlendirme.query.count() == once
+
+
+def test_bos_ve_fazla_satirli_yuk_reddedilir(client, monkeypatch):
+    giris_yap(client)
+    assert client.post(ADRES, json={"degerlendirmeler": []}).status_code == 400
+    monkeypatch.setattr(TopluDegerlendirmeServisi, "MAKS_SATIR", 2)
+    assert client.post(ADRES, json=[{}, {}, {}]).status_code == 413